@@ -0,0 +1,279 @@
+"""Adaptive Indago concurrency and rate control.
+
+IndagoClient.scan takes one fixed --concurrency / --rate-limit for the whole
+run, which under-uses fast targets and trips rate limits or WAFs on fragile
+ones. This runs Indago in waves per host instead and adjusts each host's
+settings between waves AIMD-style (as TCP congestion control does):
+
+  - healthy wave: concurrency and rate grow by a fixed step (additive increase)
+  - 429s, 5xx or WAF blocks above a share of requests, or latency well above
+    the host's best: both are cut by a factor (multiplicative decrease)
+  - a report without request statistics: both are held
+
+Signals come from each wave's report and WAF-blocked export. Hosts are fuzzed
+in parallel, each host's waves one after another. Wave files live under
+<workspace>/indago-waves/; their outputs are merged into the standard
+indago-report.json and waf-blocked.json, and the per-host control history is
+written to indago-adaptive.json.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Lock
+from urllib.parse import urlsplit
+
+from reports import load_json, write_json
+from services.indago import IndagoClient
+from streaming import merge_batch_outputs
+
+WAVE_DIR = "indago-waves"
+HISTORY_FILE = "indago-adaptive.json"
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct * (len(ordered) - 1))))]
+
+
+def wave_stats(report: dict, waf_blocked: dict) -> dict:
+    """Extract throttling, error, latency and WAF signals from one wave's outputs.
+
+    Uses the report's "stats"/"summary" block when Indago writes one (request
+    count, status code histogram, latency), and otherwise derives the same
+    numbers from a per-request "requests" list. Findings are not a sample of
+    the traffic (most are error responses), so a report with neither gives
+    requests None and the rates and latency as unknown (None).
+    """
+    summary = report.get("stats") or report.get("summary") or {}
+    codes: dict[int, int] = {int(k): v for k, v in (summary.get("status_codes") or {}).items()}
+    requests = report.get("requests") if isinstance(report.get("requests"), list) else []
+    latencies = []
+    if not codes:
+        for entry in requests:
+            if entry.get("status_code") is not None:
+                codes[int(entry["status_code"])] = codes.get(int(entry["status_code"]), 0) + 1
+            if entry.get("response_time_ms") is not None:
+                latencies.append(float(entry["response_time_ms"]))
+
+    total = summary.get("requests") or summary.get("total_requests") or len(requests) or None
+    throttled = codes.get(429, 0)
+    server_errors = sum(n for code, n in codes.items() if 500 <= code < 600)
+    p95 = summary.get("latency_p95_ms") or _percentile(latencies, 0.95)
+    blocked = waf_blocked.get("total_blocked", len(waf_blocked.get("targets", [])))
+    return {
+        "requests": total,
+        "throttle_rate": throttled / total if total else None,
+        "error_rate": server_errors / total if total else None,
+        "latency_p95_ms": p95 if total else None,
+        "waf_blocked": blocked,
+        "waf_rate": min(1.0, blocked / total) if total else None,
+    }
+
+
+class AIMDController:
+    """Per-host additive-increase / multiplicative-decrease of concurrency and rate.
+
+    Args:
+        concurrency, rate_limit: Settings for the first wave.
+        max_concurrency, max_rate: Upper bounds (lower bounds are 1).
+        concurrency_step, rate_step: Additive increase after a healthy wave.
+        backoff: Multiplicative decrease after a distressed wave.
+        error_threshold: 429 or 5xx share of requests that counts as distress.
+        waf_threshold: Share of requests blocked by a WAF that counts as
+            distress. A few blocks are expected while fuzzing (payloads that
+            trip signatures) and say nothing about the request rate.
+        latency_factor: p95 latency above this multiple of the host's best
+            healthy p95 counts as distress.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 5,
+        rate_limit: int = 10,
+        max_concurrency: int = 50,
+        max_rate: int = 200,
+        concurrency_step: int = 2,
+        rate_step: int = 10,
+        backoff: float = 0.5,
+        error_threshold: float = 0.02,
+        waf_threshold: float = 0.05,
+        latency_factor: float = 2.0,
+    ):
+        self.concurrency = concurrency
+        self.rate_limit = rate_limit
+        self.max_concurrency = max_concurrency
+        self.max_rate = max_rate
+        self.concurrency_step = concurrency_step
+        self.rate_step = rate_step
+        self.backoff = backoff
+        self.error_threshold = error_threshold
+        self.waf_threshold = waf_threshold
+        self.latency_factor = latency_factor
+        self.best_latency: float | None = None
+
+    def distress(self, stats: dict) -> str | None:
+        """Reason the wave looks like the target is struggling, or None (also when unknown)."""
+        if stats["requests"] is None:
+            return None
+        if stats["throttle_rate"] > self.error_threshold:
+            return f"429 rate {stats['throttle_rate']:.1%}"
+        if stats["error_rate"] > self.error_threshold:
+            return f"5xx rate {stats['error_rate']:.1%}"
+        if stats["waf_rate"] > self.waf_threshold:
+            return f"{stats['waf_blocked']} WAF block(s), {stats['waf_rate']:.1%} of requests"
+        p95 = stats["latency_p95_ms"]
+        if p95 is not None and self.best_latency and p95 > self.latency_factor * self.best_latency:
+            return f"p95 {p95:.0f}ms vs best {self.best_latency:.0f}ms"
+        return None
+
+    def update(self, stats: dict | None) -> tuple[str, str | None]:
+        """Adjust settings after a wave. stats is None when the wave itself failed.
+
+        Returns (action, reason) where action is "increase", "decrease", or
+        "hold" when the wave's report has no request count to judge it by.
+        """
+        if stats is not None and stats["requests"] is None:
+            return "hold", "no request stats in the report"
+        reason = "wave failed" if stats is None else self.distress(stats)
+        if reason:
+            self.concurrency = max(1, int(self.concurrency * self.backoff))
+            self.rate_limit = max(1, int(self.rate_limit * self.backoff))
+            return "decrease", reason
+
+        p95 = stats["latency_p95_ms"]
+        if p95 is not None:
+            self.best_latency = p95 if self.best_latency is None else min(self.best_latency, p95)
+        self.concurrency = min(self.max_concurrency, self.concurrency + self.concurrency_step)
+        self.rate_limit = min(self.max_rate, self.rate_limit + self.rate_step)
+        return "increase", None
+
+
+def group_by_host(endpoints: list[dict]) -> dict[str, list[dict]]:
+    """Group endpoint-export entries by host."""
+    hosts: dict[str, list[dict]] = {}
+    for endpoint in endpoints:
+        url = endpoint.get("url") or endpoint.get("host", "")
+        host = urlsplit(url).netloc or endpoint.get("host") or "unknown"
+        hosts.setdefault(host.lower(), []).append(endpoint)
+    return hosts
+
+
+def _fuzz_host(
+    indago: IndagoClient,
+    wave_dir: Path,
+    host: str,
+    endpoints: list[dict],
+    wave_size: int,
+    controller: AIMDController,
+    scan_kwargs: dict,
+    on_wave,
+) -> list[dict]:
+    """Fuzz one host's endpoints wave by wave, adapting between waves."""
+    safe_host = host.replace(":", "_").replace("/", "_")
+    waves = []
+    for index, start in enumerate(range(0, len(endpoints), wave_size), 1):
+        prefix = wave_dir / f"{safe_host}-wave-{index:03d}"
+        targets = write_json(
+            f"{prefix}-endpoints.json",
+            {"export_source": "reticustos", "endpoints": endpoints[start:start + wave_size]},
+        )
+        report_path, waf_path = Path(f"{prefix}-report.json"), Path(f"{prefix}-waf-blocked.json")
+        concurrency, rate_limit = controller.concurrency, controller.rate_limit
+
+        started = time.time()
+        rc, _, stderr = indago.scan(
+            targets_from=str(targets),
+            output=str(report_path),
+            export_waf_blocked=str(waf_path),
+            concurrency=concurrency,
+            rate_limit=rate_limit,
+            **scan_kwargs,
+        )
+        stats = wave_stats(load_json(report_path, {}), load_json(waf_path, {})) if rc == 0 else None
+        action, reason = controller.update(stats)
+        wave = {
+            "host": host,
+            "wave": index,
+            "endpoints": len(endpoints[start:start + wave_size]),
+            "concurrency": concurrency,
+            "rate_limit": rate_limit,
+            "returncode": rc,
+            "stderr": stderr.strip()[-500:] if rc != 0 else "",
+            "duration": round(time.time() - started, 2),
+            "stats": stats,
+            "action": action,
+            "reason": reason,
+            "report": str(report_path),
+            "waf_blocked": str(waf_path),
+        }
+        waves.append(wave)
+        if on_wave:
+            on_wave(wave)
+    return waves
+
+
+def adaptive_fuzz(
+    indago: IndagoClient,
+    workspace: Path,
+    targets_file: Path,
+    wave_size: int = 50,
+    max_hosts: int = 4,
+    controller_kwargs: dict | None = None,
+    scan_kwargs: dict | None = None,
+    on_wave=None,
+) -> dict:
+    """Fuzz an endpoint export with per-host adaptive concurrency and rate.
+
+    Returns a summary with per-host final settings, wave counts and the
+    number of decreases, plus the merged WAF-blocked count.
+    """
+    workspace = Path(workspace)
+    wave_dir = workspace / WAVE_DIR
+    wave_dir.mkdir(exist_ok=True)
+    data = load_json(targets_file, {})
+    endpoints = data if isinstance(data, list) else data.get("endpoints", [])
+    hosts = group_by_host(endpoints)
+    controllers = {host: AIMDController(**(controller_kwargs or {})) for host in hosts}
+
+    lock = Lock()
+
+    def report_wave(wave: dict) -> None:
+        if on_wave:
+            with lock:
+                on_wave(wave)
+
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=max(1, max_hosts)) as pool:
+        futures = {
+            host: pool.submit(
+                _fuzz_host, indago, wave_dir, host, host_endpoints, wave_size, controllers[host],
+                scan_kwargs or {}, report_wave,
+            )
+            for host, host_endpoints in hosts.items()
+        }
+        waves = {host: future.result() for host, future in futures.items()}
+
+    all_waves = [wave for host_waves in waves.values() for wave in host_waves]
+    merged = merge_batch_outputs(workspace, all_waves)
+
+    summary_hosts = {
+        host: {
+            "endpoints": len(hosts[host]),
+            "waves": len(host_waves),
+            "decreases": sum(1 for w in host_waves if w["action"] == "decrease"),
+            "final_concurrency": controllers[host].concurrency,
+            "final_rate_limit": controllers[host].rate_limit,
+        }
+        for host, host_waves in waves.items()
+    }
+    write_json(workspace / HISTORY_FILE, {"hosts": summary_hosts, "waves": all_waves})
+    return {
+        "hosts": summary_hosts,
+        "endpoints_fuzzed": sum(w["endpoints"] for w in all_waves),
+        "failed_waves": [f"{w['host']}#{w['wave']}" for w in all_waves if w["returncode"] != 0],
+        "waf_blocked": merged["waf_blocked"].get("total_blocked", 0),
+        "duration": round(time.time() - started, 2),
+    }
@@ -0,0 +1,135 @@
+"""Non-interactive runners for pipeline agents.
+
+The agents in agents/*.md drive each tool through the LLM. For distributed
+runs (see jobqueue.py) a worker instead executes the deterministic tool part
+of an agent directly: the same service scans, Indago waves, Cepheus batches
+and Vinculum/Ariadne calls the agents issue, with their default options.
+
+Each runner takes (config, workspace, meta) and returns {status, outputs,
+detail}; status is "ok" or "skipped" (nothing to do, e.g. no WAF-blocked
+requests). Tool failures raise RuntimeError.
+"""
+
+from pathlib import Path
+
+from pipeline import AGENT_OUTPUTS
+from reports import load_json
+
+
+def _service_runner(service: str):
+    def run(config: dict, workspace: Path, meta: dict) -> dict:
+        from coalesce import ScanRegistry
+        from scans import default_profile, run_scan
+        from services import get_service_client
+
+        client = get_service_client(config, service)
+        profile = default_profile(config, service)
+        result = run_scan(client, service, workspace, meta["target"], profile, registry=ScanRegistry.for_config(config))
+        return {
+            "status": "ok",
+            "outputs": [str(p) for p in result["outputs"]],
+            "detail": {"scan_id": result["scan_id"], "source": result["source"], "skipped": result["skipped"]},
+        }
+
+    return run
+
+
+def run_api_fuzz(config: dict, workspace: Path, meta: dict) -> dict:
+    from adaptive import adaptive_fuzz
+    from endpoints import CANONICAL_FILE, canonicalize_file
+    from services import get_tool_client
+
+    export = workspace / "reticustos-endpoints.json"
+    if not (workspace / CANONICAL_FILE).exists():
+        if not export.exists():
+            return {"status": "skipped", "outputs": [], "detail": {"reason": f"no endpoint export at {export}"}}
+        canonicalize_file(export)
+    indago = get_tool_client(config, "indago", workspace=workspace)
+    summary = adaptive_fuzz(indago, workspace, workspace / CANONICAL_FILE)
+    if summary["failed_waves"]:
+        raise RuntimeError(f"Indago waves failed: {', '.join(summary['failed_waves'])}")
+    return {"status": "ok", "outputs": _outputs(workspace, "api-fuzz"), "detail": summary}
+
+
+def run_waf_bypass(config: dict, workspace: Path, meta: dict) -> dict:
+    from services import get_tool_client
+
+    blocked = load_json(workspace / "waf-blocked.json", {})
+    if not blocked.get("total_blocked"):
+        return {"status": "skipped", "outputs": [], "detail": {"reason": "no WAF-blocked requests"}}
+    burrito = get_tool_client(config, "burrito", workspace=workspace)
+    output = workspace / "burrito-report.json"
+    rc, _, stderr = burrito.bypass(from_indago=str(workspace / "waf-blocked.json"), output=str(output))
+    if rc != 0:
+        raise RuntimeError(f"burrito exited with code {rc}: {stderr.strip()[-500:]}")
+    return {"status": "ok", "outputs": [str(output)], "detail": {"blocked": blocked["total_blocked"]}}
+
+
+def run_container_escape(config: dict, workspace: Path, meta: dict) -> dict:
+    from container_batch import get_cache_dir, run_batch
+    from services import get_tool_client
+
+    containers_file = workspace / "nubicustos-containers.json"
+    if not containers_file.exists():
+        return {"status": "skipped", "outputs": [], "detail": {"reason": "no container inventory"}}
+    cepheus = get_tool_client(config, "cepheus", workspace=workspace)
+    summary = run_batch(cepheus, workspace, containers_file=containers_file, cache_dir=get_cache_dir(config))
+    if summary["failed"]:
+        raise RuntimeError(f"Cepheus failed for: {', '.join(summary['failed'])}")
+    return {"status": "ok", "outputs": _outputs(workspace, "container-escape"), "detail": summary}
+
+
+def run_correlate(config: dict, workspace: Path, meta: dict) -> dict:
+    from services import get_tool_client
+
+    reports = sorted(workspace.glob("*-findings.json")) + sorted(workspace.glob("*-report.json"))
+    if not reports:
+        return {"status": "skipped", "outputs": [], "detail": {"reason": "no reports to correlate"}}
+    vinculum = get_tool_client(config, "vinculum", workspace=workspace)
+    for fmt, name in (("ariadne", "vinculum-ariadne.json"), ("json", "vinculum-correlated.json")):
+        rc, _, stderr = vinculum.ingest([str(p) for p in reports], format=fmt, output=str(workspace / name))
+        if rc != 0:
+            raise RuntimeError(f"vinculum exited with code {rc}: {stderr.strip()[-500:]}")
+    return {"status": "ok", "outputs": _outputs(workspace, "correlate"), "detail": {"reports": len(reports)}}
+
+
+def run_attack_paths(config: dict, workspace: Path, meta: dict) -> dict:
+    from graph_prune import PRUNED_FILE, prune_file
+    from services import get_tool_client
+
+    export = workspace / "vinculum-ariadne.json"
+    if not export.exists():
+        return {"status": "skipped", "outputs": [], "detail": {"reason": "no correlated findings"}}
+    targets = config.get("defaults", {}).get("crown_jewels") or []
+    stats = prune_file(export, workspace / PRUNED_FILE, targets=targets)
+    if not stats["kept_nodes"]:
+        return {"status": "skipped", "outputs": [], "detail": {"reason": "no connected non-informational findings"}}
+    ariadne = get_tool_client(config, "ariadne", workspace=workspace)
+    output = workspace / "ariadne-report.json"
+    rc, _, stderr = ariadne.analyze(str(workspace / PRUNED_FILE), output=str(output), targets=targets)
+    if rc != 0:
+        raise RuntimeError(f"ariadne exited with code {rc}: {stderr.strip()[-500:]}")
+    return {"status": "ok", "outputs": [str(output)], "detail": {"pruning": stats}}
+
+
+def _outputs(workspace: Path, agent: str) -> list[str]:
+    return [str(workspace / name) for name in AGENT_OUTPUTS[agent] if (workspace / name).exists()]
+
+
+RUNNERS = {
+    "recon": _service_runner("reticustos"),
+    "mobile-scan": _service_runner("mobilicustos"),
+    "cloud-audit": _service_runner("nubicustos"),
+    "api-fuzz": run_api_fuzz,
+    "waf-bypass": run_waf_bypass,
+    "container-escape": run_container_escape,
+    "correlate": run_correlate,
+    "attack-paths": run_attack_paths,
+}
+
+
+def run_agent(config: dict, workspace: Path, meta: dict, agent: str) -> dict:
+    """Run one agent's tool work in a workspace."""
+    if agent not in RUNNERS:
+        raise ValueError(f"Unknown agent: {agent}. Valid: {list(RUNNERS)}")
+    return RUNNERS[agent](config, Path(workspace), meta)
@@ -0,0 +1,195 @@
+"""Archival of finished workspaces.
+
+A run directory holds dozens of pretty-printed JSON files that are never
+written again once the run completes. `orchestrator.py archive` packs each
+such run into a single zip next to where it lived:
+
+  ~/.bounty-pipeline/runs/<target>-<timestamp>/  ->  <target>-<timestamp>.zip
+
+JSON members are re-serialized compactly before being deflated; other files
+(trace.jsonl, tool logs) are stored as they are. The zip's central directory
+is the member index: a single member is read by seeking to it, without
+extracting or decompressing the rest of the archive.
+
+A run keeps its workspace path after archival. read_member() and
+list_members() take that path and read from the directory or the archive,
+whichever exists, so workspace.py's loaders work on both. zipfile is only
+imported once an archive is actually touched, to keep it off CLI startup.
+"""
+
+import json
+import os
+import re
+import time
+from fnmatch import fnmatch
+from pathlib import Path
+
+ARCHIVE_SUFFIX = ".zip"
+
+# Run statuses that mean nothing will write to the workspace again
+DEFAULT_STATUSES = ["completed"]
+
+DURATION_UNITS = {"m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+
+def archive_path(workspace: str | Path) -> Path:
+    """Archive file of a workspace (run names contain dots, so no with_suffix)."""
+    workspace = Path(workspace)
+    return workspace.with_name(workspace.name + ARCHIVE_SUFFIX)
+
+
+def is_archived(workspace: str | Path) -> bool:
+    workspace = Path(workspace)
+    return not workspace.is_dir() and archive_path(workspace).is_file()
+
+
+def run_path(entry: Path) -> Path | None:
+    """Workspace path for an entry of the runs root (a run directory or archive), else None."""
+    if entry.name.startswith("."):
+        return None
+    if entry.name.endswith(ARCHIVE_SUFFIX) and entry.is_file():
+        return entry.with_name(entry.name[: -len(ARCHIVE_SUFFIX)])
+    if entry.is_dir():
+        return entry
+    return None
+
+
+def read_member(workspace: str | Path, name: str) -> bytes | None:
+    """Contents of a workspace file (e.g. "checkpoints/recon.json"), or None if absent."""
+    workspace = Path(workspace)
+    path = workspace / name
+    if path.is_file():
+        return path.read_bytes()
+    if workspace.is_dir() or not archive_path(workspace).is_file():
+        return None
+    import zipfile
+
+    with zipfile.ZipFile(archive_path(workspace)) as zf:
+        try:
+            return zf.read(name)
+        except KeyError:
+            return None
+
+
+def read_member_json(workspace: str | Path, name: str, default=None):
+    """Parse a workspace JSON file from the directory or the archive."""
+    data = read_member(workspace, name)
+    return json.loads(data) if data is not None else default
+
+
+def load_member_json(workspace: str | Path, name: str, default=None):
+    """Like read_member_json, but default for unparseable files too (as reports.load_json)."""
+    try:
+        return read_member_json(workspace, name, default)
+    except ValueError:
+        return default
+
+
+def list_members(workspace: str | Path, pattern: str = "*") -> list[tuple[str, int]]:
+    """(relative name, size) of workspace files matching a glob, sorted by name."""
+    workspace = Path(workspace)
+    if workspace.is_dir():
+        return sorted(
+            (p.relative_to(workspace).as_posix(), p.stat().st_size)
+            for p in workspace.glob(pattern) if p.is_file()
+        )
+    if not archive_path(workspace).is_file():
+        return []
+    import zipfile
+
+    with zipfile.ZipFile(archive_path(workspace)) as zf:
+        # Path.glob's "*" does not cross directories; mirror that
+        return sorted(
+            (info.filename, info.file_size)
+            for info in zf.infolist()
+            if not info.is_dir() and fnmatch(info.filename, pattern) and info.filename.count("/") == pattern.count("/")
+        )
+
+
+def parse_age(text: str) -> float:
+    """Seconds in an age like "30d", "12h", "90m", "2w" (a bare number is days)."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([mhdw]?)\s*", text)
+    if not match:
+        raise ValueError(f"Invalid age: {text!r} (expected e.g. 30d, 12h, 90m, 2w)")
+    return float(match.group(1)) * DURATION_UNITS[match.group(2) or "d"]
+
+
+def _compact(name: str, data: bytes) -> bytes:
+    if not name.endswith(".json"):
+        return data
+    try:
+        return json.dumps(json.loads(data), separators=(",", ":")).encode()
+    except ValueError:
+        return data
+
+
+def archive_workspace(workspace: str | Path, compresslevel: int = 6) -> dict:
+    """Pack a workspace directory into its archive and remove the directory.
+
+    The archive is written to a temporary file, checked against the
+    directory's file list and only then moved into place, so an interrupted
+    run leaves the directory untouched.
+
+    Returns {run, files, bytes, archive_bytes}.
+    """
+    import shutil
+    import zipfile
+
+    workspace = Path(workspace)
+    dest = archive_path(workspace)
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+    files = sorted(p for p in workspace.rglob("*") if p.is_file())
+    total = 0
+    try:
+        with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as zf:
+            for path in files:
+                name = path.relative_to(workspace).as_posix()
+                data = path.read_bytes()
+                total += len(data)
+                info = zipfile.ZipInfo.from_file(path, name)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                zf.writestr(info, _compact(name, data), compresslevel=compresslevel)
+        with zipfile.ZipFile(tmp) as zf:
+            if len(zf.namelist()) != len(files):
+                raise RuntimeError(f"Archive of {workspace} has {len(zf.namelist())} members, expected {len(files)}")
+        os.replace(tmp, dest)
+    finally:
+        tmp.unlink(missing_ok=True)
+    shutil.rmtree(workspace)
+    return {"run": workspace.name, "files": len(files), "bytes": total, "archive_bytes": dest.stat().st_size}
+
+
+def restore_workspace(workspace: str | Path) -> Path:
+    """Extract an archived workspace back into its directory (e.g. to resume it)."""
+    import zipfile
+
+    workspace = Path(workspace)
+    source = archive_path(workspace)
+    if not source.is_file():
+        raise FileNotFoundError(f"No archive for {workspace.name} at {source}")
+    tmp = workspace.with_name(f".{workspace.name}.{os.getpid()}.tmp")
+    with zipfile.ZipFile(source) as zf:
+        zf.extractall(tmp)
+    os.replace(tmp, workspace)
+    source.unlink()
+    return workspace
+
+
+def archivable(root: Path, older_than: float, statuses: list[str] | None = None) -> list[Path]:
+    """Run directories under root in one of statuses whose run-meta.json is older than older_than seconds."""
+    statuses = statuses or DEFAULT_STATUSES
+    cutoff = time.time() - older_than
+    runs = []
+    for entry in sorted(root.iterdir()):
+        meta_file = entry / "run-meta.json"
+        if not entry.is_dir() or not meta_file.exists():
+            continue
+        if meta_file.stat().st_mtime > cutoff:
+            continue
+        try:
+            meta = json.loads(meta_file.read_text())
+        except ValueError:
+            continue
+        if meta.get("status") in statuses:
+            runs.append(entry)
+    return runs
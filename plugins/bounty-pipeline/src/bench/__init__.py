@@ -0,0 +1,6 @@
+"""Offline benchmarks for bounty-pipeline.
+
+Local stand-ins replace the Docker services and CLI tools so orchestration
+overhead can be measured without Reticustos/Mobilicustos/Nubicustos containers
+or the real binaries.
+"""
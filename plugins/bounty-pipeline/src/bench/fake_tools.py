@@ -0,0 +1,109 @@
+"""Fake CLI tool executables for offline benchmarks.
+
+install_fake_tools() writes small Python scripts standing in for indago,
+burrito, cepheus, vinculum and ariadne. They accept the arguments the wrappers
+build, sleep for a configurable time and write plausible JSON reports to the
+-o path, so the wrappers' subprocess and file handling can be measured.
+"""
+
+import stat
+import sys
+from pathlib import Path
+
+TOOLS = ["indago", "burrito", "cepheus", "vinculum", "ariadne"]
+
+_SCRIPT = '''#!{python}
+import json, sys, time
+
+TOOL = {tool!r}
+DELAY = {delay!r}
+FINDINGS = {findings!r}
+FLAGS = {flags!r}
+
+argv = sys.argv[1:]
+if "--version" in argv:
+    print(f"{{TOOL}} 0.0.0-fake")
+    sys.exit(0)
+if "--help" in argv or "-h" in argv:
+    print(f"Usage: {{TOOL}} [command] [flags]")
+    print("Flags:")
+    for flag in FLAGS:
+        print(f"  {{flag}}")
+    sys.exit(0)
+
+
+def opt(name):
+    return argv[argv.index(name) + 1] if name in argv and argv.index(name) + 1 < len(argv) else None
+
+
+def count_inputs(path):
+    try:
+        data = json.load(open(path))
+    except (OSError, ValueError):
+        return 0
+    if isinstance(data, list):
+        return len(data)
+    for key in ("endpoints", "targets", "findings", "containers"):
+        if isinstance(data.get(key), list):
+            return len(data[key])
+    return 1
+
+
+time.sleep(DELAY)
+inputs = count_inputs(opt("--targets-from") or opt("--from-indago") or (argv[1] if len(argv) > 1 else ""))
+count = FINDINGS if FINDINGS >= 0 else inputs
+findings = [
+    {{"id": f"{{TOOL}}-{{i}}", "title": f"{{TOOL}} finding {{i}}", "severity": "medium",
+      "endpoint": f"https://target.example/api/{{i}}", "status_code": 200, "response_time_ms": 50}}
+    for i in range(count)
+]
+report = {{"tool": TOOL, "command": argv[0] if argv else "", "findings": findings, "total": count}}
+if TOOL == "cepheus" and argv[:1] == ["enumerate"]:
+    report = {{"container": opt("-c"), "capabilities": ["CAP_NET_ADMIN"], "privileged": False}}
+if TOOL == "cepheus" and argv[:1] == ["analyze"]:
+    report["escape_paths"] = findings
+if TOOL == "ariadne":
+    report["attack_paths"] = findings[: max(1, count // 10)]
+
+output = opt("-o")
+if output:
+    json.dump(report, open(output, "w"))
+else:
+    print(json.dumps(report))
+waf_blocked = opt("--export-waf-blocked")
+if waf_blocked:
+    targets = [{{"method": "GET", "endpoint": f["endpoint"], "parameter": "q",
+                "vulnerability_type": "xss", "waf_response_code": 403}} for f in findings[: count // 10]]
+    json.dump({{"export_source": "indago", "total_blocked": len(targets), "targets": targets}}, open(waf_blocked, "w"))
+'''
+
+# Flags each fake advertises in --help, mirroring the options the wrappers pass.
+TOOL_FLAGS = {
+    "indago": ["--spec", "--targets-from", "-o", "-f", "--export-waf-blocked", "--concurrency", "--rate-limit",
+               "--timeout", "--dry-run"],
+    "burrito": ["--from-indago", "-u", "--param", "-m", "-t", "-o", "-f", "--aggressive", "--evolve", "--deep"],
+    "cepheus": ["--from-nubicustos", "-o", "-f", "-s", "--llm", "-c", "-r"],
+    "vinculum": ["-f", "-o", "--min-severity", "--include-raw"],
+    "ariadne": ["-o", "-t", "-p", "-s", "--privesc", "-f"],
+}
+
+
+def install_fake_tools(dest: Path, delay: float = 0.0, findings: int = -1) -> dict[str, str]:
+    """Write fake tool executables to dest.
+
+    Args:
+        delay: Seconds each invocation sleeps before writing output.
+        findings: Findings per report; -1 means one per input entry.
+
+    Returns a tools config mapping (tool name -> executable path).
+    """
+    dest.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for tool in TOOLS:
+        path = dest / tool
+        path.write_text(_SCRIPT.format(
+            python=sys.executable, tool=tool, delay=delay, findings=findings, flags=TOOL_FLAGS[tool]
+        ))
+        path.chmod(path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        paths[tool] = str(path)
+    return paths
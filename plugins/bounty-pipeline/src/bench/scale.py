@@ -0,0 +1,69 @@
+"""Scale test: orchestrator operations against a (synthetic) workspace root.
+
+Times each operation and, in a separate pass, measures its peak Python memory
+with tracemalloc, so the timing is not skewed by allocation tracing.
+"""
+
+import argparse
+import io
+import time
+import tracemalloc
+from collections.abc import Callable
+from contextlib import redirect_stdout
+from pathlib import Path
+
+
+def _operations(config: dict, root: Path) -> dict[str, Callable[[], object]]:
+    import cli
+    from archive import list_members, read_member_json
+    from workspace import find_latest_workspace, iter_runs, list_workspaces, load_checkpoint, load_workspace
+
+    latest = find_latest_workspace(config)
+    runs = sorted(iter_runs(root))
+    oldest_target = load_workspace(runs[0])["target"] if runs else None
+    outputs = list_members(latest, "*.json") if latest else []
+    largest = max(outputs, key=lambda member: member[1]) if outputs else None
+    checkpoints = list_members(latest, "checkpoints/*.json") if latest else []
+    first_checkpoint = Path(checkpoints[0][0]) if checkpoints else None
+
+    def quiet(func, **kwargs):
+        def call():
+            with redirect_stdout(io.StringIO()):
+                func(argparse.Namespace(**kwargs), config)
+        return call
+
+    ops = {
+        "list_workspaces(limit=10)": lambda: list_workspaces(config, limit=10),
+        "list_workspaces(all)": lambda: list_workspaces(config, limit=len(runs) + 1),
+        "find_latest_workspace": lambda: find_latest_workspace(config),
+        "find_latest_workspace(target)": lambda: find_latest_workspace(config, target=oldest_target),
+        "cmd_status(latest)": quiet(cli.cmd_status, workspace=None),
+        "cmd_list_runs(limit=10)": quiet(cli.cmd_list_runs, limit=10),
+    }
+    if latest:
+        ops["load_workspace"] = lambda: load_workspace(latest)
+    if first_checkpoint:
+        ops["load_checkpoint"] = lambda: load_checkpoint(latest, first_checkpoint.stem)
+    if largest:
+        name, size = largest
+        ops[f"read_member_json({name}, {size // 1024:,} KB)"] = lambda: read_member_json(latest, name)
+    return ops
+
+
+def run_scale_test(config: dict, root: Path, only: list[str] | None = None) -> dict:
+    """Run each operation against root and return {operation: {seconds, peak_kb}}."""
+    config = {**config, "workspace": {**config.get("workspace", {}), "root": str(root)}}
+    results = {}
+    for name, op in _operations(config, root).items():
+        if only and not any(o in name for o in only):
+            continue
+        t0 = time.perf_counter()
+        op()
+        seconds = time.perf_counter() - t0
+
+        tracemalloc.start()
+        op()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = {"seconds": seconds, "peak_kb": peak / 1024}
+    return results
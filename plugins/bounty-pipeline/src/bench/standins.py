@@ -0,0 +1,229 @@
+"""Local HTTP stand-ins for the Reticustos, Mobilicustos and Nubicustos APIs.
+
+Implements the endpoints the service clients use:
+  GET  /api/health
+  POST /api/scans/                   create a scan (returns {"id", "status"})
+  POST /api/scans/{id}/start         start a Reticustos scan
+  GET  /api/scans/{id}               scan status and progress
+  GET  /api/scans/{id}/findings      findings payload
+  GET  /api/exports/endpoints        ?scan_id= — grows while the scan runs
+  GET  /api/exports/containers       ?scan_id= — container inventory
+
+Latency, scan duration and payload sizes are configurable so benchmarks can
+model both a fast local service and a slow, heavy one. GET responses carry an
+ETag and a matching If-None-Match gets a bodyless 304. This assumes the real
+services support conditional GETs, which has not been checked against them;
+etags=False models a service that does not, where every poll re-downloads.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+SEVERITIES = ["critical", "high", "medium", "low", "info"]
+
+
+def make_findings(count: int, pad_bytes: int = 200) -> list[dict]:
+    """Build a list of synthetic findings of roughly pad_bytes each."""
+    padding = "x" * max(0, pad_bytes - 150)
+    return [
+        {
+            "id": f"finding-{i}",
+            "title": f"Synthetic finding {i % 97}",
+            "severity": SEVERITIES[i % len(SEVERITIES)],
+            "cwe": f"CWE-{79 + i % 40}",
+            "endpoint": f"https://target.example/api/v1/items/{i}",
+            "description": padding,
+        }
+        for i in range(count)
+    ]
+
+
+def make_endpoints(count: int) -> list[dict]:
+    """Build a list of synthetic endpoint-export entries."""
+    methods = ["GET", "POST", "PUT", "DELETE"]
+    return [
+        {"method": methods[i % 4], "url": f"https://target.example/api/v1/resource{i % 25}/{i}", "params": ["q"]}
+        for i in range(count)
+    ]
+
+
+def make_containers(count: int) -> list[dict]:
+    """Build a synthetic container inventory, with images shared across containers."""
+    return [
+        {
+            "id": f"container-{i}",
+            "name": f"svc-{i}",
+            "image": f"registry.example/app{i % 7}:1.{i % 3}",
+            "image_digest": f"sha256:{i % 7:064x}",
+            "runtime": "docker",
+        }
+        for i in range(count)
+    ]
+
+
+class StandInService:
+    """A stand-in REST service running in a background thread.
+
+    Args:
+        latency: Seconds added to every request.
+        scan_duration: Seconds from start until a scan reports "completed".
+        findings: Findings per scan.
+        finding_bytes: Approximate size of each finding.
+        endpoints: Endpoints discovered per scan (revealed linearly over the scan).
+        containers: Containers in the container export.
+        fail_targets: Targets (or mobile app IDs) whose scans end in "failed".
+        etags: Send ETags and answer matching conditional GETs with 304.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        scan_duration: float = 0.0,
+        findings: int = 100,
+        finding_bytes: int = 200,
+        endpoints: int = 100,
+        containers: int = 10,
+        fail_targets: set[str] | None = None,
+        etags: bool = True,
+    ):
+        self.latency = latency
+        self.scan_duration = scan_duration
+        self.fail_targets = fail_targets or set()
+        self.scans: dict[str, dict] = {}
+        self.etags = etags
+        self.requests = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._findings_body = json.dumps({"findings": make_findings(findings, finding_bytes)}).encode()
+        self._endpoints = make_endpoints(endpoints)
+        self._containers_body = json.dumps(
+            {"export_source": "nubicustos", "containers": make_containers(containers)}
+        ).encode()
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StandInService":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _create_scan(self, payload: dict) -> dict:
+        with self._lock:
+            scan_id = str(len(self.scans) + 1)
+            self.scans[scan_id] = {"id": scan_id, "payload": payload, "started_at": time.time()}
+        return {"id": scan_id, "scan_id": scan_id, "status": "pending"}
+
+    def _scan_state(self, scan_id: str) -> dict | None:
+        scan = self.scans.get(scan_id)
+        if scan is None:
+            return None
+        elapsed = time.time() - scan["started_at"]
+        progress = 1.0 if self.scan_duration <= 0 else min(1.0, elapsed / self.scan_duration)
+        target = scan["payload"].get("target") or scan["payload"].get("app_id")
+        if target in self.fail_targets and progress >= 1.0:
+            status = "failed"
+        else:
+            status = "completed" if progress >= 1.0 else "running"
+        return {"id": scan_id, "status": status, "progress": round(progress * 100)}
+
+    def _handler_class(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, code: int, body: bytes) -> None:
+                etag = None
+                if service.etags and self.command == "GET" and code == 200:
+                    etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        with service._lock:
+                            service.not_modified += 1
+                        self.send_response(304)
+                        self.send_header("ETag", etag)
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if etag:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_json(self, code: int, data) -> None:
+                self._send(code, json.dumps(data).encode())
+
+            def _begin(self):
+                with service._lock:
+                    service.requests += 1
+                if service.latency:
+                    time.sleep(service.latency)
+                return urlparse(self.path)
+
+            def do_POST(self):
+                url = self._begin()
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                parts = url.path.strip("/").split("/")
+                if url.path.rstrip("/") == "/api/scans":
+                    self._send_json(200, service._create_scan(payload))
+                elif len(parts) == 4 and parts[:2] == ["api", "scans"] and parts[3] == "start":
+                    scan = service.scans.get(parts[2])
+                    if scan is None:
+                        self._send_json(404, {"detail": "scan not found"})
+                        return
+                    scan["started_at"] = time.time()
+                    self._send_json(200, {"id": parts[2], "status": "running"})
+                else:
+                    self._send_json(404, {"detail": "not found"})
+
+            def do_GET(self):
+                url = self._begin()
+                query = parse_qs(url.query)
+                parts = url.path.strip("/").split("/")
+                if url.path == "/api/health":
+                    self._send_json(200, {"status": "ok"})
+                elif len(parts) == 3 and parts[:2] == ["api", "scans"]:
+                    state = service._scan_state(parts[2])
+                    self._send_json(200 if state else 404, state or {"detail": "scan not found"})
+                elif len(parts) == 4 and parts[:2] == ["api", "scans"] and parts[3] == "findings":
+                    self._send(200, service._findings_body)
+                elif url.path == "/api/exports/endpoints":
+                    state = service._scan_state(query.get("scan_id", [""])[0])
+                    progress = state["progress"] / 100 if state else 1.0
+                    visible = service._endpoints[: int(len(service._endpoints) * progress)]
+                    self._send_json(200, {"export_source": "reticustos", "endpoints": visible})
+                elif url.path == "/api/exports/containers":
+                    self._send(200, service._containers_body)
+                else:
+                    self._send_json(404, {"detail": "not found"})
+
+        return Handler
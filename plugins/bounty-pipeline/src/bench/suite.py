@@ -0,0 +1,232 @@
+"""Benchmark suite for bounty-pipeline orchestration code paths.
+
+Each benchmark runs a pipeline code path against local stand-ins and reports
+per-iteration latency (p50/p95), throughput and peak Python memory. Results are
+compared against a stored baseline; a benchmark regresses when its p50 latency
+or peak memory grows by more than the tolerance.
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from bench.fake_tools import install_fake_tools
+from bench.standins import StandInService
+from bench.synth import generate_workspaces
+from http_cache import ResponseCache
+from reports import merge_reports
+from services.indago import IndagoClient
+from services.nubicustos import NubicustosClient
+from services.reticustos import ReticustosClient
+from streaming import stream_fuzz
+
+ORCHESTRATOR = Path(__file__).parent.parent / "orchestrator.py"
+
+DEFAULT_BASELINE_PATH = Path.home() / ".bounty-pipeline" / "bench-baseline.json"
+
+# name -> (function(ctx) run once per iteration, default iterations)
+BENCHMARKS: dict[str, tuple[Callable[[dict], None], int]] = {}
+
+
+def benchmark(name: str, iterations: int):
+    """Register a benchmark function."""
+    def register(func):
+        BENCHMARKS[name] = (func, iterations)
+        return func
+    return register
+
+
+@benchmark("rest.get_findings", iterations=50)
+def bench_get_findings(ctx: dict) -> None:
+    ctx["reticustos"].get_findings("1")
+
+
+@benchmark("rest.get_findings.uncached", iterations=50)
+def bench_get_findings_uncached(ctx: dict) -> None:
+    ctx["reticustos_uncached"].get_findings("1")
+
+
+@benchmark("rest.health_check", iterations=200)
+def bench_health_check(ctx: dict) -> None:
+    ctx["reticustos"].health_check()
+
+
+@benchmark("rest.poll_scan", iterations=5)
+def bench_poll_scan(ctx: dict) -> None:
+    client = ctx["reticustos"]
+    scan_id = str(client.register_target("bench.example")["id"])
+    client.start_scan(scan_id)
+    client.poll_scan(scan_id)
+
+
+@benchmark("rest.export_findings", iterations=20)
+def bench_export_findings(ctx: dict) -> None:
+    ctx["reticustos"].export_findings("1", ctx["tmp"] / "reticustos-findings.json")
+
+
+@benchmark("rest.export_containers", iterations=50)
+def bench_export_containers(ctx: dict) -> None:
+    ctx["nubicustos"].export_containers("1", ctx["tmp"] / "nubicustos-containers.json")
+
+
+@benchmark("cli.run", iterations=20)
+def bench_cli_run(ctx: dict) -> None:
+    ctx["indago"].scan(targets_from=str(ctx["endpoints_file"]), output=str(ctx["tmp"] / "indago-report.json"))
+
+
+@benchmark("reports.merge", iterations=20)
+def bench_merge_reports(ctx: dict) -> None:
+    merge_reports(ctx["reports"])
+
+
+@benchmark("pipeline.stream_fuzz", iterations=3)
+def bench_stream_fuzz(ctx: dict) -> None:
+    client = ctx["reticustos"]
+    scan_id = str(client.register_target("bench.example")["id"])
+    client.start_scan(scan_id)
+    workspace = Path(tempfile.mkdtemp(dir=ctx["tmp"]))
+    stream_fuzz(client, ctx["indago"], scan_id, workspace, batch_size=ctx["batch_size"], max_batch_wait=0.2)
+
+
+@benchmark("cli.startup.python", iterations=10)
+def bench_startup_python(ctx: dict) -> None:
+    # Interpreter startup alone, the floor for the orchestrator commands below.
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+
+
+@benchmark("cli.startup.status", iterations=10)
+def bench_startup_status(ctx: dict) -> None:
+    subprocess.run(ctx["orchestrator"] + ["status"], check=True, stdout=subprocess.DEVNULL)
+
+
+@benchmark("cli.startup.list_runs", iterations=10)
+def bench_startup_list_runs(ctx: dict) -> None:
+    subprocess.run(ctx["orchestrator"] + ["list-runs"], check=True, stdout=subprocess.DEVNULL)
+
+
+def _measure(func: Callable[[dict], None], ctx: dict, iterations: int) -> dict:
+    # One traced pass for peak memory (tracemalloc would skew the timings),
+    # which also serves as the warm-up.
+    tracemalloc.start()
+    func(ctx)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        func(ctx)
+        latencies.append(time.perf_counter() - t0)
+    total = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "iterations": iterations,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+        "ops_per_sec": iterations / total if total else 0.0,
+        "peak_kb": peak / 1024,
+    }
+
+
+def run_suite(
+    only: list[str] | None = None,
+    latency: float = 0.0,
+    scan_duration: float = 0.5,
+    findings: int = 1000,
+    finding_bytes: int = 400,
+    endpoints: int = 200,
+    tool_delay: float = 0.0,
+    scale: float = 1.0,
+) -> dict:
+    """Run the benchmarks and return {name: metrics}.
+
+    Args:
+        latency: Per-request latency of the stand-in services (seconds).
+        scan_duration: How long stand-in scans take to complete (seconds).
+        findings / finding_bytes: Size of findings payloads.
+        endpoints: Endpoints discovered per stand-in Reticustos scan.
+        tool_delay: Seconds each fake tool invocation sleeps.
+        scale: Multiplier on iteration counts (e.g. 0.2 for a quick run).
+    """
+    selected = {name: spec for name, spec in BENCHMARKS.items() if not only or name in only}
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="bounty-bench-") as tmp, StandInService(
+        latency=latency,
+        scan_duration=scan_duration,
+        findings=findings,
+        finding_bytes=finding_bytes,
+        endpoints=endpoints,
+        containers=max(10, findings // 10),
+    ) as service:
+        tmp = Path(tmp)
+        tools = install_fake_tools(tmp / "bin", delay=tool_delay)
+        endpoints_file = tmp / "reticustos-endpoints.json"
+        endpoints_file.write_text(json.dumps(ReticustosClient(service.url).get_endpoints("0")))
+        generate_workspaces(tmp / "runs", runs=20, artifact_kb=1)
+        config_file = tmp / "config.yaml"
+        config_file.write_text(f"workspace:\n  root: {tmp / 'runs'}\n")
+        ctx = {
+            "tmp": tmp,
+            "reticustos": ReticustosClient(service.url, timeout=60, poll_interval=0.05),
+            "reticustos_uncached": ReticustosClient(service.url, cache=ResponseCache(max_entries=0)),
+            "nubicustos": NubicustosClient(service.url, timeout=60, poll_interval=0.05),
+            "indago": IndagoClient(tools["indago"]),
+            "endpoints_file": endpoints_file,
+            "batch_size": max(1, endpoints // 4),
+            "orchestrator": [sys.executable, str(ORCHESTRATOR), "--config", str(config_file)],
+            "reports": [{"findings": [{"id": i} for i in range(findings // 10)], "total": findings // 10}] * 10,
+        }
+        for name, (func, iterations) in selected.items():
+            results[name] = _measure(func, ctx, max(1, int(iterations * scale)))
+    return results
+
+
+def load_baseline(path: Path) -> dict:
+    """Load stored baseline results, or an empty dict."""
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def save_baseline(path: Path, results: dict) -> Path:
+    """Store results as the new baseline."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2))
+    return path
+
+
+# Absolute changes below these are treated as noise, whatever the ratio.
+MIN_LATENCY_DELTA_MS = 1.0
+MIN_MEMORY_DELTA_KB = 64.0
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.25) -> list[dict]:
+    """Compare results with a baseline.
+
+    Returns one entry per benchmark present in both, with the relative change
+    in p50 latency and peak memory and whether either exceeds the tolerance
+    (and the noise floor).
+    """
+    rows = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        latency_change = (current["p50_ms"] - base["p50_ms"]) / base["p50_ms"] if base["p50_ms"] else 0.0
+        memory_change = (current["peak_kb"] - base["peak_kb"]) / base["peak_kb"] if base["peak_kb"] else 0.0
+        rows.append({
+            "name": name,
+            "latency_change": latency_change,
+            "memory_change": memory_change,
+            "regressed": (
+                (latency_change > tolerance and current["p50_ms"] - base["p50_ms"] > MIN_LATENCY_DELTA_MS)
+                or (memory_change > tolerance and current["peak_kb"] - base["peak_kb"] > MIN_MEMORY_DELTA_KB)
+            ),
+        })
+    return rows
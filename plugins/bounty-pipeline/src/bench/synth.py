@@ -0,0 +1,135 @@
+"""Synthetic workspace generator for scale testing.
+
+Produces a workspace root shaped like ~/.bounty-pipeline/runs: many run
+directories with run-meta.json, phase checkpoints and findings/report
+artifacts. Artifact size and the share of duplicated findings are configurable,
+and the latest run (the one `status` picks by default) can carry one very
+large findings file. Artifacts are streamed to disk, so generating a 1 GB file
+does not need 1 GB of memory.
+"""
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from bench.standins import SEVERITIES
+from pipeline import AGENT_OUTPUTS, PIPELINES
+
+STATUSES = ["completed"] * 6 + ["phase1_complete", "initialized", "failed"]
+
+
+def _finding(rng: random.Random, tool: str, index: int, pad: str) -> dict:
+    return {
+        "id": f"{tool}-{index}",
+        "title": f"{tool} finding {rng.randrange(500)}",
+        "severity": rng.choice(SEVERITIES),
+        "cwe": f"CWE-{rng.randrange(20, 900)}",
+        "endpoint": f"https://app{rng.randrange(50)}.example.com/api/v{rng.randrange(1, 4)}/r/{rng.randrange(10**6)}",
+        "description": pad,
+    }
+
+
+def write_findings_file(
+    path: Path,
+    tool: str,
+    size_bytes: int,
+    duplication: float,
+    rng: random.Random,
+) -> int:
+    """Stream a findings artifact of roughly size_bytes to path.
+
+    A `duplication` share of findings repeat an earlier finding verbatim,
+    modelling the same issue reported on several scans.
+
+    Returns the number of findings written.
+    """
+    pad = "x" * 120
+    written = 0
+    count = 0
+    recent: list[str] = []
+    with open(path, "w") as f:
+        f.write(f'{{"export_source": "{tool}", "findings": [\n')
+        while written < size_bytes or count == 0:
+            if recent and rng.random() < duplication:
+                item = rng.choice(recent)
+            else:
+                item = json.dumps(_finding(rng, tool, count, pad))
+                if len(recent) < 1000:
+                    recent.append(item)
+                else:
+                    recent[rng.randrange(1000)] = item
+            f.write((",\n" if count else "") + item)
+            written += len(item) + 2
+            count += 1
+        f.write(f'\n], "total": {count}}}\n')
+    return count
+
+
+def generate_workspaces(
+    root: Path,
+    runs: int = 1000,
+    artifact_kb: int = 16,
+    duplication: float = 0.3,
+    large_artifact_mb: int = 0,
+    seed: int = 1,
+) -> dict:
+    """Generate synthetic run workspaces under root.
+
+    Args:
+        runs: Number of run directories.
+        artifact_kb: Approximate size of each findings/report artifact.
+        duplication: Share of duplicated findings within an artifact (0-1).
+        large_artifact_mb: If set, the latest run's recon findings file is this large.
+
+    Returns a summary with run count and total bytes written.
+    """
+    rng = random.Random(seed)
+    root.mkdir(parents=True, exist_ok=True)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    total_bytes = 0
+    latest = None
+
+    for i in range(runs):
+        created = start + timedelta(minutes=37 * i)
+        target_type = rng.choice(list(PIPELINES))
+        target = f"target{i % 400}.example.com"
+        ws = root / f"{target}-{created.strftime('%Y%m%d-%H%M%S')}-{i:05d}"
+        (ws / "checkpoints").mkdir(parents=True, exist_ok=True)
+
+        phases = PIPELINES[target_type]
+        status = rng.choice(STATUSES)
+        done = len(phases) if status == "completed" else rng.randrange(len(phases))
+        phase_names = [phase[0] for phase in phases[:done]]
+        meta = {
+            "target": target,
+            "target_type": target_type,
+            "created_at": created.isoformat(),
+            "status": status,
+            "phases_completed": phase_names,
+            "workspace": str(ws),
+            "updated_at": (created + timedelta(minutes=rng.randrange(5, 90))).isoformat(),
+        }
+        (ws / "run-meta.json").write_text(json.dumps(meta, indent=2))
+
+        for phase in phases[:done]:
+            for agent in phase:
+                for output in AGENT_OUTPUTS[agent]:
+                    tool = output.split("-")[0]
+                    total_bytes += artifact_kb * 1024
+                    write_findings_file(ws / output, tool, artifact_kb * 1024, duplication, rng)
+            checkpoint = {
+                "phase": phase[0],
+                "timestamp": created.isoformat(),
+                "data": {"agents": phase, "outputs": [o for a in phase for o in AGENT_OUTPUTS[a]]},
+            }
+            (ws / "checkpoints" / f"{phase[0]}.json").write_text(json.dumps(checkpoint, indent=2))
+        if latest is None or ws.name > latest.name:
+            latest = ws
+
+    if large_artifact_mb and latest is not None:
+        size = large_artifact_mb * 1024 * 1024
+        write_findings_file(latest / "reticustos-findings.json", "reticustos", size, duplication, rng)
+        total_bytes += size
+
+    return {"root": str(root), "runs": runs, "bytes": total_bytes, "latest": str(latest) if latest else None}
@@ -0,0 +1,133 @@
+"""Cooperative run cancellation for bounty-pipeline.
+
+When an agent in a parallel phase fails fatally (recon finds nothing, the
+cloud audit cannot authenticate), its siblings would otherwise keep polling
+services and running tools until their own timeouts. A run is cancelled by
+writing <workspace>/cancel.json; every orchestrator process working in that
+workspace holds a CancelToken that notices the file within CHECK_INTERVAL
+seconds, and:
+
+  - service polls stop waiting and raise Cancelled
+  - running CLI tools have their whole process group terminated
+
+Which agent failures cancel the run is a per-run policy (see abort_on()).
+Scans already running on a service are left there; since their handles are
+saved in scans.json, a resumed run reattaches to them.
+
+Like tracing, cancellation is process-wide once configure() is called with
+the workspace; clients can also be given a token explicitly.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from archive import read_member_json
+from pipeline import DEFAULT_ABORT_ON
+
+CANCEL_FILE = "cancel.json"
+
+# Seconds between checks for the cancel file while waiting
+CHECK_INTERVAL = 0.5
+
+
+class Cancelled(Exception):
+    """Raised when work stops because its run was cancelled."""
+
+
+class CancelToken:
+    """Cancellation flag shared by threads, and by processes through the workspace sentinel file."""
+
+    def __init__(self, workspace: str | Path | None = None):
+        self.workspace = Path(workspace).expanduser() if workspace else None
+        self.reason: str | None = None
+        self._event = threading.Event()
+        self._checked = 0.0
+
+    @property
+    def sentinel(self) -> Path | None:
+        return self.workspace / CANCEL_FILE if self.workspace else None
+
+    def cancel(self, reason: str, source: str | None = None) -> None:
+        """Cancel the run: wakes waiters in this process and writes the sentinel for the others."""
+        self.reason = reason
+        self._event.set()
+        if self.sentinel:
+            record = {"reason": reason, "source": source, "cancelled_at": datetime.now(timezone.utc).isoformat()}
+            self.sentinel.write_text(json.dumps(record, indent=2))
+
+    def is_cancelled(self) -> bool:
+        """Check the in-process flag, and the sentinel file at most every CHECK_INTERVAL seconds."""
+        if self._event.is_set():
+            return True
+        now = time.monotonic()
+        if self.sentinel and now - self._checked >= CHECK_INTERVAL:
+            self._checked = now
+            if self.sentinel.exists():
+                try:
+                    self.reason = json.loads(self.sentinel.read_text()).get("reason")
+                except (OSError, ValueError):
+                    self.reason = "cancelled"
+                self._event.set()
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self.is_cancelled():
+            raise Cancelled(self.reason or "cancelled")
+
+    def wait(self, seconds: float) -> None:
+        """Sleep for up to seconds, raising Cancelled as soon as the run is cancelled."""
+        deadline = time.monotonic() + seconds
+        while True:
+            self.raise_if_cancelled()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            self._event.wait(min(CHECK_INTERVAL, remaining))
+
+
+_token: CancelToken | None = None
+
+
+def configure(workspace: str | Path | None) -> CancelToken | None:
+    """Make a workspace's token the process-wide default (None disables it)."""
+    global _token
+    _token = CancelToken(workspace) if workspace else None
+    return _token
+
+
+def current() -> CancelToken | None:
+    """Return the process-wide token, if configured."""
+    return _token
+
+
+def sleep(seconds: float, token: CancelToken | None = None) -> None:
+    """time.sleep that wakes early with Cancelled when the run is cancelled."""
+    token = token or _token
+    if token is None:
+        time.sleep(seconds)
+    else:
+        token.wait(seconds)
+
+
+def load(workspace: str | Path) -> dict | None:
+    """Return the cancellation record of a workspace, if it was cancelled."""
+    return read_member_json(Path(workspace).expanduser(), CANCEL_FILE)
+
+
+def clear(workspace: str | Path) -> bool:
+    """Remove a workspace's cancellation (e.g. before resuming it). Returns True if one existed."""
+    sentinel = Path(workspace).expanduser() / CANCEL_FILE
+    if sentinel.exists():
+        sentinel.unlink()
+        return True
+    return False
+
+
+def abort_on(meta: dict) -> list[str]:
+    """Agents whose failure cancels the run: the run's own policy, else the pipeline default."""
+    if meta.get("abort_on") is not None:
+        return meta["abort_on"]
+    return DEFAULT_ABORT_ON.get(meta.get("target_type"), [])
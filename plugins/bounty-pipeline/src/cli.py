@@ -0,0 +1,1326 @@
+#!/usr/bin/env python3
+"""Bounty Pipeline orchestrator CLI.
+
+Utility commands for service checks, workspace management, and status.
+The actual pipeline flow is driven by the /bounty command + Task tool agents.
+
+Usage:
+    python3 orchestrator.py check-services --type web [--refresh-tools]
+    python3 orchestrator.py init-workspace --target example.com --type web [--abort-on recon]
+    python3 orchestrator.py status [--workspace <path>]
+    python3 orchestrator.py list-runs [--limit 10]
+    python3 orchestrator.py watch [--workspace <path> ...] [--interval 2] [--once]
+    python3 orchestrator.py stream-fuzz --workspace <path> [--scan-id <id>] [--batch-size 50]
+    python3 orchestrator.py canonicalize-endpoints --workspace <path> [--samples 1]
+    python3 orchestrator.py prune-graph --workspace <path> [--target db.internal ...] [--max-hops 4]
+    python3 orchestrator.py adaptive-fuzz --workspace <path> [--wave-size 50] [--max-concurrency 50]
+    python3 orchestrator.py run-scan --workspace <path> --service reticustos [--target <t>] [--profile <p>]
+    python3 orchestrator.py scan-cache [--clear]
+    python3 orchestrator.py container-batch --workspace <path> [--workers 4] [--no-cache]
+    python3 orchestrator.py mobile-batch --workspace <path> --apps <id> <id> ... [--max-in-flight 4]
+    python3 orchestrator.py cloud-shard --workspace <path> --accounts <id> ... [--regions us-east-1 ...]
+    python3 orchestrator.py mark --workspace <path> --kind phase --name scanning --event start
+    python3 orchestrator.py agent-failed --workspace <path> --agent recon --reason "no endpoints found"
+    python3 orchestrator.py cancel --workspace <path> [--reason <text>] [--clear]
+    python3 orchestrator.py enqueue --workspace <path> [--skip waf-bypass] [--priority 10] [--program <p> --weight 2]
+    python3 orchestrator.py worker [--name node1] [--max-jobs 10] [--idle-exit 60]
+    python3 orchestrator.py queue-status [--run <workspace name>]
+    python3 orchestrator.py run-agent --workspace <path> --agent recon
+    python3 orchestrator.py archive --older-than 30d [--status completed] [--dry-run] | --restore <path>
+    python3 orchestrator.py index [--workspace <path>] [--prune] [--force]
+    python3 orchestrator.py search "sql injection" [--target <t>] [--severity high critical] [--cwe 89] [--group]
+    python3 orchestrator.py plan --type web [--profile standard] [--runs 20] [--workspace <path>]
+    python3 orchestrator.py trace [--workspace <path>] [--chrome out.json] [--prometheus out.prom]
+    python3 orchestrator.py tool-usage [--workspace <path>] [--limit 50]
+    python3 orchestrator.py bench [--only rest.poll_scan] [--save-baseline] [--tolerance 0.25]
+    python3 orchestrator.py synth-workspaces --root /tmp/runs --runs 10000 [--large-mb 1024]
+    python3 orchestrator.py scale-test --root /tmp/runs
+
+Any command can be profiled: orchestrator.py --profiler {cprofile,sample} <command> ...
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+# Add src directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import get_workspace_root, load_config
+from pipeline import AGENTS, describe_pipeline, get_agent_dependencies, get_required_services
+from workspace import create_workspace, iter_runs, list_workspaces, load_workspace, save_scan_handle
+
+
+# Commands whose service/tool calls are recorded in the workspace trace
+TRACED_COMMANDS = {
+    "stream-fuzz", "adaptive-fuzz", "run-scan", "container-batch", "mobile-batch", "cloud-shard", "run-agent",
+}
+
+
+def cmd_check_services(args, config):
+    """Check Docker services and CLI tools for a target type."""
+    from docker_check import check_cli_tools, check_services, format_status_report
+
+    target_type = args.type
+    required = get_required_services(target_type)
+
+    print(f"Checking services for pipeline type: {target_type}")
+    print(f"Required Docker services: {required or 'none'}\n")
+
+    service_results = check_services(config, target_type)
+    tool_results = check_cli_tools(config, refresh=args.refresh_tools)
+
+    print(format_status_report(service_results, tool_results))
+
+    # Exit code: 0 if all required services healthy, 1 otherwise
+    all_ok = all(s["healthy"] for s in service_results.values())
+    tools_ok = all(t["executable"] for t in tool_results.values())
+
+    if not all_ok:
+        print("\nSome required services are not running. Start them before proceeding.")
+        sys.exit(1)
+    if not tools_ok:
+        missing = [n for n, t in tool_results.items() if not t["executable"]]
+        print(f"\nMissing CLI tools: {', '.join(missing)}")
+        sys.exit(1)
+
+    print("\nAll checks passed.")
+
+
+def cmd_init_workspace(args, config):
+    """Initialize a new run workspace."""
+    import cancel
+    import tracing
+
+    abort_on = [a for a in args.abort_on.split(",") if a] if args.abort_on is not None else None
+    workspace = create_workspace(config, args.target, args.type, abort_on=abort_on)
+    tracing.mark(workspace, "run", args.target, "start", target_type=args.type)
+    print(f"Workspace created: {workspace}")
+    print(f"Pipeline: {args.type}")
+    print(describe_pipeline(args.type))
+    fatal = cancel.abort_on(load_workspace(workspace))
+    print(f"Failures that abort the run: {', '.join(fatal) or 'none'}")
+
+    # Output workspace path as JSON for machine consumption
+    result = {"workspace": str(workspace), "target": args.target, "type": args.type}
+    print(f"\n__WORKSPACE_JSON__:{json.dumps(result)}")
+
+
+def cmd_status(args, config):
+    """Show status of a workspace or the latest run."""
+    import cancel
+    from archive import archive_path, is_archived, list_members
+
+    ws_path = _resolve_workspace(args, config)
+    meta = load_workspace(ws_path)
+    print(f"Workspace: {meta.get('path', ws_path)}")
+    print(f"Target: {meta['target']}")
+    print(f"Type: {meta['target_type']}")
+    print(f"Status: {meta['status']}")
+    print(f"Created: {meta['created_at']}")
+    print(f"Phases completed: {', '.join(meta.get('phases_completed', [])) or 'none'}")
+    cancelled = cancel.load(ws_path)
+    if cancelled:
+        print(f"Cancelled: {cancelled['reason']} (at {cancelled['cancelled_at']})")
+
+    if is_archived(ws_path):
+        print(f"Archived: {archive_path(ws_path)}")
+
+    # List output files
+    outputs = [(name, size) for name, size in list_members(ws_path, "*.json") if name != "run-meta.json"]
+    if outputs:
+        print(f"\nOutput files ({len(outputs)}):")
+        for name, size in outputs:
+            print(f"  {name} ({size:,} bytes)")
+
+
+def cmd_watch(args, config):
+    """Follow active runs live: per-agent elapsed time, findings/sec, endpoints, REST polls and ETA."""
+    import time
+
+    from monitor import HostMonitor
+
+    root = get_workspace_root(config)
+    workspaces = [Path(ws).expanduser() for ws in args.workspace] if args.workspace else None
+    history = [Path(run["path"]) for run in list_workspaces(config, limit=args.history)]
+    monitor = HostMonitor(root, config, workspaces=workspaces, idle=args.idle, history=history)
+    clear = sys.stdout.isatty() and not args.once
+    try:
+        while True:
+            monitor.poll()
+            snapshot = monitor.snapshot()
+            if clear:
+                print("\033[H\033[2J", end="")
+            _print_watch(snapshot, workspaces or root)
+            if args.once:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return
+    print(f"\n__WATCH_JSON__:{json.dumps(snapshot)}")
+
+
+def _print_watch(snapshot: dict, source) -> None:
+    import time
+
+    def eta(seconds):
+        return "-" if seconds is None else _format_duration(seconds)
+
+    print(f"{time.strftime('%H:%M:%S', time.localtime(snapshot['at']))} — "
+          f"{snapshot['active_runs']} active run(s), {snapshot['running_agents']} agent(s) running")
+    if not snapshot["runs"]:
+        print(f"No active runs in {source}")
+        return
+    for run in snapshot["runs"]:
+        print(f"\n{run['run']} [{run['target_type']}, {run['profile']}] {run['state']}, "
+              f"{_format_duration(run['elapsed'])} elapsed, ETA {eta(run['eta'])}"
+              + (f" (no history: {', '.join(run['unknown'])})" if run["unknown"] else ""))
+        print(f"  {'agent':<18} {'state':<9} {'elapsed':>8} {'findings':>9} {'/sec':>6} "
+              f"{'endpoints':>11} {'REST':>6} {'polls':>6} {'ETA':>7}")
+        rows = list(run["agents"].items())
+        if run["unattributed"]["rest"] or run["unattributed"]["subprocesses"]:
+            rows.append(("(other)", {**run["unattributed"], "state": "", "size": None, "eta": None}))
+        for name, row in rows:
+            endpoints = f"{row['endpoints']}/{row['size']}" if row["size"] else str(row["endpoints"] or "-")
+            print(f"  {name:<18} {row['state']:<9} {_format_duration(row['elapsed']):>8} {row['findings']:>9} "
+                  f"{row['findings_per_sec']:>6.2f} {endpoints:>11} {row['rest']:>6} {row['polls']:>6} "
+                  f"{eta(row['eta']) if row['state'] == 'running' else '-':>7}")
+    print(f"\nTotal: {snapshot['findings']} findings ({snapshot['findings_per_sec']:.2f}/s), "
+          f"{snapshot['endpoints']} endpoints ({snapshot['endpoints_per_sec']:.1f}/s), "
+          f"{snapshot['rest']} REST calls ({snapshot['polls']} polls, {snapshot['cached']} cached), "
+          f"all done in ~{_format_duration(snapshot['eta'])}")
+
+
+def cmd_list_runs(args, config):
+    """List recent pipeline runs."""
+    runs = list_workspaces(config, limit=args.limit)
+    if not runs:
+        print("No runs found.")
+        return
+
+    print(f"Recent runs ({len(runs)}):\n")
+    for run in runs:
+        status = run.get("status", "unknown")
+        phases = len(run.get("phases_completed", []))
+        print(f"  {run['target']} [{run['target_type']}] — {status} ({phases} phases)")
+        print(f"    {run.get('path', 'unknown')}")
+        print(f"    Created: {run['created_at']}")
+        print()
+
+
+def cmd_stream_fuzz(args, config):
+    """Run recon and api-fuzz overlapped: fuzz endpoints as Reticustos finds them."""
+    from scans import default_profile, resume_or_launch
+    from services import get_service_client, get_tool_client
+    from streaming import stream_fuzz
+
+    ws_path = Path(args.workspace).expanduser()
+    meta = load_workspace(ws_path)
+    reticustos = get_service_client(config, "reticustos")
+    indago = get_tool_client(config, "indago", workspace=ws_path)
+
+    scan_id = args.scan_id
+    if not scan_id:
+        profile = args.profile or default_profile(config, "reticustos")
+        scan_id, source = resume_or_launch(reticustos, "reticustos", ws_path, meta["target"], profile)
+        print(f"{SCAN_SOURCE_LABELS[source]} Reticustos scan {scan_id} ({profile})")
+
+    def on_batch(result):
+        status = "ok" if result["returncode"] == 0 else f"FAILED (exit {result['returncode']})"
+        print(f"  Batch {result['batch']}: {result['endpoints']} endpoints in {result['duration']}s — {status}")
+
+    print(f"Streaming endpoints from scan {scan_id} to Indago (batch size {args.batch_size})")
+    summary = stream_fuzz(
+        reticustos,
+        indago,
+        scan_id,
+        ws_path,
+        batch_size=args.batch_size,
+        max_batch_wait=args.max_wait,
+        on_batch=on_batch,
+        canonical_samples=None if args.no_canonicalize else args.samples,
+    )
+    print(f"\nRecon + fuzz finished in {summary['duration']}s")
+    print(f"Time to first fuzz batch: {summary['time_to_first_batch']}s")
+    print(f"Endpoints fuzzed: {summary['endpoints_fuzzed']} in {len(summary['batches'])} batch(es)")
+    if summary["canonicalization"]:
+        stats = summary["canonicalization"]
+        print(f"Canonicalized: {stats['input']} endpoints → {stats['templates']} templates "
+              f"({stats['reduction']}x fewer)")
+    print(f"WAF-blocked targets: {summary['waf_blocked']}")
+    if summary["failed_batches"]:
+        print(f"Failed batches: {summary['failed_batches']}")
+    if not args.scan_id:
+        save_scan_handle(ws_path, "reticustos", {"state": "exported"})
+    summary = {k: v for k, v in summary.items() if k != "batches"}
+    print(f"\n__STREAM_JSON__:{json.dumps(summary)}")
+
+
+def cmd_canonicalize_endpoints(args, config):
+    """Collapse the Reticustos endpoint export into route templates for Indago."""
+    from endpoints import CANONICAL_FILE, canonicalize_file
+
+    ws_path = Path(args.workspace).expanduser()
+    source = Path(args.input).expanduser() if args.input else ws_path / "reticustos-endpoints.json"
+    if not source.exists():
+        print(f"No endpoint export at {source}")
+        sys.exit(1)
+
+    output = ws_path / CANONICAL_FILE
+    stats = canonicalize_file(source, output, samples=args.samples)
+    print(f"Endpoints: {stats['input']} → {stats['output']} ({stats['templates']} route templates)")
+    print(f"Reduction: {stats['reduction']}x")
+    print(f"Written: {output}")
+    print(f"\n__CANONICAL_JSON__:{json.dumps(stats)}")
+
+
+def cmd_prune_graph(args, config):
+    """Cut the Vinculum export down to the slice that can reach the crown jewels, for Ariadne."""
+    from graph_prune import PRUNED_FILE, prune_file
+
+    ws_path = Path(args.workspace).expanduser()
+    source = Path(args.input).expanduser() if args.input else ws_path / "vinculum-ariadne.json"
+    if not source.exists():
+        print(f"No Vinculum export at {source}")
+        sys.exit(1)
+
+    targets = args.target or config.get("defaults", {}).get("crown_jewels") or []
+    output = ws_path / PRUNED_FILE
+    stats = prune_file(source, output, targets=targets, max_hops=args.max_hops, keep_info=args.keep_info)
+    print(f"Nodes: {stats['nodes']} → {stats['kept_nodes']} ({stats['reduction'] or '-'}x)")
+    print(f"Edges: {stats['edges']} → {stats['kept_edges']} ({stats['edge_reduction'] or '-'}x)")
+    print(f"Dropped: {stats['dropped_info']} informational, {stats['dropped_disconnected']} disconnected, "
+          f"{stats['dropped_unreachable']} outside the kept slice")
+    if targets:
+        print(f"Crown jewels: {len(stats['crown_jewels'])} nodes matched")
+    if stats["unmatched_targets"]:
+        print(f"Unmatched targets: {', '.join(stats['unmatched_targets'])}")
+    print(f"Written: {output}")
+    print(f"\n__PRUNE_JSON__:{json.dumps(stats)}")
+
+
+def cmd_adaptive_fuzz(args, config):
+    """Fuzz with Indago in waves, adapting concurrency and rate per host."""
+    from adaptive import HISTORY_FILE, adaptive_fuzz
+    from endpoints import CANONICAL_FILE
+    from services import get_tool_client
+
+    ws_path = Path(args.workspace).expanduser()
+    if args.input:
+        targets = Path(args.input).expanduser()
+    elif (ws_path / CANONICAL_FILE).exists():
+        targets = ws_path / CANONICAL_FILE
+    else:
+        targets = ws_path / "reticustos-endpoints.json"
+    if not targets.exists():
+        print(f"No endpoint export at {targets}")
+        sys.exit(1)
+
+    def on_wave(wave):
+        status = "ok" if wave["returncode"] == 0 else f"FAILED (exit {wave['returncode']})"
+        change = f"{wave['action']}" + (f" ({wave['reason']})" if wave["reason"] else "")
+        print(f"  {wave['host']} wave {wave['wave']}: {wave['endpoints']} endpoints at "
+              f"c={wave['concurrency']} r={wave['rate_limit']}/s in {wave['duration']}s — {status}, {change}")
+
+    indago = get_tool_client(config, "indago", workspace=ws_path)
+    controller_kwargs = {
+        "concurrency": args.initial_concurrency,
+        "rate_limit": args.initial_rate,
+        "max_concurrency": args.max_concurrency,
+        "max_rate": args.max_rate,
+    }
+    print(f"Adaptive fuzzing of {targets.name} (waves of {args.wave_size} endpoints per host)")
+    summary = adaptive_fuzz(
+        indago,
+        ws_path,
+        targets,
+        wave_size=args.wave_size,
+        max_hosts=args.max_hosts,
+        controller_kwargs=controller_kwargs,
+        on_wave=on_wave,
+    )
+    print(f"\nFuzzed {summary['endpoints_fuzzed']} endpoints across {len(summary['hosts'])} host(s) "
+          f"in {summary['duration']}s")
+    for host, h in summary["hosts"].items():
+        print(f"  {host}: {h['waves']} wave(s), {h['decreases']} backoff(s), "
+              f"settled at c={h['final_concurrency']} r={h['final_rate_limit']}/s")
+    print(f"WAF-blocked targets: {summary['waf_blocked']}")
+    if summary["failed_waves"]:
+        print(f"Failed waves: {', '.join(summary['failed_waves'])}")
+    print(f"Control history: {ws_path / HISTORY_FILE}")
+    print(f"\n__ADAPTIVE_JSON__:{json.dumps(summary)}")
+
+
+def cmd_container_batch(args, config):
+    """Run Cepheus over every container in the Nubicustos inventory in parallel."""
+    from container_batch import get_cache_dir, run_batch
+    from services import get_tool_client
+
+    ws_path = Path(args.workspace).expanduser()
+    containers_file = ws_path / "nubicustos-containers.json"
+    if not containers_file.exists():
+        print(f"No container inventory at {containers_file}")
+        sys.exit(1)
+
+    cepheus = get_tool_client(config, "cepheus", workspace=ws_path)
+    summary = run_batch(
+        cepheus,
+        ws_path,
+        containers_file=containers_file,
+        cache_dir=None if args.no_cache else get_cache_dir(config),
+        max_workers=args.workers,
+        min_severity=args.min_severity,
+        llm=args.llm,
+    )
+    print(f"Containers: {summary['containers']} ({summary['unique_images']} unique images)")
+    print(f"Analyzed: {summary['analyzed']}, reused from cache: {summary['cache_hits']}")
+    if summary["failed"]:
+        print(f"Failed: {', '.join(summary['failed'])}")
+    print(f"Report: {ws_path / 'cepheus-report.json'}")
+    print(f"\n__CONTAINER_BATCH_JSON__:{json.dumps(summary)}")
+
+
+def cmd_mobile_batch(args, config):
+    """Scan many mobile apps with Mobilicustos, polling them from one loop."""
+    from mobile_batch import run_mobile_batch
+    from scans import default_profile
+    from services import get_service_client
+
+    ws_path = Path(args.workspace).expanduser()
+    app_ids = list(args.apps or [])
+    if args.apps_file:
+        lines = Path(args.apps_file).expanduser().read_text().splitlines()
+        app_ids += [line.strip() for line in lines if line.strip() and not line.startswith("#")]
+    if not app_ids:
+        print("No apps given (use --apps or --apps-file)")
+        sys.exit(1)
+
+    def on_event(event, job, result):
+        if event == "submitted":
+            print(f"  submitted {job['app_id']} → scan {result['scan_id']}")
+        elif event == "completed":
+            print(f"  completed {job['app_id']} in {result['duration']}s")
+        else:
+            print(f"  FAILED {job['app_id']}: {result['error']}")
+
+    client = get_service_client(config, "mobilicustos")
+    scan_type = args.scan_type or default_profile(config, "mobilicustos")
+    print(f"Scanning {len(app_ids)} app(s), {args.max_in_flight} at a time ({scan_type})")
+    summary = run_mobile_batch(
+        client, ws_path, app_ids, scan_type=scan_type, max_in_flight=args.max_in_flight, on_event=on_event
+    )
+    skipped = sum(1 for r in summary["apps"].values() if r["skipped"])
+    print(f"\nCompleted: {summary['completed']}/{len(summary['apps'])} (already exported: {skipped})")
+    if summary["failed"]:
+        print(f"Failed: {', '.join(summary['failed'])}")
+    print(f"Summary: {ws_path / 'mobilicustos-batch.json'}")
+    print(f"\n__MOBILE_BATCH_JSON__:{json.dumps({k: v for k, v in summary.items() if k != 'apps'})}")
+
+
+def cmd_cloud_shard(args, config):
+    """Run a Nubicustos audit split into per-account/per-region shards."""
+    from cloud_shard import SHARDS_FILE, run_sharded_audit
+    from scans import default_profile
+    from services import get_service_client
+
+    ws_path = Path(args.workspace).expanduser()
+    meta = load_workspace(ws_path)
+    target = args.target or meta["target"]
+    profile = args.profile or default_profile(config, "nubicustos")
+    max_in_flight = args.max_in_flight or config["services"]["nubicustos"].get("max_in_flight", 4)
+
+    def on_event(event, job, result):
+        if event == "submitted":
+            print(f"  submitted {job['key']} → scan {result['scan_id']}")
+        elif event == "completed":
+            print(f"  completed {job['key']} in {result['duration']}s")
+        else:
+            print(f"  FAILED {job['key']}: {result['error']}")
+
+    client = get_service_client(config, "nubicustos")
+    print(f"Sharded {profile} audit of {target}, {max_in_flight} shard(s) at a time")
+    summary = run_sharded_audit(
+        client,
+        ws_path,
+        target,
+        profile=profile,
+        accounts=args.accounts,
+        regions=args.regions,
+        max_in_flight=max_in_flight,
+        retries=args.retries,
+        on_event=on_event,
+    )
+    print(f"\nShards completed: {summary['completed']}/{summary['shards']} (from earlier runs: {summary['skipped']})")
+    print(f"Containers in merged inventory: {summary['containers']}")
+    if summary["failed"]:
+        print(f"Failed shards: {', '.join(summary['failed'])} — rerun the same command to retry them")
+    print(f"Shard state: {ws_path / SHARDS_FILE}")
+    print(f"\n__CLOUD_SHARD_JSON__:{json.dumps(summary)}")
+
+
+SCAN_SOURCE_LABELS = {
+    "launched": "Started",
+    "reattached": "Reattached to",
+    "inflight": "Joined in-flight",
+    "cached": "Reused completed",
+}
+
+
+def cmd_run_scan(args, config):
+    """Run a service scan, reattaching to this workspace's in-flight scan if there is one."""
+    from coalesce import ScanRegistry
+    from scans import default_profile, run_scan
+    from services import get_service_client
+
+    ws_path = Path(args.workspace).expanduser()
+    meta = load_workspace(ws_path)
+    target = args.target or meta["target"]
+    profile = args.profile or default_profile(config, args.service)
+    client = get_service_client(config, args.service)
+    registry = None if args.no_coalesce else ScanRegistry.for_config(config)
+
+    result = run_scan(client, args.service, ws_path, target, profile, registry=registry)
+    if result["skipped"]:
+        print(f"{args.service} scan {result['scan_id']} already exported — nothing to do")
+    else:
+        print(f"{SCAN_SOURCE_LABELS[result['source']]} {args.service} scan {result['scan_id']} ({profile})")
+    for path in result["outputs"]:
+        print(f"  {path}")
+    summary = {"service": args.service, "scan_id": result["scan_id"], "source": result["source"]}
+    print(f"\n__SCAN_JSON__:{json.dumps(summary)}")
+
+
+def _resolve_workspace(args, config) -> Path:
+    """Workspace from --workspace, or the latest run."""
+    if getattr(args, "workspace", None):
+        return Path(args.workspace).expanduser()
+    from workspace import find_latest_workspace
+    ws_path = find_latest_workspace(config)
+    if not ws_path:
+        print("No workspaces found.")
+        sys.exit(1)
+    return ws_path
+
+
+def cmd_scan_cache(args, config):
+    """Show or clear the registry of scans shared between runs."""
+    from coalesce import ScanRegistry
+
+    registry = ScanRegistry.for_config(config)
+    if args.clear:
+        registry.clear()
+        print(f"Cleared shared scans in {registry.path}")
+        return
+
+    data = registry.snapshot()
+    stats = data["stats"]
+    requests = stats["launched"] + stats["inflight_hits"] + stats["cached_hits"]
+    hit_rate = (stats["inflight_hits"] + stats["cached_hits"]) / requests if requests else 0.0
+    print(f"Scan registry: {registry.path} (TTL {registry.ttl:.0f}s)")
+    print(f"Requests: {requests} — launched {stats['launched']}, joined in-flight {stats['inflight_hits']}, "
+          f"reused completed {stats['cached_hits']} (hit rate {hit_rate:.0%})")
+    if data["scans"]:
+        print(f"\nShared scans ({len(data['scans'])}):")
+        for key, entry in data["scans"].items():
+            print(f"  {key} → scan {entry['scan_id']} [{entry['state']}, {entry['requesters']} requester(s)]")
+
+
+def cmd_mark(args, config):
+    """Record a run/phase/agent boundary in the workspace trace."""
+    import tracing
+
+    ws_path = Path(args.workspace).expanduser()
+    attrs = {"status": args.status} if args.status else {}
+    tracing.mark(ws_path, args.kind, args.name, args.event, **attrs)
+
+
+def cmd_agent_failed(args, config):
+    """Report an agent failure; cancels the run if the run's policy says it is fatal."""
+    import cancel
+
+    ws_path = Path(args.workspace).expanduser()
+    meta = load_workspace(ws_path)
+    reason = f"{args.agent} failed" + (f": {args.reason}" if args.reason else "")
+    fatal = args.fatal or args.agent in cancel.abort_on(meta)
+    if fatal:
+        cancel.CancelToken(ws_path).cancel(reason, source=args.agent)
+        print(f"ABORT: {reason} — run cancelled; sibling agents stop at their next check")
+    else:
+        print(f"CONTINUE: {reason} — not fatal for this run")
+    print(f"\n__AGENT_FAILED_JSON__:{json.dumps({'agent': args.agent, 'abort': fatal, 'reason': reason})}")
+
+
+def cmd_cancel(args, config):
+    """Cancel a run (or clear a previous cancellation before resuming it)."""
+    import cancel
+
+    ws_path = Path(args.workspace).expanduser()
+    if args.clear:
+        print("Cancellation cleared" if cancel.clear(ws_path) else "Run was not cancelled")
+        return
+    cancel.CancelToken(ws_path).cancel(args.reason, source="user")
+    print(f"Run cancelled: {args.reason}")
+
+
+def cmd_trace(args, config):
+    """Print the critical path and slowest operations of a traced run."""
+    import tracing
+
+    ws_path = _resolve_workspace(args, config)
+    trace_file = ws_path / tracing.TRACE_FILE
+    spans = tracing.load_workspace_spans(ws_path)
+    if spans is None:
+        print(f"No trace recorded in {ws_path}")
+        sys.exit(1)
+    if not spans:
+        print("Trace is empty.")
+        return
+
+    path = tracing.critical_path(spans)
+    total = path[0][1]["duration"] or 1e-9
+    print(f"Trace: {trace_file} ({len(spans)} spans)")
+    print(f"\nCritical path ({path[0][1]['duration']:.1f}s):")
+    omitted = 0
+    for depth, s in path:
+        share = 100 * s["duration"] / total
+        if depth > 0 and share < 1:
+            omitted += 1
+            continue
+        print(f"  {'  ' * depth}{s['kind']}: {s['name']} — {s['duration']:.2f}s ({share:.0f}%)")
+    if omitted:
+        print(f"  ({omitted} operations under 1% omitted)")
+
+    print(f"\nSlowest operations (top {args.top}):")
+    for s in tracing.slowest(spans, args.top, kinds={"rest", "poll", "subprocess"}):
+        print(f"  {s['duration']:8.2f}s  {s['kind']:<10} {s['name']}")
+
+    if args.chrome:
+        Path(args.chrome).write_text(json.dumps(tracing.to_chrome_trace(spans)))
+        print(f"\nChrome trace written: {args.chrome}")
+    if args.prometheus:
+        Path(args.prometheus).write_text(tracing.to_prometheus(spans))
+        print(f"Prometheus textfile written: {args.prometheus}")
+
+
+def _format_bytes(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024:
+            return f"{n:.0f}{unit}"
+        n /= 1024
+    return f"{n:.1f}TB"
+
+
+def _format_duration(seconds: float) -> str:
+    if seconds < 90:
+        return f"{seconds:.0f}s"
+    if seconds < 5400:
+        return f"{seconds / 60:.1f}m"
+    return f"{seconds / 3600:.1f}h"
+
+
+def cmd_enqueue(args, config):
+    """Enqueue a run's agents as jobs for distributed workers."""
+    from jobqueue import enqueue_run, open_queue
+
+    ws_path = Path(args.workspace).expanduser()
+    meta = load_workspace(ws_path)
+    queue = open_queue(config)
+    skip = set(args.skip or [])
+    if args.weight is not None:
+        if not args.program:
+            print("--weight needs --program")
+            sys.exit(1)
+        queue.set_weight(args.program, args.weight)
+    job_ids = enqueue_run(
+        queue, ws_path, meta["target_type"], skip=skip, max_attempts=args.max_attempts,
+        priority=args.priority, program=args.program,
+    )
+    deps = get_agent_dependencies(meta["target_type"])
+    program = f", program {args.program}" if args.program else ""
+    print(f"Enqueued {len(job_ids)} job(s) for {meta['target']} [{meta['target_type']}] at priority "
+          f"{args.priority}{program} in {queue.path}")
+    for agent, job_id in job_ids.items():
+        waits = [d for d in deps[agent] if d in job_ids]
+        print(f"  #{job_id} {agent}" + (f" (after {', '.join(waits)})" if waits else ""))
+    print(f"\n__ENQUEUE_JSON__:{json.dumps({'workspace': str(ws_path), 'jobs': job_ids})}")
+
+
+def cmd_worker(args, config):
+    """Lease and run queued jobs until stopped (or idle / out of jobs)."""
+    from jobqueue import Worker, open_queue
+
+    qcfg = config.get("queue", {})
+    worker = Worker(
+        open_queue(config),
+        name=args.name,
+        lease_seconds=args.lease or qcfg.get("lease", 60),
+        heartbeat_interval=args.heartbeat or qcfg.get("heartbeat", 15),
+        poll_interval=args.poll_interval,
+        orchestrator_args=["--config", args.config] if args.config else [],
+    )
+
+    def on_event(event, job):
+        if event == "preempted":
+            print(f"[{worker.name}] {job['run']} (priority {job['priority']}) preempted by "
+                  f"{job['by']['run']} (priority {job['by']['priority']}); pending: {', '.join(job['agents'])}",
+                  flush=True)
+            return
+        label = {"leased": "started", "pending": "will retry", "done": "done", "failed": "FAILED"}[event]
+        print(f"[{worker.name}] #{job['id']} {job['run']}/{job['agent']} {label}", flush=True)
+
+    print(f"Worker {worker.name} polling {worker.queue.path}", flush=True)
+    counts = worker.run(max_jobs=args.max_jobs, idle_exit=args.idle_exit, on_event=on_event)
+    print(f"Worker {worker.name} exiting: {counts['done']} done, {counts['failed']} failed, "
+          f"{counts['retried']} returned for retry")
+    print(f"\n__WORKER_JSON__:{json.dumps({'worker': worker.name, **counts})}")
+
+
+def cmd_queue_status(args, config):
+    """Show queued, running and finished jobs, and queue wait per priority class."""
+    from jobqueue import open_queue, queue_summary, wait_metrics
+
+    queue = open_queue(config)
+    jobs = queue.jobs(run=args.run)
+    summary = queue_summary(jobs)
+    summary["wait"] = wait_metrics(jobs)
+    summary["weights"] = queue.weights()
+    print(f"Queue: {queue.path} — {summary['total']} job(s)")
+    print("  " + ", ".join(f"{status}: {n}" for status, n in sorted(summary["by_status"].items())))
+    for worker, held in summary["workers"].items():
+        print(f"  {worker} running {', '.join(held)}")
+    if args.run:
+        print()
+        for job in jobs:
+            line = (f"  #{job['id']} {job['agent']}: {job['status']} (priority {job['priority']}, "
+                    f"attempt {job['attempts']}/{job['max_attempts']})")
+            if job["error"]:
+                line += f" — {job['error']}"
+            print(line)
+    else:
+        for run, counts in summary["runs"].items():
+            print(f"  {run}: " + ", ".join(f"{status} {n}" for status, n in sorted(counts.items())))
+    if summary["weights"]:
+        print("\nProgram weights: " + ", ".join(f"{p} {w:g}" for p, w in sorted(summary["weights"].items())))
+    if jobs:
+        print(f"\n{'priority':>8} {'started':>8} {'mean':>8} {'p50':>8} {'p95':>8} {'max':>8} "
+              f"{'waiting':>8} {'oldest':>8} {'preempt':>8}")
+
+        def secs(value):
+            return "-" if value is None else f"{value:.1f}s"
+
+        for priority, m in summary["wait"].items():
+            print(f"{priority:>8} {m['started']:>8} {secs(m['mean']):>8} {secs(m['p50']):>8} {secs(m['p95']):>8} "
+                  f"{secs(m['max']):>8} {m['waiting']:>8} {secs(m['oldest']):>8} {m['preemptions']:>8}")
+    print(f"\n__QUEUE_JSON__:{json.dumps(summary)}")
+
+
+def cmd_run_agent(args, config):
+    """Run an agent's tool work non-interactively (what distributed workers execute)."""
+    import tracing
+    from agent_runners import run_agent
+
+    ws_path = Path(args.workspace).expanduser()
+    meta = load_workspace(ws_path)
+    tracing.mark(ws_path, "agent", args.agent, "start")
+    status = "failed"
+    try:
+        result = run_agent(config, ws_path, meta, args.agent)
+        status = result["status"]
+    finally:
+        tracing.mark(ws_path, "agent", args.agent, "end", status=status)
+    print(f"{args.agent}: {status}" + (f" — {result['detail']['reason']}" if status == "skipped" else ""))
+    for path in result["outputs"]:
+        print(f"  {path}")
+    print(f"\n__AGENT_JSON__:{json.dumps({'agent': args.agent, 'status': status, 'outputs': result['outputs']})}")
+
+
+def cmd_archive(args, config):
+    """Pack finished runs into one zip each, or restore an archived run."""
+    from archive import ARCHIVE_SUFFIX, archivable, archive_workspace, parse_age, restore_workspace
+
+    if args.restore:
+        # Accept the archive file as well as the workspace path it restores to
+        restore = str(Path(args.restore).expanduser()).removesuffix(ARCHIVE_SUFFIX)
+        try:
+            ws_path = restore_workspace(restore)
+        except FileNotFoundError as e:
+            print(e)
+            sys.exit(1)
+        print(f"Restored: {ws_path}")
+        print(f"\n__ARCHIVE_JSON__:{json.dumps({'restored': str(ws_path)})}")
+        return
+    if not args.older_than:
+        print("archive needs --older-than (or --restore)")
+        sys.exit(1)
+
+    try:
+        older_than = parse_age(args.older_than)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+    root = get_workspace_root(config)
+    runs = archivable(root, older_than, args.status) if root.exists() else []
+    statuses = "/".join(args.status or ["completed"])
+    print(f"{len(runs)} {statuses} run(s) older than {args.older_than}" + (" (dry run)" if args.dry_run else ""))
+    totals = {"runs": 0, "files": 0, "bytes": 0, "archive_bytes": 0}
+    for ws_path in runs:
+        if args.dry_run:
+            print(f"  {ws_path.name}")
+            continue
+        stats = archive_workspace(ws_path)
+        for key in ("files", "bytes", "archive_bytes"):
+            totals[key] += stats[key]
+        totals["runs"] += 1
+        print(f"  {ws_path.name}: {stats['files']} files, "
+              f"{_format_bytes(stats['bytes'])} → {_format_bytes(stats['archive_bytes'])}")
+    if totals["runs"]:
+        print(f"Archived {totals['runs']} run(s): "
+              f"{_format_bytes(totals['bytes'])} → {_format_bytes(totals['archive_bytes'])}")
+    print(f"\n__ARCHIVE_JSON__:{json.dumps(totals)}")
+
+
+def cmd_index(args, config):
+    """Add runs' findings to the cross-run search index (only changed artifacts are re-read)."""
+    from findings_index import FindingsIndex
+
+    index = FindingsIndex.for_config(config)
+    if args.workspace:
+        workspaces = [Path(args.workspace).expanduser()]
+    else:
+        workspaces = [Path(run["path"]) for run in list_workspaces(config, limit=args.limit or 10**9)]
+    totals = {"runs": len(workspaces), "artifacts": 0, "skipped": 0, "findings": 0, "pruned": 0}
+    for ws_path in workspaces:
+        stats = index.index_workspace(ws_path, force=args.force)
+        for key in ("artifacts", "skipped", "findings"):
+            totals[key] += stats[key]
+    if args.prune:
+        root = get_workspace_root(config)
+        existing = {ws.name for ws in iter_runs(root)}
+        totals["pruned"] = index.prune(existing)
+    overall = index.stats()
+    pruned = f", pruned {totals['pruned']} artifact(s)" if args.prune else ""
+    print(f"Indexed {totals['findings']:,} findings from {totals['artifacts']} artifact(s) "
+          f"across {totals['runs']} run(s) ({totals['skipped']} unchanged){pruned}")
+    print(f"Index: {index.path} — {overall['findings']:,} findings, {overall['runs']} runs, "
+          f"{_format_bytes(overall['bytes'])}")
+    print(f"\n__INDEX_JSON__:{json.dumps({**totals, 'index': overall})}")
+
+
+def cmd_search(args, config):
+    """Search findings across all indexed runs."""
+    import time
+
+    from findings_index import FindingsIndex
+
+    index = FindingsIndex.for_config(config)
+    start = time.perf_counter()
+    try:
+        rows = index.search(
+            text=" ".join(args.query) if args.query else None,
+            target=args.target,
+            tool=args.tool,
+            severity=args.severity,
+            cwe=args.cwe,
+            endpoint=args.endpoint,
+            fingerprint=args.fingerprint,
+            run=args.run,
+            group=args.group,
+            limit=args.limit,
+        )
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"{len(rows)} result(s) in {elapsed_ms:.1f} ms" + (" (limit reached)" if len(rows) == args.limit else ""))
+    for row in rows:
+        cwe = f" {row['cwe']}" if row["cwe"] else ""
+        if args.group:
+            print(f"  [{row['severity'] or '?'}]{cwe} {row['title']} — {row['endpoint'] or '-'}")
+            print(f"    {row['occurrences']} occurrence(s) in {row['runs']} run(s), "
+                  f"first {row['first_seen']}, last {row['last_seen']} (fp {row['fingerprint']})")
+        else:
+            print(f"  [{row['severity'] or '?'}]{cwe} {row['title']} — {row['endpoint'] or '-'}")
+            print(f"    {row['run']} ({row['tool']}, fp {row['fingerprint']})")
+    print(f"\n__SEARCH_JSON__:{json.dumps({'results': rows, 'elapsed_ms': round(elapsed_ms, 2)})}")
+
+
+def cmd_plan(args, config):
+    """Estimate run time, phase breakdown and critical path from past runs."""
+    from planner import collect_history, input_size, plan_run, recommend_batch, run_profile
+
+    history = [Path(run["path"]) for run in list_workspaces(config, limit=args.limit)]
+    samples = collect_history(history)
+    target_type, profile = args.type, args.profile
+    sizes = {}
+    if args.workspace:
+        ws_path = Path(args.workspace).expanduser()
+        target_type = target_type or load_workspace(ws_path)["target_type"]
+        profile = profile or run_profile(ws_path)
+        sizes = {agent: n for agent in AGENTS if (n := input_size(ws_path, agent))}
+    if not target_type:
+        print("Give --type or --workspace")
+        sys.exit(1)
+
+    profile = profile or "default"
+    plan = plan_run(samples, target_type, profile=profile, sizes=sizes, skip=set(args.skip or []))
+    print(f"Plan for {target_type} run (profile {plan['profile']}), from {len(samples)} agent run(s) "
+          f"in {len(history)} past workspace(s)\n")
+    for phase in plan["phases"]:
+        if not phase["agents"]:
+            print(f"  Phase {phase['phase']}: no history")
+            continue
+        print(f"  Phase {phase['phase']}: ~{_format_duration(phase['p50'])} "
+              f"(p90 {_format_duration(phase['p90'])}, {phase['share']:.0%} of run)")
+        for agent, est in phase["agents"].items():
+            marker = " *" if agent == phase["critical"] else ""
+            size = f", {sizes[agent]} inputs" if agent in sizes else ""
+            print(f"    {agent}{marker}: p50 {_format_duration(est['p50'])}, p90 {_format_duration(est['p90'])} "
+                  f"[{est['samples']} samples, {est['basis']}{size}]")
+    print(f"\nEstimated run time: {_format_duration(plan['total_p50'])} (p90 {_format_duration(plan['total_p90'])})")
+    if plan["critical_path"]:
+        print(f"Critical path: {' → '.join(plan['critical_path'])}")
+    if plan["unknown"]:
+        print(f"No history for: {', '.join(plan['unknown'])} (not included in the estimate)")
+
+    if args.runs:
+        batch = recommend_batch(plan, config, history, args.runs)
+        print(f"\nBatch of {batch['runs']} run(s): run {batch['concurrency']} at a time"
+              + (f" (limited by {batch['bottleneck']})" if batch["bottleneck"] else ""))
+        print(f"Estimated batch time: {_format_duration(batch['batch_p50'])} "
+              f"(p90 {_format_duration(batch['batch_p90'])})")
+        plan["batch"] = batch
+    print(f"\n__PLAN_JSON__:{json.dumps(plan)}")
+
+
+def cmd_tool_usage(args, config):
+    """Aggregate per-tool CPU, memory and I/O usage across runs."""
+    from usage import aggregate, load_usage
+
+    if args.workspace:
+        workspaces = [Path(args.workspace).expanduser()]
+    else:
+        workspaces = [Path(run["path"]) for run in list_workspaces(config, limit=args.limit)]
+
+    summary = aggregate(load_usage(workspaces))
+    if not summary:
+        print("No tool usage recorded.")
+        return
+
+    print(f"Tool usage across {len(workspaces)} run(s):\n")
+    for tool, s in summary.items():
+        print(f"  {tool} — {s['runs']} run(s), {s['failures']} failed, {s['bound']}")
+        print(f"    wall: p50 {s['wall_p50']:.1f}s, p95 {s['wall_p95']:.1f}s, max {s['wall_max']:.1f}s")
+        print(f"    cpu: {s['cpu_mean']:.1f}s mean, {s['cpu_util']:.2f} cores busy per wall second")
+        rss_p95, rss_max = _format_bytes(s["max_rss_kb_p95"] * 1024), _format_bytes(s["max_rss_kb_max"] * 1024)
+        print(f"    peak rss: p95 {rss_p95}, max {rss_max}")
+        read, written = _format_bytes(s["read_bytes_mean"]), _format_bytes(s["write_bytes_mean"])
+        print(f"    io: {read} read, {written} written per run")
+        print(f"    suggested concurrency on this host: {s['suggested_concurrency']}")
+        print()
+
+
+def cmd_bench(args, config):
+    """Benchmark pipeline code paths against local stand-ins and a stored baseline."""
+    from bench import suite
+
+    baseline_path = Path(args.baseline).expanduser() if args.baseline else suite.DEFAULT_BASELINE_PATH
+    results = suite.run_suite(
+        only=args.only,
+        latency=args.latency_ms / 1000,
+        findings=args.findings,
+        finding_bytes=args.finding_bytes,
+        endpoints=args.endpoints,
+        tool_delay=args.tool_delay,
+        scale=args.scale,
+    )
+
+    print(f"{'benchmark':<26} {'iters':>6} {'p50 ms':>9} {'p95 ms':>9} {'ops/s':>9} {'peak KB':>9}")
+    for name, r in results.items():
+        print(
+            f"{name:<26} {r['iterations']:>6} {r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f}"
+            f" {r['ops_per_sec']:>9.1f} {r['peak_kb']:>9.0f}"
+        )
+
+    if args.save_baseline:
+        suite.save_baseline(baseline_path, {**suite.load_baseline(baseline_path), **results})
+        print(f"\nBaseline saved: {baseline_path}")
+        return
+
+    baseline = suite.load_baseline(baseline_path)
+    if not baseline:
+        print(f"\nNo baseline at {baseline_path}. Run with --save-baseline to create one.")
+        return
+
+    rows = suite.compare(results, baseline, tolerance=args.tolerance)
+    print(f"\nAgainst baseline {baseline_path} (tolerance {args.tolerance:.0%}):")
+    for row in rows:
+        flag = "REGRESSION" if row["regressed"] else "ok"
+        print(f"  {row['name']:<26} latency {row['latency_change']:+.0%}  memory {row['memory_change']:+.0%}  {flag}")
+    regressions = [row["name"] for row in rows if row["regressed"]]
+    if regressions:
+        print(f"\nRegressions: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+def cmd_synth_workspaces(args, config):
+    """Generate synthetic workspaces for scale testing."""
+    from bench.synth import generate_workspaces
+
+    root = Path(args.root).expanduser()
+    summary = generate_workspaces(
+        root,
+        runs=args.runs,
+        artifact_kb=args.artifact_kb,
+        duplication=args.duplication,
+        large_artifact_mb=args.large_mb,
+        seed=args.seed,
+    )
+    print(f"Generated {summary['runs']} run(s) under {root} ({_format_bytes(summary['bytes'])} of artifacts)")
+
+
+def cmd_scale_test(args, config):
+    """Time orchestrator operations against a large workspace root."""
+    from bench.scale import run_scale_test
+
+    root = Path(args.root).expanduser()
+    if not root.exists():
+        print(f"Workspace root not found: {root}")
+        sys.exit(1)
+
+    runs = sum(1 for _ in iter_runs(root))
+    print(f"Scale test: {root} ({runs} runs)\n")
+    print(f"{'operation':<48} {'time':>10} {'peak mem':>10}")
+    for name, r in run_scale_test(config, root, only=args.only).items():
+        print(f"{name:<48} {r['seconds'] * 1000:>8.1f}ms {_format_bytes(r['peak_kb'] * 1024):>10}")
+
+
+def main():
+    # No abbreviations, or a subcommand's --profile would be read as an ambiguous --profiler
+    parser = argparse.ArgumentParser(description="Bounty Pipeline Orchestrator", allow_abbrev=False)
+    parser.add_argument("--config", help="Config file path")
+    # Not --profile: several subcommands take a scan --profile of their own
+    parser.add_argument("--profiler", choices=["cprofile", "sample"],
+                        help="Profile this invocation (default: $BOUNTY_PIPELINE_PROFILE); see profiling.py")
+    parser.add_argument("--profiler-interval", type=float, default=5.0, help="Sampling interval in ms")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    # check-services
+    check_parser = subparsers.add_parser("check-services", help="Check required services")
+    check_parser.add_argument("--type", required=True, choices=["web", "mobile", "cloud", "full", "api"])
+    check_parser.add_argument("--refresh-tools", action="store_true", help="Re-probe tool versions and flags")
+
+    # init-workspace
+    init_parser = subparsers.add_parser("init-workspace", help="Create a run workspace")
+    init_parser.add_argument("--target", required=True, help="Target identifier")
+    init_parser.add_argument("--type", required=True, choices=["web", "mobile", "cloud", "full", "api"])
+    init_parser.add_argument("--abort-on", help="Comma-separated agents whose failure cancels the run ('' for none)")
+
+    # status
+    status_parser = subparsers.add_parser("status", help="Show run status")
+    status_parser.add_argument("--workspace", help="Workspace path (default: latest)")
+
+    # watch
+    watch_parser = subparsers.add_parser("watch", help="Live progress, throughput and ETA of active runs")
+    watch_parser.add_argument("--workspace", action="append", help="Watch this workspace (repeatable; default: "
+                              "every run with trace activity in the last --idle seconds)")
+    watch_parser.add_argument("--interval", type=float, default=2.0, help="Seconds between refreshes")
+    watch_parser.add_argument("--idle", type=float, default=600, help="Seconds of trace inactivity before a run "
+                              "is no longer shown")
+    watch_parser.add_argument("--history", type=int, default=50, help="Past runs the ETA estimates use")
+    watch_parser.add_argument("--once", action="store_true", help="Print one snapshot and exit")
+
+    # list-runs
+    list_parser = subparsers.add_parser("list-runs", help="List recent runs")
+    list_parser.add_argument("--limit", type=int, default=10, help="Max runs to show")
+
+    # stream-fuzz
+    stream_parser = subparsers.add_parser("stream-fuzz", help="Overlap recon and API fuzzing")
+    stream_parser.add_argument("--workspace", required=True, help="Workspace path")
+    stream_parser.add_argument("--scan-id", help="Existing Reticustos scan (default: start a new one)")
+    stream_parser.add_argument("--profile", help="Reticustos scan profile for a new scan")
+    stream_parser.add_argument("--batch-size", type=int, default=50, help="Endpoints per Indago batch")
+    stream_parser.add_argument("--max-wait", type=float, default=60.0, help="Max seconds a partial batch waits")
+    stream_parser.add_argument("--samples", type=int, default=1, help="Endpoints fuzzed per route template")
+    stream_parser.add_argument("--no-canonicalize", action="store_true", help="Fuzz every exported endpoint")
+
+    # adaptive-fuzz
+    af_parser = subparsers.add_parser("adaptive-fuzz", help="Indago in waves with per-host AIMD rate control")
+    af_parser.add_argument("--workspace", required=True, help="Workspace path")
+    af_parser.add_argument("--input", help="Endpoint export (default: canonical, else raw export)")
+    af_parser.add_argument("--wave-size", type=int, default=50, help="Endpoints per wave")
+    af_parser.add_argument("--max-hosts", type=int, default=4, help="Hosts fuzzed in parallel")
+    af_parser.add_argument("--initial-concurrency", type=int, default=5, help="Concurrency for each host's first wave")
+    af_parser.add_argument("--initial-rate", type=int, default=10, help="Requests/s for each host's first wave")
+    af_parser.add_argument("--max-concurrency", type=int, default=50, help="Upper bound on concurrency")
+    af_parser.add_argument("--max-rate", type=int, default=200, help="Upper bound on requests/s")
+
+    # canonicalize-endpoints
+    canon_parser = subparsers.add_parser("canonicalize-endpoints", help="Collapse endpoints into route templates")
+    canon_parser.add_argument("--workspace", required=True, help="Workspace path")
+    canon_parser.add_argument("--input", help="Endpoint export (default: WORKSPACE/reticustos-endpoints.json)")
+    canon_parser.add_argument("--samples", type=int, default=1, help="Concrete endpoints kept per template")
+
+    # prune-graph
+    prune_parser = subparsers.add_parser("prune-graph", help="Prune the Vinculum export to the crown jewel slice")
+    prune_parser.add_argument("--workspace", required=True, help="Workspace path")
+    prune_parser.add_argument("--input", help="Vinculum export (default: WORKSPACE/vinculum-ariadne.json)")
+    prune_parser.add_argument("--target", "-t", action="append",
+                              help="Crown jewel: node id, IP, hostname or name; globs allowed (repeatable)")
+    prune_parser.add_argument("--max-hops", type=int, help="Keep only nodes within this many hops of a crown jewel")
+    prune_parser.add_argument("--keep-info", action="store_true", help="Keep informational findings")
+
+    # run-scan
+    scan_parser = subparsers.add_parser("run-scan", help="Run or resume a service scan and export results")
+    scan_parser.add_argument("--workspace", required=True, help="Workspace path")
+    scan_parser.add_argument("--service", required=True, choices=["reticustos", "nubicustos", "mobilicustos"])
+    scan_parser.add_argument("--target", help="Scan target or app ID (default: workspace target)")
+    scan_parser.add_argument("--profile", help="Scan profile / scan type (default from config)")
+
+    scan_parser.add_argument("--no-coalesce", action="store_true", help="Never share scans with other runs")
+
+    # scan-cache
+    cache_parser = subparsers.add_parser("scan-cache", help="Show shared scan registry and hit statistics")
+    cache_parser.add_argument("--clear", action="store_true", help="Forget all shared scans")
+
+    # container-batch
+    cb_parser = subparsers.add_parser("container-batch", help="Cepheus analysis across the container inventory")
+    cb_parser.add_argument("--workspace", required=True, help="Workspace path")
+    cb_parser.add_argument("--workers", type=int, default=4, help="Concurrent Cepheus processes")
+    cb_parser.add_argument("--min-severity", default="low", help="Minimum severity to report")
+    cb_parser.add_argument("--llm", action="store_true", help="Enable Cepheus LLM analysis")
+    cb_parser.add_argument("--no-cache", action="store_true", help="Re-analyze images seen in earlier runs")
+
+    # mobile-batch
+    mb_parser = subparsers.add_parser("mobile-batch", help="Scan many mobile apps with Mobilicustos")
+    mb_parser.add_argument("--workspace", required=True, help="Workspace path")
+    mb_parser.add_argument("--apps", nargs="+", help="App IDs to scan")
+    mb_parser.add_argument("--apps-file", help="File with one app ID per line")
+    mb_parser.add_argument("--scan-type", help="full, static or dynamic (default from config)")
+    mb_parser.add_argument("--max-in-flight", type=int, default=4, help="Concurrent scans on the service")
+
+    # cloud-shard
+    cs_parser = subparsers.add_parser("cloud-shard", help="Nubicustos audit sharded by account and region")
+    cs_parser.add_argument("--workspace", required=True, help="Workspace path")
+    cs_parser.add_argument("--target", help="Cloud target (default: workspace target)")
+    cs_parser.add_argument("--profile", help="Scan profile (default from config)")
+    cs_parser.add_argument("--accounts", nargs="+", help="Accounts / subscriptions, one shard each (default: target)")
+    cs_parser.add_argument("--regions", nargs="+", help="Regions to split each account into (default: all in one)")
+    cs_parser.add_argument("--max-in-flight", type=int, help="Concurrent shard scans (default from config)")
+    cs_parser.add_argument("--retries", type=int, default=1, help="Relaunches per failed shard")
+
+    # mark
+    mark_parser = subparsers.add_parser("mark", help="Record a phase/agent boundary in the trace")
+    mark_parser.add_argument("--workspace", required=True, help="Workspace path")
+    mark_parser.add_argument("--kind", required=True, choices=["run", "phase", "agent"])
+    mark_parser.add_argument("--name", required=True, help="Run target, phase or agent name")
+    mark_parser.add_argument("--event", required=True, choices=["start", "end"])
+    mark_parser.add_argument("--status", help="Outcome to attach (e.g. ok, failed, skipped)")
+
+    # plan
+    plan_parser = subparsers.add_parser("plan", help="Estimate run time from past runs")
+    plan_parser.add_argument("--type", choices=["web", "mobile", "cloud", "full", "api"], help="Pipeline type")
+    plan_parser.add_argument("--profile", help="Scan profile the run will use")
+    plan_parser.add_argument("--workspace", help="Plan an existing run, using its input sizes")
+    plan_parser.add_argument("--skip", nargs="+", help="Agents that will be skipped")
+    plan_parser.add_argument("--runs", type=int, help="Recommend concurrency for a batch of this many runs")
+    plan_parser.add_argument("--limit", type=int, default=200, help="Max past runs to learn from")
+
+    # enqueue
+    enqueue_parser = subparsers.add_parser("enqueue", help="Queue a run's agents for distributed workers")
+    enqueue_parser.add_argument("--workspace", required=True, help="Workspace path")
+    enqueue_parser.add_argument("--skip", nargs="+", help="Agents to leave out")
+    enqueue_parser.add_argument("--max-attempts", type=int, default=2, help="Attempts per job before it fails")
+    enqueue_parser.add_argument("--priority", type=int, default=0, help="Higher runs first (default 0)")
+    enqueue_parser.add_argument("--program", help="Program the run belongs to, for fair share (default: the run)")
+    enqueue_parser.add_argument("--weight", type=float, help="Set the program's fair-share weight (default 1)")
+
+    # worker
+    worker_parser = subparsers.add_parser("worker", help="Run queued jobs (start one or more per node)")
+    worker_parser.add_argument("--name", help="Worker name (default: host:pid)")
+    worker_parser.add_argument("--max-jobs", type=int, help="Exit after this many jobs")
+    worker_parser.add_argument("--idle-exit", type=float, help="Exit after the queue is idle this many seconds")
+    worker_parser.add_argument("--lease", type=float, help="Lease length in seconds (default from config)")
+    worker_parser.add_argument("--heartbeat", type=float, help="Seconds between lease renewals (default from config)")
+    worker_parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds between polls when idle")
+
+    # queue-status
+    qs_parser = subparsers.add_parser("queue-status", help="Show the distributed job queue")
+    qs_parser.add_argument("--run", help="Show one run's jobs (workspace directory name)")
+
+    # run-agent
+    ra_parser = subparsers.add_parser("run-agent", help="Run an agent's tool work without the LLM")
+    ra_parser.add_argument("--workspace", required=True, help="Workspace path")
+    ra_parser.add_argument("--agent", required=True, choices=sorted(AGENTS), help="Agent key")
+
+    # archive
+    archive_parser = subparsers.add_parser("archive", help="Pack finished runs into one zip each")
+    archive_parser.add_argument("--older-than", help="Minimum age since the run's last update, e.g. 30d, 12h, 2w")
+    archive_parser.add_argument("--status", nargs="+", help="Run statuses to archive (default: completed)")
+    archive_parser.add_argument("--dry-run", action="store_true", help="List the runs without archiving them")
+    archive_parser.add_argument("--restore", help="Extract an archived run back into its workspace directory")
+
+    # index
+    index_parser = subparsers.add_parser("index", help="Add run findings to the cross-run search index")
+    index_parser.add_argument("--workspace", help="Index one run (default: every run)")
+    index_parser.add_argument("--limit", type=int, help="Index only the most recent runs")
+    index_parser.add_argument("--force", action="store_true", help="Re-read artifacts even if unchanged")
+    index_parser.add_argument("--prune", action="store_true", help="Drop runs that no longer exist")
+
+    # search
+    search_parser = subparsers.add_parser("search", help="Search findings across runs")
+    search_parser.add_argument("query", nargs="*", help="Full-text query over title, description and endpoint")
+    search_parser.add_argument("--target", help="Exact run target")
+    search_parser.add_argument("--tool", help="Tool (reticustos, indago, ...)")
+    search_parser.add_argument("--severity", nargs="+", help="Severities to include")
+    search_parser.add_argument("--cwe", help="CWE id (79 or CWE-79)")
+    search_parser.add_argument("--endpoint", help="Endpoint URL prefix")
+    search_parser.add_argument("--fingerprint", help="Finding fingerprint")
+    search_parser.add_argument("--run", help="Workspace directory name")
+    search_parser.add_argument("--group", action="store_true", help="One row per fingerprint with run counts")
+    search_parser.add_argument("--limit", type=int, default=50, help="Max results")
+
+    # agent-failed
+    af_fail_parser = subparsers.add_parser("agent-failed", help="Report an agent failure (may cancel the run)")
+    af_fail_parser.add_argument("--workspace", required=True, help="Workspace path")
+    af_fail_parser.add_argument("--agent", required=True, help="Agent key (e.g. recon)")
+    af_fail_parser.add_argument("--reason", help="What went wrong")
+    af_fail_parser.add_argument("--fatal", action="store_true", help="Cancel the run regardless of policy")
+
+    # cancel
+    cancel_parser = subparsers.add_parser("cancel", help="Cancel a run's in-flight work")
+    cancel_parser.add_argument("--workspace", required=True, help="Workspace path")
+    cancel_parser.add_argument("--reason", default="cancelled by user", help="Reason recorded for the cancellation")
+    cancel_parser.add_argument("--clear", action="store_true", help="Remove a cancellation (before resuming)")
+
+    # trace
+    trace_parser = subparsers.add_parser("trace", help="Analyze a run trace")
+    trace_parser.add_argument("--workspace", help="Workspace path (default: latest)")
+    trace_parser.add_argument("--top", type=int, default=10, help="Slowest operations to show")
+    trace_parser.add_argument("--chrome", help="Write Chrome trace-event JSON to this path")
+    trace_parser.add_argument("--prometheus", help="Write a Prometheus textfile to this path")
+
+    # tool-usage
+    usage_parser = subparsers.add_parser("tool-usage", help="Aggregate CLI tool resource usage")
+    usage_parser.add_argument("--workspace", help="Single workspace (default: recent runs)")
+    usage_parser.add_argument("--limit", type=int, default=50, help="Max recent runs to aggregate")
+
+    # bench
+    bench_parser = subparsers.add_parser("bench", help="Run offline benchmarks against local stand-ins")
+    bench_parser.add_argument("--only", nargs="+", help="Benchmark names to run (default: all)")
+    bench_parser.add_argument("--latency-ms", type=float, default=0.0, help="Stand-in service latency per request")
+    bench_parser.add_argument("--findings", type=int, default=1000, help="Findings per stand-in payload")
+    bench_parser.add_argument("--finding-bytes", type=int, default=400, help="Approximate bytes per finding")
+    bench_parser.add_argument("--endpoints", type=int, default=200, help="Endpoints per stand-in recon scan")
+    bench_parser.add_argument("--tool-delay", type=float, default=0.0, help="Seconds each fake tool run sleeps")
+    bench_parser.add_argument("--scale", type=float, default=1.0, help="Multiplier on iteration counts")
+    bench_parser.add_argument("--baseline", help="Baseline file (default: ~/.bounty-pipeline/bench-baseline.json)")
+    bench_parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    bench_parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown")
+
+    # synth-workspaces
+    synth_parser = subparsers.add_parser("synth-workspaces", help="Generate synthetic workspaces")
+    synth_parser.add_argument("--root", required=True, help="Directory to generate runs in")
+    synth_parser.add_argument("--runs", type=int, default=1000, help="Number of runs")
+    synth_parser.add_argument("--artifact-kb", type=int, default=16, help="Size of each findings/report artifact")
+    synth_parser.add_argument("--duplication", type=float, default=0.3, help="Share of duplicated findings (0-1)")
+    synth_parser.add_argument("--large-mb", type=int, default=0, help="Size of one large findings file in the newest run")
+    synth_parser.add_argument("--seed", type=int, default=1, help="Random seed")
+
+    # scale-test
+    scale_parser = subparsers.add_parser("scale-test", help="Time orchestrator operations on a workspace root")
+    scale_parser.add_argument("--root", required=True, help="Workspace root to test against")
+    scale_parser.add_argument("--only", nargs="+", help="Substrings of operation names to run")
+
+    args = parser.parse_args()
+    config = load_config(args.config)
+
+    commands = {
+        "check-services": cmd_check_services,
+        "init-workspace": cmd_init_workspace,
+        "status": cmd_status,
+        "list-runs": cmd_list_runs,
+        "watch": cmd_watch,
+        "stream-fuzz": cmd_stream_fuzz,
+        "canonicalize-endpoints": cmd_canonicalize_endpoints,
+        "prune-graph": cmd_prune_graph,
+        "adaptive-fuzz": cmd_adaptive_fuzz,
+        "run-scan": cmd_run_scan,
+        "scan-cache": cmd_scan_cache,
+        "container-batch": cmd_container_batch,
+        "mobile-batch": cmd_mobile_batch,
+        "cloud-shard": cmd_cloud_shard,
+        "mark": cmd_mark,
+        "plan": cmd_plan,
+        "enqueue": cmd_enqueue,
+        "worker": cmd_worker,
+        "queue-status": cmd_queue_status,
+        "run-agent": cmd_run_agent,
+        "archive": cmd_archive,
+        "index": cmd_index,
+        "search": cmd_search,
+        "agent-failed": cmd_agent_failed,
+        "cancel": cmd_cancel,
+        "trace": cmd_trace,
+        "tool-usage": cmd_tool_usage,
+        "bench": cmd_bench,
+        "synth-workspaces": cmd_synth_workspaces,
+        "scale-test": cmd_scale_test,
+    }
+
+    profiler = args.profiler or os.environ.get("BOUNTY_PIPELINE_PROFILE")
+    if not profiler:
+        _dispatch(commands, args, config)
+        return
+
+    import profiling
+
+    try:
+        mode, interval = profiling.parse_mode(profiler)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+    if args.profiler:
+        interval = args.profiler_interval / 1000
+    workspace = getattr(args, "workspace", None)
+    if isinstance(workspace, list):
+        workspace = workspace[0] if len(workspace) == 1 else None
+    output_dir = os.environ.get(profiling.PROFILE_DIR_ENV) or workspace or get_workspace_root(config).parent
+    profiling.start(mode, output_dir, label=args.command, interval=interval)
+    try:
+        _dispatch(commands, args, config)
+    finally:
+        result = profiling.stop()
+        print(f"\n{result['summary']}", file=sys.stderr)
+        print(f"Profile written: {', '.join(result['files'])}", file=sys.stderr)
+
+
+def _dispatch(commands: dict, args, config) -> None:
+    if args.command not in TRACED_COMMANDS:
+        commands[args.command](args, config)
+        return
+
+    # Commands that do work inside a workspace are traced into it, and stop
+    # early (killing their tools) when the run is cancelled. Only they import
+    # tracing and cancel, keeping quick commands like status fast to start.
+    import cancel
+    import tracing
+
+    if getattr(args, "workspace", None):
+        ws_path = Path(args.workspace).expanduser()
+        tracing.configure(ws_path)
+        cancel.configure(ws_path)
+    token = cancel.current()
+    try:
+        with tracing.span("command", args.command):
+            if token:
+                token.raise_if_cancelled()
+            commands[args.command](args, config)
+    except cancel.Cancelled as e:
+        print(f"Cancelled: {e}")
+        sys.exit(3)
+
+
+if __name__ == "__main__":
+    main()
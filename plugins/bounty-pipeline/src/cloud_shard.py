@@ -0,0 +1,162 @@
+"""Sharded Nubicustos audits.
+
+A comprehensive audit of a large AWS organization routinely outlives the
+Nubicustos timeout when run as one scan. This splits the target into
+per-account (and optionally per-region) shards, runs them concurrently with a
+bounded number in flight (see scan_batch.py), retries only the shards that
+failed, and merges the results into the standard nubicustos-findings.json and
+nubicustos-containers.json.
+
+Shard state lives in <workspace>/nubicustos-shards.json and per-shard exports
+in nubicustos-shards/. Running the same audit again skips completed shards,
+reattaches to shards still running on the service and relaunches the rest.
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+from urllib.error import HTTPError
+
+from reports import load_json, merge_reports, write_json
+from scan_batch import FAILED_STATUSES, run_scan_batch
+from scans import scan_id_of
+from services.nubicustos import NubicustosClient
+
+SHARDS_FILE = "nubicustos-shards.json"
+SHARDS_DIR = "nubicustos-shards"
+
+
+def plan_shards(target: str, accounts: list[str] | None = None, regions: list[str] | None = None) -> list[dict]:
+    """Split a cloud target into account x region shards.
+
+    Without accounts the target itself is the only account; without regions
+    each account is one shard covering all regions.
+    """
+    shards = []
+    for account in accounts or [target]:
+        for region in regions or [None]:
+            key = f"{account}/{region}" if region else account
+            shards.append({"key": key, "account": account, "region": region})
+    return shards
+
+
+def _shard_file(key: str, kind: str) -> str:
+    safe = re.sub(r"[^\w\-.]", "_", key)[:80]
+    return f"{safe}-{kind}.json"
+
+
+def _save_state(workspace: Path, state: dict) -> None:
+    path = workspace / SHARDS_FILE
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(state, indent=2))
+    os.replace(tmp, path)
+
+
+def merge_shards(workspace: Path, keys: list[str]) -> dict:
+    """Merge per-shard exports into nubicustos-findings.json and nubicustos-containers.json.
+
+    Containers seen in more than one shard (e.g. a global inventory
+    returned for every region) are kept once.
+    """
+    shard_dir = workspace / SHARDS_DIR
+    findings = merge_reports([load_json(shard_dir / _shard_file(k, "findings"), {}) for k in keys])
+    write_json(workspace / "nubicustos-findings.json", findings)
+
+    containers: dict[str, dict] = {}
+    for key in keys:
+        data = load_json(shard_dir / _shard_file(key, "containers"), {})
+        for container in data if isinstance(data, list) else data.get("containers", []):
+            cid = str(container.get("id") or container.get("container_id") or container.get("name"))
+            containers.setdefault(cid, container)
+    write_json(
+        workspace / "nubicustos-containers.json",
+        {"export_source": "nubicustos", "containers": list(containers.values())},
+    )
+    return {"containers": len(containers)}
+
+
+def run_sharded_audit(
+    client: NubicustosClient,
+    workspace: Path,
+    target: str,
+    profile: str = "comprehensive",
+    accounts: list[str] | None = None,
+    regions: list[str] | None = None,
+    max_in_flight: int = 4,
+    retries: int = 1,
+    on_event=None,
+) -> dict:
+    """Run a Nubicustos audit as shards and merge the results.
+
+    Args:
+        max_in_flight: Maximum shard scans running on the service at once.
+        retries: Times a failed shard is relaunched within this call.
+
+    Returns a summary with shard counts, failed shard keys and the merged
+    container count. The merged files cover the completed shards even when
+    some shards failed.
+    """
+    workspace = Path(workspace)
+    shard_dir = workspace / SHARDS_DIR
+    shard_dir.mkdir(exist_ok=True)
+
+    state = load_json(workspace / SHARDS_FILE, {})
+    if state.get("target") != target or state.get("profile") != profile:
+        state = {"target": target, "profile": profile, "shards": {}}
+    shards = plan_shards(target, accounts, regions)
+    for shard in shards:
+        state["shards"].setdefault(
+            shard["key"], {**shard, "scan_id": None, "status": "pending", "error": None, "attempts": 0}
+        )
+    _save_state(workspace, state)
+
+    def submit(job: dict) -> str:
+        entry = state["shards"][job["key"]]
+        if entry["scan_id"] and entry["status"] == "running":
+            try:
+                status = client.get_scan(entry["scan_id"]).get("status", "")
+            except HTTPError as e:
+                if e.code != 404:
+                    raise
+                status = None
+            if status is not None and status not in FAILED_STATUSES:
+                return entry["scan_id"]
+        scan = client.create_scan(
+            target,
+            profile=profile,
+            accounts=[job["account"]],
+            regions=[job["region"]] if job["region"] else None,
+        )
+        entry.update(scan_id=scan_id_of(scan), status="running", error=None, attempts=entry["attempts"] + 1)
+        _save_state(workspace, state)
+        return entry["scan_id"]
+
+    def export(job: dict, scan_id: str) -> None:
+        client.export_findings(scan_id, shard_dir / _shard_file(job["key"], "findings"))
+        client.export_containers(scan_id, shard_dir / _shard_file(job["key"], "containers"))
+
+    def record(event: str, job: dict, result: dict) -> None:
+        if event != "submitted":
+            state["shards"][job["key"]].update(status=event, error=result["error"])
+            _save_state(workspace, state)
+        if on_event:
+            on_event(event, job, result)
+
+    pending = [s for s in shards if state["shards"][s["key"]]["status"] != "completed"]
+    skipped = len(shards) - len(pending)
+    for _ in range(retries + 1):
+        if not pending:
+            break
+        results = run_scan_batch(client, pending, submit, export, max_in_flight=max_in_flight, on_event=record)
+        pending = [s for s in pending if results[s["key"]]["status"] != "completed"]
+
+    completed = [s["key"] for s in shards if state["shards"][s["key"]]["status"] == "completed"]
+    merged = merge_shards(workspace, completed)
+    return {
+        "shards": len(shards),
+        "completed": len(completed),
+        "skipped": skipped,
+        "failed": [s["key"] for s in pending],
+        "containers": merged["containers"],
+    }
@@ -0,0 +1,140 @@
+"""Scan request coalescing across concurrent runs.
+
+When several runs (or a batch) scan the same target with the same profile
+within a short window, only the first one launches a service scan. The others
+share it:
+
+  - in flight: later requesters attach to the running scan_id and poll it
+  - completed: requesters within the TTL reuse the finished scan's results
+
+The registry is a JSON file next to the workspace root, guarded by an flock so
+separate orchestrator processes see the same state. Hit statistics are kept in
+the same file.
+"""
+
+import fcntl
+import json
+import threading
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+from pathlib import Path
+
+from config import get_workspace_root
+
+REGISTRY_FILE = "scan-registry.json"
+
+_thread_lock = threading.Lock()
+
+
+class ScanRegistry:
+    """Single-flight registry of recent scans keyed on (service, target, profile).
+
+    Args:
+        path: Registry JSON file.
+        ttl: Seconds a completed scan's results are served to new requesters.
+        stale_after: Seconds after which an unfinished entry is presumed dead
+            (its owner crashed) and a new scan is launched.
+    """
+
+    def __init__(self, path: str | Path, ttl: float = 3600, stale_after: float = 7200):
+        self.path = Path(path).expanduser()
+        self.ttl = ttl
+        self.stale_after = stale_after
+
+    @classmethod
+    def for_config(cls, config: dict) -> "ScanRegistry":
+        """Build the registry shared by all runs under the configured workspace root."""
+        settings = config.get("coalescing", {})
+        ttl = settings.get("ttl", 3600)
+        timeouts = [svc.get("timeout", 600) for svc in config.get("services", {}).values()]
+        stale_after = 2 * max(timeouts, default=1800)
+        return cls(get_workspace_root(config).parent / REGISTRY_FILE, ttl=ttl, stale_after=stale_after)
+
+    @staticmethod
+    def key(service: str, target: str, profile: str) -> str:
+        return f"{service}|{target}|{profile}"
+
+    @contextmanager
+    def _locked(self):
+        """Read the registry under an exclusive lock and write it back on exit."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with _thread_lock, open(self.path.with_suffix(".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                data = json.loads(self.path.read_text()) if self.path.exists() else {}
+                data.setdefault("scans", {})
+                data.setdefault("stats", {"launched": 0, "inflight_hits": 0, "cached_hits": 0})
+                yield data
+                tmp = self.path.with_suffix(".tmp")
+                tmp.write_text(json.dumps(data, indent=2))
+                tmp.replace(self.path)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def acquire(self, service: str, target: str, profile: str, launch: Callable[[], str]) -> tuple[str, str]:
+        """Get a scan for (service, target, profile), launching one only if needed.
+
+        launch is called while the registry lock is held, so concurrent
+        requesters for the same key wait for it and then share its scan_id.
+
+        Returns (scan_id, source) where source is "inflight", "cached" or "launched".
+        """
+        key = self.key(service, target, profile)
+        now = time.time()
+        with self._locked() as data:
+            entry = data["scans"].get(key)
+            if entry and entry["state"] == "running" and now - entry["started_at"] < self.stale_after:
+                entry["requesters"] += 1
+                data["stats"]["inflight_hits"] += 1
+                return entry["scan_id"], "inflight"
+            if entry and entry["state"] == "completed" and now - entry["completed_at"] < self.ttl:
+                entry["requesters"] += 1
+                data["stats"]["cached_hits"] += 1
+                return entry["scan_id"], "cached"
+
+            scan_id = launch()
+            data["scans"][key] = {
+                "scan_id": scan_id,
+                "state": "running",
+                "started_at": now,
+                "completed_at": None,
+                "requesters": 1,
+            }
+            data["stats"]["launched"] += 1
+            return scan_id, "launched"
+
+    def finish(self, service: str, target: str, profile: str, scan_id: str, succeeded: bool) -> None:
+        """Record that a shared scan finished, so later requesters reuse or replace it.
+
+        Only the first finish of a running entry counts. Every requester of a
+        shared scan reports its finish, and a later report must neither push
+        completed_at (and with it the TTL) forward nor drop a completed scan
+        because one requester's poll timed out or was cancelled.
+        """
+        key = self.key(service, target, profile)
+        with self._locked() as data:
+            entry = data["scans"].get(key)
+            if not entry or entry["scan_id"] != scan_id or entry["state"] != "running":
+                return
+            if succeeded:
+                entry["state"] = "completed"
+                entry["completed_at"] = time.time()
+            else:
+                del data["scans"][key]
+
+    def snapshot(self) -> dict:
+        """Return current entries and hit statistics, dropping expired entries."""
+        now = time.time()
+        with self._locked() as data:
+            for key, entry in list(data["scans"].items()):
+                expired = entry["state"] == "completed" and now - entry["completed_at"] >= self.ttl
+                stale = entry["state"] == "running" and now - entry["started_at"] >= self.stale_after
+                if expired or stale:
+                    del data["scans"][key]
+            return json.loads(json.dumps(data))
+
+    def clear(self) -> None:
+        """Forget all scans (statistics are kept)."""
+        with self._locked() as data:
+            data["scans"] = {}
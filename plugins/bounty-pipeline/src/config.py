@@ -3,20 +3,27 @@
 Loads ~/.bounty-pipeline/config.yaml and merges environment variable overrides.
 Env vars use BOUNTY_PIPELINE_ prefix with double-underscore for nesting:
   BOUNTY_PIPELINE_SERVICES__RETICUSTOS__URL=http://localhost:9000
+
+The orchestrator loads config on every invocation, so the resolved result is
+cached as JSON under ~/.bounty-pipeline/cache, keyed on the config file's
+path, mtime and size, the BOUNTY_PIPELINE_* environment and the defaults.
+A cache hit skips importing and parsing YAML entirely.
 """
 
+import json
 import os
+import zlib
 from pathlib import Path
 
-import yaml
-
 DEFAULT_CONFIG_PATH = Path.home() / ".bounty-pipeline" / "config.yaml"
 
+CONFIG_CACHE_DIR = DEFAULT_CONFIG_PATH.parent / "cache"
+
 DEFAULT_CONFIG = {
     "services": {
         "reticustos": {"url": "http://localhost:8002", "timeout": 600, "poll_interval": 15},
         "mobilicustos": {"url": "http://localhost:8000", "timeout": 900, "poll_interval": 15},
-        "nubicustos": {"url": "http://localhost:8001", "timeout": 1800, "poll_interval": 30},
+        "nubicustos": {"url": "http://localhost:8001", "timeout": 1800, "poll_interval": 30, "max_in_flight": 4},
     },
     "tools": {
         "indago": "~/GitHub/indago/indago",
@@ -30,8 +37,19 @@ DEFAULT_CONFIG = {
         "reticustos_profile": "standard",
         "nubicustos_profile": "comprehensive",
         "mobilicustos_scan_type": "full",
+        "crown_jewels": [],
     },
     "workspace": {"root": "~/.bounty-pipeline/runs"},
+    "coalescing": {"ttl": 3600},
+    "http_cache": {"entries": 256, "max_mb": 64},
+    "queue": {
+        "backend": "sqlite",
+        "path": "~/.bounty-pipeline/queue.db",
+        "lease": 60,
+        "heartbeat": 15,
+        "aging": 600,
+        "share_window": 3600,
+    },
     "docker": {
         "reticustos": "~/GitHub/Reticustos",
         "mobilicustos": "~/GitHub/mobilicustos",
@@ -93,22 +111,63 @@ def _apply_env_overrides(config: dict) -> dict:
     return config
 
 
-def load_config(config_path: str | Path | None = None) -> dict:
-    """Load and validate pipeline configuration.
-
-    Priority: env vars > config file > defaults.
-    """
-    config = DEFAULT_CONFIG.copy()
-
-    path = Path(config_path) if config_path else DEFAULT_CONFIG_PATH
+def _resolve_config(path: Path) -> dict:
+    # A deep copy: env overrides write into nested dicts, which must not be the defaults'.
+    config = json.loads(json.dumps(DEFAULT_CONFIG))
     if path.exists():
+        import yaml
+
         with open(path) as f:
             file_config = yaml.safe_load(f) or {}
         config = _deep_merge(config, file_config)
 
     config = _apply_env_overrides(config)
     config = _expand_paths(config)
+    return config
+
+
+def _cache_key(path: Path) -> str:
+    """Everything the resolved config depends on: file identity, env overrides, defaults and HOME (for ~).
+
+    Compared verbatim rather than hashed, which would mean importing hashlib.
+    """
+    try:
+        st = path.stat()
+        file_id = [str(path.resolve()), st.st_mtime_ns, st.st_size]
+    except OSError:
+        file_id = [str(path), None, None]
+    env = sorted((k, v) for k, v in os.environ.items() if k.startswith(ENV_PREFIX))
+    return json.dumps([file_id, env, DEFAULT_CONFIG, os.environ.get("HOME")], sort_keys=True)
+
 
+def load_config(config_path: str | Path | None = None, use_cache: bool = True) -> dict:
+    """Load and validate pipeline configuration.
+
+    Priority: env vars > config file > defaults.
+    """
+    path = Path(config_path) if config_path else DEFAULT_CONFIG_PATH
+    if not use_cache:
+        return _resolve_config(path)
+
+    # One cache file per config path, so alternating --config files don't evict each other.
+    cache_file = CONFIG_CACHE_DIR / f"config-{zlib.crc32(str(path).encode()):08x}.json"
+    key = _cache_key(path)
+    try:
+        cached = json.loads(cache_file.read_text())
+        if cached.get("key") == key:
+            return cached["config"]
+    except (OSError, ValueError):
+        pass
+
+    config = _resolve_config(path)
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"key": key, "config": config}))
+        tmp.replace(cache_file)
+    except (OSError, TypeError):
+        # Unwritable cache dir, or YAML values JSON can't hold: just don't cache.
+        pass
     return config
 
 
@@ -0,0 +1,181 @@
+"""Batch container-escape analysis with Cepheus.
+
+CepheusClient.enumerate takes one container and analyze one posture file, so a
+cloud run with hundreds of containers in nubicustos-containers.json would run
+them one after another. This module fans enumerate+analyze out over a bounded
+worker pool — each worker drives its own cepheus subprocesses, so the pool
+size is the number of concurrent Cepheus processes — and merges the results
+into the single cepheus-report.json the correlation phase expects.
+
+Containers started from the same image share one analysis: results are cached
+on disk by image digest, so an image seen in this or any earlier run is not
+analyzed again.
+"""
+
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from cancel import Cancelled
+from config import get_workspace_root
+from reports import load_json, merge_reports, write_json
+from services.cepheus import CepheusClient
+
+BATCH_DIR = "cepheus-batch"
+
+
+def get_cache_dir(config: dict) -> Path:
+    """Directory holding Cepheus analyses cached by image digest."""
+    return get_workspace_root(config).parent / "cache" / "cepheus"
+
+
+def load_containers(containers_file: str | Path) -> list[dict]:
+    """Load the container inventory exported by Nubicustos."""
+    data = load_json(containers_file, {})
+    if isinstance(data, list):
+        return data
+    return data.get("containers", [])
+
+
+def container_id(container: dict) -> str:
+    return str(container.get("id") or container.get("container_id") or container.get("name"))
+
+
+def image_digest(container: dict) -> str | None:
+    """Image digest identifying identical container images, if exported."""
+    return container.get("image_digest") or container.get("digest") or container.get("image_id")
+
+
+def _cache_key(digest: str, min_severity: str, llm: bool) -> str:
+    return hashlib.sha256(f"{digest}|{min_severity}|{llm}".encode()).hexdigest()[:32]
+
+
+def _safe_name(value: str) -> str:
+    return re.sub(r"[^\w\-.]", "_", value)[:80]
+
+
+def _analyze_container(
+    cepheus: CepheusClient,
+    container: dict,
+    work_dir: Path,
+    from_nubicustos: str | None,
+    min_severity: str,
+    llm: bool,
+) -> dict:
+    """Enumerate and analyze one container."""
+    cid = container_id(container)
+    name = _safe_name(cid)
+    posture = work_dir / f"{name}-posture.json"
+    analysis = work_dir / f"{name}-analysis.json"
+
+    rc, _, stderr = cepheus.enumerate(cid, runtime=container.get("runtime", "docker"), output=str(posture))
+    if rc != 0:
+        return {"container": cid, "returncode": rc, "error": f"enumerate failed: {stderr.strip()[-300:]}"}
+
+    rc, _, stderr = cepheus.analyze(
+        str(posture),
+        from_nubicustos=from_nubicustos,
+        output=str(analysis),
+        min_severity=min_severity,
+        llm=llm,
+    )
+    if rc != 0:
+        return {"container": cid, "returncode": rc, "error": f"analyze failed: {stderr.strip()[-300:]}"}
+    return {"container": cid, "returncode": 0, "analysis": load_json(analysis, {})}
+
+
+def run_batch(
+    cepheus: CepheusClient,
+    workspace: Path,
+    containers_file: Path | None = None,
+    cache_dir: Path | None = None,
+    max_workers: int = 4,
+    min_severity: str = "low",
+    llm: bool = False,
+) -> dict:
+    """Analyze every container in the inventory and write cepheus-report.json.
+
+    A container whose enumerate or analyze fails, times out or is cancelled
+    is listed under "failed" with its error; the report still holds every
+    other container. If the run was cancelled, Cancelled is raised once the
+    report is written.
+
+    Returns a summary with container, unique-image, cache-hit and failure counts.
+    """
+    workspace = Path(workspace)
+    containers_file = containers_file or workspace / "nubicustos-containers.json"
+    work_dir = workspace / BATCH_DIR
+    work_dir.mkdir(exist_ok=True)
+    if cache_dir:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    containers = load_containers(containers_file)
+
+    # One representative container per image; containers without a digest stand alone.
+    groups: dict[str, list[dict]] = {}
+    for container in containers:
+        digest = image_digest(container)
+        groups.setdefault(digest or f"container:{container_id(container)}", []).append(container)
+
+    results: dict[str, dict] = {}
+    to_analyze: dict[str, dict] = {}
+    for key, members in groups.items():
+        cached = None
+        if cache_dir and not key.startswith("container:"):
+            cached = load_json(cache_dir / f"{_cache_key(key, min_severity, llm)}.json")
+        if cached is not None:
+            results[key] = {"container": container_id(members[0]), "returncode": 0, "analysis": cached, "cached": True}
+        else:
+            to_analyze[key] = members[0]
+
+    cancelled = None
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = {
+            key: pool.submit(
+                _analyze_container, cepheus, container, work_dir, str(containers_file), min_severity, llm
+            )
+            for key, container in to_analyze.items()
+        }
+        for key, future in futures.items():
+            try:
+                result = future.result()
+            except Cancelled as e:
+                cancelled = cancelled or e
+                result = {"container": container_id(to_analyze[key]), "returncode": -1, "error": f"cancelled: {e}"}
+            except Exception as e:
+                # One container timing out or failing must not cost the others their results
+                error = f"{type(e).__name__}: {e}"[:300]
+                result = {"container": container_id(to_analyze[key]), "returncode": -1, "error": error}
+            results[key] = {**result, "cached": False}
+            if cache_dir and results[key]["returncode"] == 0 and not key.startswith("container:"):
+                write_json(cache_dir / f"{_cache_key(key, min_severity, llm)}.json", results[key]["analysis"])
+
+    entries = []
+    for key, members in groups.items():
+        result = results[key]
+        for container in members:
+            entries.append({
+                "container": container_id(container),
+                "image": container.get("image"),
+                "image_digest": image_digest(container),
+                "analyzed_as": result["container"],
+                "cached": result["cached"],
+                "error": result.get("error"),
+            })
+
+    analyses = [r["analysis"] for r in results.values() if r["returncode"] == 0]
+    report = merge_reports(analyses)
+    report["export_source"] = "cepheus"
+    report["containers"] = entries
+    write_json(workspace / "cepheus-report.json", report)
+    if cancelled:
+        # The containers analyzed before the cancellation are in the report; now stop the run
+        raise cancelled
+
+    return {
+        "containers": len(containers),
+        "unique_images": len(groups),
+        "analyzed": len(to_analyze),
+        "cache_hits": len(groups) - len(to_analyze),
+        "failed": [r["container"] for r in results.values() if r["returncode"] != 0],
+    }
@@ -10,6 +10,8 @@ from urllib.error import URLError
 from urllib.request import Request, urlopen
 
 from config import get_docker_path, get_service_config
+from services import TOOL_CLIENTS
+from tool_registry import ToolRegistry
 
 # Which Docker services are needed per target type
 SERVICES_BY_TYPE = {
@@ -101,9 +103,14 @@ def check_services(config: dict, target_type: str) -> dict:
     return results
 
 
-def check_cli_tools(config: dict) -> dict:
-    """Check if CLI tools are installed and accessible."""
+def check_cli_tools(config: dict, refresh: bool = False) -> dict:
+    """Check if CLI tools are installed and accessible, with their versions.
+
+    Versions come from the tool registry, so a binary is only run the first
+    time it is seen (or after it changes on disk, or with refresh).
+    """
     tools = config.get("tools", {})
+    registry = ToolRegistry.for_config(config)
     results = {}
 
     for name, path in tools.items():
@@ -115,7 +122,12 @@ def check_cli_tools(config: dict) -> dict:
             "path": expanded,
             "exists": exists,
             "executable": bool(executable) if exists else False,
+            "version": None,
         }
+        if results[name]["executable"]:
+            subcommands = TOOL_CLIENTS[name].SUBCOMMANDS if name in TOOL_CLIENTS else []
+            caps = registry.probe(expanded, subcommands, refresh=refresh)
+            results[name]["version"] = caps["version"] if caps else None
 
     return results
 
@@ -139,6 +151,7 @@ def format_status_report(service_results: dict, tool_results: dict) -> str:
     lines.append("## CLI Tools\n")
     for name, info in tool_results.items():
         status = "OK" if info["executable"] else ("EXISTS (not executable)" if info["exists"] else "NOT FOUND")
-        lines.append(f"- **{name}**: {status} — `{info['path']}`")
+        version = f" ({info['version']})" if info.get("version") else ""
+        lines.append(f"- **{name}**: {status}{version} — `{info['path']}`")
 
     return "\n".join(lines)
@@ -0,0 +1,139 @@
+"""Endpoint canonicalization before fuzzing.
+
+Reticustos exports every URL it saw, so /users/1, /users/2, ... and the same
+query with its parameters in a different order each become an Indago target.
+This collapses endpoints into route templates (/users/{id}), keeps a few
+concrete samples per template for Indago to fuzz, and drops the rest:
+
+  GET https://t.example/api/users/17?b=2&a=1  -> GET https://t.example/api/users/{id} [a, b]
+
+Two endpoints are redundant when method, template and parameter names match.
+The canonical export is written next to the original as
+reticustos-endpoints.canonical.json, in the same format, so it can be passed to
+`indago scan --targets-from` unchanged.
+"""
+
+import re
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from reports import load_json, write_json
+
+CANONICAL_FILE = "reticustos-endpoints.canonical.json"
+
+# Path segments that identify a resource instance rather than a route
+ID_SEGMENT_PATTERNS = [
+    re.compile(r"^\d+$"),
+    re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.IGNORECASE),
+    re.compile(r"^(?=.*\d)[0-9a-f]{12,}$", re.IGNORECASE),
+    re.compile(r"^(?=.*\d)(?=.*[A-Za-z])[\w\-]{24,}$"),
+]
+
+
+def _url_of(endpoint: dict) -> str:
+    return endpoint.get("url") or f"{endpoint.get('host', '')}{endpoint.get('path', '')}"
+
+
+def normalize_url(url: str) -> str:
+    """Lowercase scheme and host, sort query parameters and drop the fragment."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ""))
+
+
+def template_path(path: str) -> str:
+    """Replace ID-like path segments with {id}."""
+    segments = [
+        "{id}" if any(p.match(segment) for p in ID_SEGMENT_PATTERNS) else segment
+        for segment in path.split("/")
+    ]
+    return "/".join(segments)
+
+
+def canonical_key(endpoint: dict) -> tuple[str, str, tuple[str, ...]]:
+    """(method, template URL, sorted parameter names) identifying redundant endpoints."""
+    parts = urlsplit(normalize_url(_url_of(endpoint)))
+    template = urlunsplit((parts.scheme, parts.netloc, template_path(parts.path), "", ""))
+    params = {name for name, _ in parse_qsl(parts.query, keep_blank_values=True)}
+    params.update(str(p.get("name", p)) if isinstance(p, dict) else str(p) for p in endpoint.get("params") or [])
+    return str(endpoint.get("method", "GET")).upper(), template, tuple(sorted(params))
+
+
+class EndpointCanonicalizer:
+    """Incrementally collapse endpoints into templates.
+
+    add() can be called repeatedly (e.g. with each streamed batch of
+    endpoints) and returns only the endpoints that should be fuzzed: the
+    first `samples` concrete endpoints of each template.
+
+    Args:
+        samples: Concrete endpoints kept per template.
+    """
+
+    def __init__(self, samples: int = 1):
+        self.samples = max(1, samples)
+        self.templates: dict[tuple, dict] = {}
+        self.seen_urls: set[tuple[str, str]] = set()
+        self.total = 0
+
+    def add(self, endpoints: list[dict]) -> list[dict]:
+        kept = []
+        for endpoint in endpoints:
+            self.total += 1
+            method, template, params = key = canonical_key(endpoint)
+            url = normalize_url(_url_of(endpoint))
+            if (method, url) in self.seen_urls:
+                continue
+            self.seen_urls.add((method, url))
+
+            entry = self.templates.setdefault(key, {"count": 0, "samples": []})
+            entry["count"] += 1
+            if len(entry["samples"]) < self.samples:
+                sample = {**endpoint, "method": method, "url": url, "template": template}
+                if params and not endpoint.get("params"):
+                    sample["params"] = list(params)
+                entry["samples"].append(sample)
+                kept.append(sample)
+        return kept
+
+    def endpoints(self) -> list[dict]:
+        """Kept endpoints, each annotated with how many endpoints its template collapsed."""
+        return [
+            {**sample, "collapsed": entry["count"]}
+            for entry in self.templates.values()
+            for sample in entry["samples"]
+        ]
+
+    def stats(self) -> dict:
+        kept = sum(len(entry["samples"]) for entry in self.templates.values())
+        return {
+            "input": self.total,
+            "templates": len(self.templates),
+            "output": kept,
+            "reduction": round(self.total / kept, 2) if kept else 1.0,
+        }
+
+
+def canonicalize(endpoints: list[dict], samples: int = 1) -> tuple[list[dict], dict]:
+    """Collapse endpoints into templates. Returns (kept endpoints, stats)."""
+    canonicalizer = EndpointCanonicalizer(samples)
+    canonicalizer.add(endpoints)
+    return canonicalizer.endpoints(), canonicalizer.stats()
+
+
+def canonicalize_file(source: str | Path, output: str | Path | None = None, samples: int = 1) -> dict:
+    """Canonicalize a Reticustos endpoint export into a file of the same format.
+
+    Defaults to reticustos-endpoints.canonical.json next to the source.
+    Returns the stats (input, templates, output, reduction), which are also
+    recorded in the output under "canonicalization".
+    """
+    source = Path(source)
+    output = Path(output) if output else source.with_name(CANONICAL_FILE)
+    data = load_json(source, {})
+    if isinstance(data, list):
+        data = {"export_source": "reticustos", "endpoints": data}
+    kept, stats = canonicalize(data.get("endpoints", []), samples)
+    write_json(output, {**data, "endpoints": kept, "canonicalization": stats})
+    return stats
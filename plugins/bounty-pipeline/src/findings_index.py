@@ -0,0 +1,325 @@
+"""Cross-run findings index with full-text search.
+
+Every run leaves its findings in per-tool `*-findings.json` / `*-report.json`
+files, so asking "have we seen this before?" meant grepping every workspace.
+This indexes those artifacts into one SQLite database next to the workspace
+root: a findings table (target, tool, severity, CWE, endpoint, fingerprint)
+with B-tree indexes for the structured filters, and an FTS5 table over title,
+description and endpoint for text queries.
+
+Indexing is incremental: an artifact is (re)read only when its size or mtime
+changed since it was last indexed, and its old rows are replaced. Artifacts
+deleted from a run are dropped from the index the next time it is indexed.
+
+A finding's fingerprint identifies the same issue across runs and tools:
+CWE, normalized title and the endpoint's route template (see endpoints.py),
+so /users/17 and /users/42 count as the same place.
+"""
+
+import hashlib
+import re
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+
+from archive import archive_path, is_archived, list_members, load_member_json
+from config import get_workspace_root
+from endpoints import normalize_url, template_path
+
+INDEX_FILE = "findings-index.db"
+
+# Workspace artifacts that carry findings (the same globs Vinculum ingests)
+ARTIFACT_GLOBS = ("*-findings.json", "*-report.json")
+
+# Keys under which tools list their findings
+FINDING_KEYS = ("findings", "vulnerabilities", "misconfigurations", "escape_paths", "attack_paths", "bypasses")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    path TEXT PRIMARY KEY,
+    run TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    findings INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS findings (
+    id INTEGER PRIMARY KEY,
+    artifact TEXT NOT NULL,
+    run TEXT NOT NULL,
+    target TEXT,
+    target_type TEXT,
+    created_at TEXT,
+    tool TEXT,
+    severity TEXT,
+    cwe TEXT,
+    endpoint TEXT,
+    title TEXT,
+    description TEXT,
+    fingerprint TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS findings_artifact ON findings (artifact);
+CREATE INDEX IF NOT EXISTS findings_fingerprint ON findings (fingerprint);
+CREATE INDEX IF NOT EXISTS findings_target ON findings (target, severity);
+CREATE INDEX IF NOT EXISTS findings_cwe ON findings (cwe);
+CREATE INDEX IF NOT EXISTS findings_endpoint ON findings (endpoint);
+CREATE INDEX IF NOT EXISTS findings_recent ON findings (created_at, id);
+CREATE VIRTUAL TABLE IF NOT EXISTS findings_fts USING fts5(
+    title, description, endpoint, content='findings', content_rowid='id', tokenize='unicode61 tokenchars ''-_'''
+);
+"""
+
+SEVERITY_ORDER = ["info", "low", "medium", "high", "critical"]
+
+# Highest severity of a group, by rank rather than alphabetically
+_SEVERITY_MAX = (
+    "CASE MAX(CASE f.severity "
+    + " ".join(f"WHEN '{s}' THEN {i}" for i, s in enumerate(SEVERITY_ORDER))
+    + " ELSE -1 END) "
+    + " ".join(f"WHEN {i} THEN '{s}'" for i, s in enumerate(SEVERITY_ORDER))
+    + " END"
+)
+
+_CWE_PATTERN = re.compile(r"(\d+)")
+_SPACE_PATTERN = re.compile(r"\s+")
+_FTS_BARE = re.compile(r"^\w+\*?$")
+_FTS_OPERATORS = ("AND", "OR", "NOT")
+
+
+def _text(value) -> str:
+    return value if isinstance(value, str) else ("" if value is None else str(value))
+
+
+def normalize_cwe(value) -> str | None:
+    """CWE as "CWE-<n>" from 79, "79", "CWE-79" or ["CWE-79", ...]."""
+    if isinstance(value, list):
+        value = value[0] if value else None
+    match = _CWE_PATTERN.search(_text(value))
+    return f"CWE-{match.group(1)}" if match else None
+
+
+def endpoint_of(finding: dict) -> str:
+    for key in ("endpoint", "url", "uri", "path", "location", "resource"):
+        if isinstance(finding.get(key), str) and finding[key]:
+            return finding[key]
+    return ""
+
+
+def fingerprint(finding: dict) -> str:
+    """Identity of a finding across runs: CWE, normalized title and endpoint route template."""
+    endpoint = endpoint_of(finding)
+    if "://" in endpoint:
+        parts = urlsplit(normalize_url(endpoint))
+        endpoint = urlunsplit((parts.scheme, parts.netloc, template_path(parts.path), "", ""))
+    title = _SPACE_PATTERN.sub(" ", _text(finding.get("title") or finding.get("name"))).strip().lower()
+    key = f"{normalize_cwe(finding.get('cwe') or finding.get('cwe_id'))}|{title}|{endpoint}"
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+def extract_findings(report) -> list[dict]:
+    """The findings listed in a tool report, whatever key the tool uses."""
+    if isinstance(report, list):
+        return [f for f in report if isinstance(f, dict)]
+    if not isinstance(report, dict):
+        return []
+    findings = []
+    for key in FINDING_KEYS:
+        if isinstance(report.get(key), list):
+            findings.extend(f for f in report[key] if isinstance(f, dict))
+    return findings
+
+
+def fts_query(text: str) -> str:
+    """Quote terms FTS5 would otherwise parse as syntax (URLs, paths, CWE ids).
+
+    Bare words, prefix terms (sql*) and the operators AND/OR/NOT pass through.
+    An operator without a term on both sides ("NOT sql", "xss OR") is
+    searched for as a word instead.
+    """
+    words = text.split()
+    terms = []
+    after_term = False
+    for i, word in enumerate(words):
+        if word in _FTS_OPERATORS:
+            if after_term and i + 1 < len(words) and words[i + 1] not in _FTS_OPERATORS:
+                terms.append(word)
+                after_term = False
+                continue
+        elif _FTS_BARE.match(word):
+            terms.append(word)
+            after_term = True
+            continue
+        terms.append('"' + word.replace('"', '""') + '"')
+        after_term = True
+    return " ".join(terms)
+
+
+class FindingsIndex:
+    """SQLite/FTS5 index of findings across all runs."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+
+    @classmethod
+    def for_config(cls, config: dict) -> "FindingsIndex":
+        """Index shared by all runs under the configured workspace root."""
+        return cls(get_workspace_root(config).parent / INDEX_FILE)
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=60)
+        db.row_factory = sqlite3.Row
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def _delete_artifact(self, db: sqlite3.Connection, path: str) -> None:
+        # External-content FTS rows are deleted by repeating the indexed values.
+        rows = db.execute(
+            "SELECT id, title, description, endpoint FROM findings WHERE artifact = ?", (path,)
+        ).fetchall()
+        db.executemany(
+            "INSERT INTO findings_fts (findings_fts, rowid, title, description, endpoint) "
+            "VALUES ('delete', ?, ?, ?, ?)",
+            [(r["id"], r["title"], r["description"], r["endpoint"]) for r in rows],
+        )
+        db.execute("DELETE FROM findings WHERE artifact = ?", (path,))
+        db.execute("DELETE FROM artifacts WHERE path = ?", (path,))
+
+    def index_workspace(self, workspace: str | Path, force: bool = False) -> dict:
+        """Index a run's findings artifacts, skipping those unchanged since last time.
+
+        Artifacts of the run that are gone from the workspace are dropped.
+        Returns {artifacts, skipped, findings} counts for this call. Archived
+        runs are read from their archive under the same artifact paths; their
+        members carry the archive's mtime.
+        """
+        workspace = Path(workspace)
+        meta = load_member_json(workspace, "run-meta.json", {})
+        stats = {"artifacts": 0, "skipped": 0, "findings": 0}
+        members = sorted({m for pattern in ARTIFACT_GLOBS for m in list_members(workspace, pattern)})
+        archive_mtime = archive_path(workspace).stat().st_mtime_ns if is_archived(workspace) else None
+        with self._connect() as db:
+            current = {str(workspace / name) for name, _ in members}
+            known_paths = db.execute("SELECT path FROM artifacts WHERE run = ?", (workspace.name,))
+            for stale in [r["path"] for r in known_paths if r["path"] not in current]:
+                self._delete_artifact(db, stale)
+            for name, size in members:
+                path = workspace / name
+                mtime_ns = archive_mtime if archive_mtime is not None else path.stat().st_mtime_ns
+                known = db.execute("SELECT mtime_ns, size FROM artifacts WHERE path = ?", (str(path),)).fetchone()
+                if known and not force and (known["mtime_ns"], known["size"]) == (mtime_ns, size):
+                    stats["skipped"] += 1
+                    continue
+                self._delete_artifact(db, str(path))
+                findings = extract_findings(load_member_json(workspace, name))
+                tool = path.name.split("-")[0]
+                self._insert(db, path, workspace.name, meta, tool, findings)
+                db.execute(
+                    "INSERT INTO artifacts VALUES (?, ?, ?, ?, ?)",
+                    (str(path), workspace.name, mtime_ns, size, len(findings)),
+                )
+                stats["artifacts"] += 1
+                stats["findings"] += len(findings)
+        return stats
+
+    def _insert(self, db, path: Path, run: str, meta: dict, tool: str, findings: list[dict]) -> None:
+        start = (db.execute("SELECT MAX(id) FROM findings").fetchone()[0] or 0) + 1
+        rows, fts = [], []
+        for offset, f in enumerate(findings):
+            rowid = start + offset
+            title = _text(f.get("title") or f.get("name"))
+            endpoint = endpoint_of(f)
+            description = _text(f.get("description"))
+            rows.append((
+                rowid, str(path), run, meta.get("target"), meta.get("target_type"), meta.get("created_at"),
+                _text(f.get("tool") or f.get("source_tool")) or tool,
+                _text(f.get("severity")).lower() or None,
+                normalize_cwe(f.get("cwe") or f.get("cwe_id")),
+                endpoint or None, title, description, fingerprint(f),
+            ))
+            fts.append((rowid, title, description, endpoint))
+        db.executemany("INSERT INTO findings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        db.executemany("INSERT INTO findings_fts (rowid, title, description, endpoint) VALUES (?, ?, ?, ?)", fts)
+
+    def prune(self, existing_runs: set[str]) -> int:
+        """Drop artifacts of runs that no longer exist. Returns the number removed."""
+        with self._connect() as db:
+            stale = [r["path"] for r in db.execute("SELECT path, run FROM artifacts") if r["run"] not in existing_runs]
+            for path in stale:
+                self._delete_artifact(db, path)
+        return len(stale)
+
+    def search(
+        self,
+        text: str | None = None,
+        target: str | None = None,
+        tool: str | None = None,
+        severity: list[str] | None = None,
+        cwe: str | None = None,
+        endpoint: str | None = None,
+        fingerprint: str | None = None,
+        run: str | None = None,
+        group: bool = False,
+        limit: int = 50,
+    ) -> list[dict]:
+        """Query findings across runs, newest first.
+
+        text is an FTS5 query over title, description and endpoint; endpoint
+        is a URL prefix. With group=True, returns one row per fingerprint with
+        its number of occurrences and runs and first/last seen times.
+        """
+        where, params = [], []
+        if text:
+            where.append("f.id IN (SELECT rowid FROM findings_fts WHERE findings_fts MATCH ?)")
+            params.append(fts_query(text))
+        for column, value in (("target", target), ("tool", tool), ("run", run), ("fingerprint", fingerprint)):
+            if value:
+                where.append(f"f.{column} = ?")
+                params.append(value)
+        if severity:
+            where.append(f"f.severity IN ({', '.join('?' * len(severity))})")
+            params.extend(s.lower() for s in severity)
+        if cwe:
+            where.append("f.cwe = ?")
+            params.append(normalize_cwe(cwe))
+        if endpoint:
+            # GLOB (case-sensitive) can use the endpoint index for a prefix match.
+            where.append("f.endpoint GLOB ?")
+            params.append(re.sub(r"([*?\[])", r"[\1]", endpoint) + "*")
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+
+        if group:
+            query = (
+                "SELECT f.fingerprint, MIN(f.title) AS title, MIN(f.cwe) AS cwe, MIN(f.endpoint) AS endpoint, "
+                f"{_SEVERITY_MAX} AS severity, COUNT(*) AS occurrences, COUNT(DISTINCT f.run) AS runs, "
+                "MIN(f.created_at) AS first_seen, MAX(f.created_at) AS last_seen "
+                f"FROM findings f {clause} GROUP BY f.fingerprint ORDER BY runs DESC, last_seen DESC LIMIT ?"
+            )
+        else:
+            query = (
+                "SELECT f.run, f.target, f.created_at, f.tool, f.severity, f.cwe, f.endpoint, f.title, "
+                f"f.fingerprint FROM findings f {clause} ORDER BY f.created_at DESC, f.id DESC LIMIT ?"
+            )
+        with self._connect() as db:
+            try:
+                return [dict(r) for r in db.execute(query, [*params, limit])]
+            except sqlite3.OperationalError as e:
+                if text and "fts5" in str(e):
+                    raise ValueError(f"Invalid search query {text!r}: {e}") from None
+                raise
+
+    def stats(self) -> dict:
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT COUNT(*) AS artifacts, COUNT(DISTINCT run) AS runs, COALESCE(SUM(findings), 0) AS findings "
+                "FROM artifacts"
+            ).fetchone()
+            return {**dict(row), "bytes": self.path.stat().st_size}
@@ -0,0 +1,267 @@
+"""Crown-jewel-directed pruning of the Vinculum export before Ariadne.
+
+Ariadne synthesizes paths over everything in vinculum-ariadne.json, with
+playbook, sprawl and privesc analysis on, and large correlated graphs run
+into its timeout. Most of such a graph cannot contribute to a path to the
+assets that matter, so this builds the finding/asset graph from the export
+and keeps only the slice Ariadne needs:
+
+  1. informational findings are dropped (they never form an attack step);
+  2. with crown jewel targets, only nodes connected to a crown jewel are
+     kept (optionally within --max-hops);
+  3. without targets, or if no target matches, connected components that
+     contain at least one finding are kept;
+  4. isolated nodes are dropped either way.
+
+Nodes are the entries of every top-level list in the export (hosts,
+services, vulnerabilities, misconfigurations, ...). Edges come from
+reference fields (host_id, service_id, ..., or a host given by IP or
+hostname) and from "relationships" entries. Vinculum does not say which way
+an edge points, so reachability is undirected.
+
+Sections number their rows independently (hosts and vulnerabilities can both
+have id 1), so a node is keyed "<section>:<id>". A reference by bare id that
+several sections share is resolved by its field name: host_id points into
+hosts, service_ids into services. References that stay ambiguous make no
+edge.
+
+The slice is written next to the export as vinculum-ariadne.pruned.json, in
+the same format, with the reduction stats under "pruning".
+"""
+
+from collections import deque
+from fnmatch import fnmatch
+from pathlib import Path
+
+from reports import load_json, write_json
+
+PRUNED_FILE = "vinculum-ariadne.pruned.json"
+
+# Top-level lists whose entries are edges rather than nodes
+EDGE_SECTIONS = ("relationships", "edges")
+EDGE_ENDS = (("source_id", "source", "from"), ("target_id", "target", "to"))
+
+# Fields (besides *_id / *_ids) that name another node, usually a host by IP or hostname
+REF_FIELDS = ("host", "hostname", "ip", "asset", "resource")
+
+# Fields a node can be referenced or matched as a crown jewel by
+ALIAS_FIELDS = ("id", "ip", "ip_address", "hostname", "name", "arn")
+
+INFO_SEVERITIES = {"info", "informational", "none"}
+
+
+def _node_id(section: str, index: int, entry: dict) -> str:
+    if entry.get("id") in (None, ""):
+        return f"{section}#{index}"
+    return f"{section}:{entry['id']}"
+
+
+def _references(entry: dict) -> list[tuple[str, str]]:
+    """(field, value) of each reference an entry makes to another node."""
+    refs = []
+    for key, value in entry.items():
+        if key == "id":
+            continue
+        if key.endswith("_id") or key in REF_FIELDS:
+            values = [value]
+        elif key.endswith("_ids"):
+            values = value if isinstance(value, list) else [value]
+        else:
+            continue
+        refs.extend((key, str(v)) for v in values if isinstance(v, (str, int)) and v != "")
+    return refs
+
+
+def _section_of(field: str, section: str) -> bool:
+    """Whether a reference field (host_id, service_ids) names a node of this section (hosts, services)."""
+    prefix = field.lower().removesuffix("_ids").removesuffix("_id")
+    plurals = {prefix, prefix + "s", prefix + "es"}
+    if prefix.endswith("y"):
+        plurals.add(prefix[:-1] + "ies")
+    return section.lower() in plurals
+
+
+def _edge_ends(entry: dict) -> tuple[str | None, str | None]:
+    ends = []
+    for fields in EDGE_ENDS:
+        value = next((entry[f] for f in fields if entry.get(f) not in (None, "")), None)
+        ends.append(str(value) if value is not None else None)
+    return ends[0], ends[1]
+
+
+class FindingGraph:
+    """Undirected finding/asset graph built from a Vinculum ariadne-format export."""
+
+    def __init__(self, data: dict):
+        self.data = data
+        self.nodes: dict[str, dict] = {}
+        self.sections: dict[str, list[str]] = {}
+        self.section_of: dict[str, str] = {}
+        self.aliases: dict[str, set[str]] = {}
+        self.adjacency: dict[str, set[str]] = {}
+
+        for section, entries in data.items():
+            if section in EDGE_SECTIONS or not isinstance(entries, list):
+                continue
+            if not entries or not all(isinstance(entry, dict) for entry in entries):
+                continue
+            ids = []
+            for index, entry in enumerate(entries):
+                node = _node_id(section, index, entry)
+                ids.append(node)
+                self.nodes[node] = entry
+                self.section_of[node] = section
+                self.adjacency.setdefault(node, set())
+                for field in ALIAS_FIELDS:
+                    if entry.get(field) not in (None, ""):
+                        self.aliases.setdefault(str(entry[field]).lower(), set()).add(node)
+            self.sections[section] = ids
+
+        for node, entry in self.nodes.items():
+            for field, ref in _references(entry):
+                self._link(node, self.resolve(ref, field))
+        for section in EDGE_SECTIONS:
+            for entry in data.get(section) or []:
+                if isinstance(entry, dict):
+                    source, target = _edge_ends(entry)
+                    self._link(self.resolve(source), self.resolve(target))
+
+    def resolve(self, ref: str | None, field: str | None = None) -> str | None:
+        """Node for an id, IP, hostname or name, if exactly one node matches.
+
+        field is the referencing field (host_id, ...); it picks the section
+        when the value is an alias of nodes in several.
+        """
+        if ref is None:
+            return None
+        if ref in self.nodes:
+            return ref
+        candidates = self.aliases.get(ref.lower(), set())
+        if len(candidates) > 1 and field:
+            candidates = {n for n in candidates if _section_of(field, self.section_of[n])}
+        return next(iter(candidates)) if len(candidates) == 1 else None
+
+    def _link(self, a: str | None, b: str | None) -> None:
+        if a and b and a != b:
+            self.adjacency[a].add(b)
+            self.adjacency[b].add(a)
+
+    def edge_count(self, nodes: set[str] | None = None) -> int:
+        if nodes is None:
+            return sum(len(neighbours) for neighbours in self.adjacency.values()) // 2
+        return sum(len(self.adjacency[n] & nodes) for n in nodes) // 2
+
+    def is_finding(self, node: str) -> bool:
+        return "severity" in self.nodes[node]
+
+    def is_info(self, node: str) -> bool:
+        return self.is_finding(node) and str(self.nodes[node]["severity"]).lower() in INFO_SEVERITIES
+
+    def match(self, targets: list[str]) -> tuple[set[str], list[str]]:
+        """Nodes matching crown jewel targets (id, IP, hostname or name; globs allowed).
+
+        Returns (matched nodes, targets that matched nothing).
+        """
+        matched, unmatched = set(), []
+        for target in targets:
+            pattern = target.lower()
+            hits = {
+                node for alias, nodes in self.aliases.items()
+                if alias == pattern or fnmatch(alias, pattern)
+                for node in nodes
+            }
+            if hits:
+                matched |= hits
+            else:
+                unmatched.append(target)
+        return matched, unmatched
+
+    def reachable(self, sources: set[str], allowed: set[str], max_hops: int | None = None) -> set[str]:
+        """Nodes in `allowed` connected to any source, within max_hops if given."""
+        seen = sources & allowed
+        frontier = deque((node, 0) for node in seen)
+        while frontier:
+            node, hops = frontier.popleft()
+            if max_hops is not None and hops >= max_hops:
+                continue
+            for neighbour in self.adjacency[node]:
+                if neighbour in allowed and neighbour not in seen:
+                    seen.add(neighbour)
+                    frontier.append((neighbour, hops + 1))
+        return seen
+
+    def subgraph(self, keep: set[str]) -> dict:
+        """The export restricted to kept nodes and the relationships between them."""
+        result = {}
+        for section, entries in self.data.items():
+            if section in self.sections:
+                result[section] = [self.nodes[n] for n in self.sections[section] if n in keep]
+            elif section in EDGE_SECTIONS and isinstance(entries, list):
+                result[section] = [
+                    e for e in entries
+                    if isinstance(e, dict) and all(self.resolve(end) in keep for end in _edge_ends(e))
+                ]
+            else:
+                result[section] = entries
+        return result
+
+
+def prune(
+    data: dict,
+    targets: list[str] | None = None,
+    max_hops: int | None = None,
+    keep_info: bool = False,
+) -> tuple[dict, dict]:
+    """Prune a Vinculum ariadne-format export. Returns (pruned export, stats)."""
+    graph = FindingGraph(data)
+    candidates = {n for n in graph.nodes if keep_info or not graph.is_info(n)}
+    dropped_info = len(graph.nodes) - len(candidates)
+    connected = {n for n in candidates if graph.adjacency[n] & candidates}
+
+    crown_jewels, unmatched = graph.match(targets or [])
+    if crown_jewels:
+        keep = graph.reachable(crown_jewels, connected | crown_jewels, max_hops)
+    else:
+        keep = set()
+        for node in connected:
+            if node in keep:
+                continue
+            component = graph.reachable({node}, connected)
+            if any(graph.is_finding(n) for n in component):
+                keep |= component
+
+    edges = graph.edge_count()
+    kept_edges = graph.edge_count(keep)
+    stats = {
+        "nodes": len(graph.nodes),
+        "edges": edges,
+        "kept_nodes": len(keep),
+        "kept_edges": kept_edges,
+        "dropped_info": dropped_info,
+        "dropped_disconnected": len(candidates - connected - crown_jewels),
+        "dropped_unreachable": len((connected | crown_jewels) - keep),
+        "crown_jewels": sorted(crown_jewels),
+        "unmatched_targets": unmatched,
+        "reduction": round(len(graph.nodes) / len(keep), 2) if keep else None,
+        "edge_reduction": round(edges / kept_edges, 2) if kept_edges else None,
+    }
+    return graph.subgraph(keep), stats
+
+
+def prune_file(
+    source: str | Path,
+    output: str | Path | None = None,
+    targets: list[str] | None = None,
+    max_hops: int | None = None,
+    keep_info: bool = False,
+) -> dict:
+    """Prune a Vinculum ariadne-format export into a file of the same format.
+
+    Defaults to vinculum-ariadne.pruned.json next to the source. Returns the
+    stats, which are also recorded in the output under "pruning".
+    """
+    source = Path(source)
+    output = Path(output) if output else source.with_name(PRUNED_FILE)
+    pruned, stats = prune(load_json(source, {}), targets, max_hops, keep_info)
+    write_json(output, {**pruned, "pruning": stats})
+    return stats
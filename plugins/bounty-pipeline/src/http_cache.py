@@ -0,0 +1,239 @@
+"""Conditional-GET response cache for the REST service clients.
+
+Status polls and findings exports fetch the same bodies over and over, and
+between two polls of a long scan usually nothing has changed. RESTServiceClient
+remembers each GET response that carries an ETag or Last-Modified validator
+and sends it back as If-None-Match / If-Modified-Since; a 304 then reuses the
+cached body, and for get_json the already-decoded object, so an unchanged
+poll costs a round trip with no payload and no JSON decoding.
+
+The in-memory cache is a size-bounded LRU (entries and bytes). With a
+directory configured, bodies are also kept on disk, bounded by bytes with the
+least recently used files evicted first, so a later process (a resumed run,
+the next stream-fuzz poll loop) can revalidate instead of re-downloading.
+The directory is scanned once, on its first use in a process; after that the
+cache keeps its own account of the files and their sizes. Files written by
+another process at the same time are only counted once they are read, so
+several concurrent processes can briefly take the directory past disk_mb.
+
+Objects returned from the cache are shared between calls: treat them as
+read-only.
+
+Config (all optional):
+  http_cache:
+    entries: 256        # in-memory responses
+    max_mb: 64          # in-memory body bytes
+    dir: ~/.bounty-pipeline/cache/http   # on-disk cache; omit to disable
+    disk_mb: 256
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+DEFAULT_ENTRIES = 256
+DEFAULT_MAX_MB = 64
+DEFAULT_DISK_MB = 256
+
+_SHARED: dict[tuple, "ResponseCache"] = {}
+
+
+class CachedResponse:
+    """A cached GET response: validators, raw body and (once decoded) the parsed JSON."""
+
+    __slots__ = ("etag", "last_modified", "body", "parsed")
+
+    def __init__(self, etag: str | None, last_modified: str | None, body: bytes, parsed=None):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+        self.parsed = parsed
+
+    def headers(self) -> dict[str, str]:
+        """Conditional request headers that revalidate this response."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def json(self):
+        if self.parsed is None:
+            self.parsed = json.loads(self.body.decode())
+        return self.parsed
+
+
+class ResponseCache:
+    """Size-bounded LRU of GET responses keyed by URL, optionally backed by a directory.
+
+    Args:
+        max_entries: Responses kept in memory.
+        max_bytes: Total body bytes kept in memory.
+        directory: Where bodies are persisted across processes (None: memory only).
+        max_disk_bytes: Total bytes kept in the directory.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024,
+        directory: str | Path | None = None,
+        max_disk_bytes: int = DEFAULT_DISK_MB * 1024 * 1024,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = Path(directory).expanduser() if directory else None
+        self.max_disk_bytes = max_disk_bytes
+        self.entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # On-disk responses by digest, least recently used first: {digest: bytes}
+        self._disk: OrderedDict[str, int] | None = None
+        self.disk_bytes = 0
+
+    @classmethod
+    def for_config(cls, config: dict) -> "ResponseCache":
+        """The process-wide cache for a config's http_cache settings."""
+        settings = config.get("http_cache", {})
+        key = tuple(sorted((k, str(v)) for k, v in settings.items()))
+        if key not in _SHARED:
+            _SHARED[key] = cls(
+                max_entries=settings.get("entries", DEFAULT_ENTRIES),
+                max_bytes=int(settings.get("max_mb", DEFAULT_MAX_MB) * 1024 * 1024),
+                directory=settings.get("dir"),
+                max_disk_bytes=int(settings.get("disk_mb", DEFAULT_DISK_MB) * 1024 * 1024),
+            )
+        return _SHARED[key]
+
+    def get(self, url: str) -> CachedResponse | None:
+        """The cached response for a URL, from memory or disk, if any."""
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry is not None:
+                self.entries.move_to_end(url)
+                return entry
+        entry = self._load(url)
+        if entry is not None:
+            self._remember(url, entry)
+        return entry
+
+    def store(self, url: str, entry: CachedResponse) -> None:
+        """Cache a response if it carries a validator; otherwise forget any stale entry."""
+        if not entry.etag and not entry.last_modified:
+            self.discard(url)
+            return
+        self._remember(url, entry)
+        self._save(url, entry)
+
+    def discard(self, url: str) -> None:
+        with self._lock:
+            entry = self.entries.pop(url, None)
+            if entry is not None:
+                self.bytes -= len(entry.body)
+        if self.directory:
+            for path in self._paths(url):
+                path.unlink(missing_ok=True)
+            with self._lock:
+                self._account(self._digest(url), None)
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _remember(self, url: str, entry: CachedResponse) -> None:
+        if len(entry.body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self.entries.pop(url, None)
+            if old is not None:
+                self.bytes -= len(old.body)
+            self.entries[url] = entry
+            self.bytes += len(entry.body)
+            while self.entries and (len(self.entries) > self.max_entries or self.bytes > self.max_bytes):
+                _, evicted = self.entries.popitem(last=False)
+                self.bytes -= len(evicted.body)
+
+    # On disk: <sha1(url)>.body plus a small <sha1(url)>.meta with the URL and validators.
+
+    @staticmethod
+    def _digest(url: str) -> str:
+        return hashlib.sha1(url.encode()).hexdigest()
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        digest = self._digest(url)
+        return self.directory / f"{digest}.meta", self.directory / f"{digest}.body"
+
+    def _load(self, url: str) -> CachedResponse | None:
+        if not self.directory:
+            return None
+        meta_path, body_path = self._paths(url)
+        try:
+            raw_meta = meta_path.read_bytes()
+            meta = json.loads(raw_meta)
+            body = body_path.read_bytes()
+            os.utime(meta_path)
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url or meta.get("size") != len(body):
+            return None
+        with self._lock:
+            self._account(self._digest(url), len(body) + len(raw_meta))
+        return CachedResponse(meta.get("etag"), meta.get("last_modified"), body)
+
+    def _save(self, url: str, entry: CachedResponse) -> None:
+        if not self.directory or len(entry.body) > self.max_disk_bytes:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        meta_path, body_path = self._paths(url)
+        meta = json.dumps({
+            "url": url, "etag": entry.etag, "last_modified": entry.last_modified, "size": len(entry.body),
+        }).encode()
+        for path, data in ((body_path, entry.body), (meta_path, meta)):
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        with self._lock:
+            self._account(self._digest(url), len(entry.body) + len(meta))
+            self._evict_disk()
+
+    def _account(self, digest: str, size: int | None) -> None:
+        """Record an on-disk response as just used (size None: removed). Caller holds _lock."""
+        if self._disk is None:
+            self._scan_disk()
+        self.disk_bytes -= self._disk.pop(digest, 0)
+        if size is not None:
+            self._disk[digest] = size
+            self.disk_bytes += size
+
+    def _scan_disk(self) -> None:
+        """Build the on-disk account from the directory, oldest meta mtime first."""
+        found = []
+        for meta_path in self.directory.glob("*.meta"):
+            try:
+                meta_stat = meta_path.stat()
+                size = meta_path.with_suffix(".body").stat().st_size + meta_stat.st_size
+            except OSError:
+                continue
+            found.append((meta_stat.st_mtime, meta_path.stem, size))
+        self._disk = OrderedDict((digest, size) for _, digest, size in sorted(found))
+        self.disk_bytes = sum(self._disk.values())
+
+    def _evict_disk(self) -> None:
+        """Drop least recently used responses until the directory is within max_disk_bytes. Caller holds _lock."""
+        while self._disk and self.disk_bytes > self.max_disk_bytes:
+            digest, size = self._disk.popitem(last=False)
+            self.disk_bytes -= size
+            (self.directory / f"{digest}.meta").unlink(missing_ok=True)
+            (self.directory / f"{digest}.body").unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        return {"entries": len(self.entries), "bytes": self.bytes, "hits": self.hits, "misses": self.misses}
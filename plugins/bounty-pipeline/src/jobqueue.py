@@ -0,0 +1,716 @@
+"""Durable job queue and workers for distributed runs.
+
+By default every agent of a run executes on the machine that invoked
+/bounty. In distributed mode the run's agents are enqueued as jobs (one per
+agent, with dependencies from pipeline.get_agent_dependencies) and
+`orchestrator.py worker` processes on any number of nodes lease them, run
+them (`orchestrator.py run-agent`, see agent_runners.py) and report back.
+
+Leases expire: a worker renews its lease with heartbeats while the job runs,
+and a job whose worker died is handed to another worker once its lease runs
+out, up to max_attempts. A worker that loses its lease (or cannot reach the
+queue for a whole lease period) stops the job: SIGTERM to its process group,
+then SIGKILL after TERMINATE_GRACE seconds. A job that fails for good fails its dependents too.
+
+Scheduling: of the jobs whose dependencies are done, a lease takes the one
+with the highest effective priority -- the run's priority plus one level per
+`aging` seconds it has been ready, so low-priority work is not starved for
+good. Ties go to the program (bug bounty program, by default the run) that
+is furthest below its fair share: the worker-seconds its jobs used in the
+last `share_window` seconds, divided by the program's weight. Then the
+oldest job.
+
+Runs are preempted at phase boundaries, never mid-agent: when a
+higher-priority job is leased while an in-progress run has a lower-priority
+job ready to go, that run is passed over. It only counts as preempted if no
+other worker is idle to take its job, or if the job is still waiting at the
+next lease; a job an idle worker picks up straight away merely lost a race.
+A preempted run gets a "preempted" checkpoint (workspace.save_checkpoint)
+recording who took its slot and what it still has to do, which is removed
+when one of its jobs wins a lease again.
+
+Each job records when it became ready (ready_at) and when its latest attempt
+started, so wait_metrics() can report queue wait per priority class.
+
+The queue backend is pluggable (BACKENDS); the default is a SQLite file,
+which works across nodes when it and the workspace root are on a shared
+filesystem. It uses the rollback journal rather than WAL, since WAL needs
+shared memory that network filesystems don't provide.
+"""
+
+import json
+import os
+import signal
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+
+from pipeline import get_agent_dependencies
+from workspace import clear_checkpoint, save_checkpoint
+
+# Job states
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+# Exit code of orchestrator commands stopped by run cancellation (see cancel.py)
+CANCELLED_EXIT = 3
+
+ORCHESTRATOR = Path(__file__).parent / "orchestrator.py"
+
+# Worker logs, kept out of the workspace root so report globs don't see them
+JOB_LOG_DIR = "jobs"
+
+DEFAULT_AGING = 600
+DEFAULT_SHARE_WINDOW = 3600
+
+# Seconds a job's process group gets to exit after SIGTERM before SIGKILL
+TERMINATE_GRACE = 10.0
+
+
+class JobQueue(ABC):
+    """Interface of a queue backend. Jobs are dicts (see SQLiteJobQueue._row)."""
+
+    @abstractmethod
+    def enqueue(
+        self,
+        run: str,
+        agent: str,
+        argv: list[str],
+        depends_on=(),
+        max_attempts: int = 2,
+        priority: int = 0,
+        program: str | None = None,
+    ) -> int:
+        """Add a job that becomes ready once the jobs in depends_on are done. Returns its id."""
+
+    @abstractmethod
+    def set_weight(self, program: str, weight: float) -> None:
+        """Set a program's fair-share weight (default 1)."""
+
+    @abstractmethod
+    def weights(self) -> dict[str, float]:
+        """Fair-share weights of the programs that have one set."""
+
+    @abstractmethod
+    def lease(self, worker: str, lease_seconds: float) -> dict | None:
+        """Claim the next ready job (see the module docstring for the order), or None.
+
+        The job's "preempted" key lists the runs found preempted at a phase
+        boundary during this lease: [{run, workspace, agents, priority, by}],
+        where by is the {run, agent, priority} of the job that took the slot.
+        """
+
+    @abstractmethod
+    def heartbeat(self, job_id: int, worker: str, lease_seconds: float) -> bool:
+        """Extend a lease. False if the worker no longer holds it."""
+
+    @abstractmethod
+    def complete(self, job_id: int, worker: str, result: dict) -> None:
+        """Record a job as done with its result, releasing the jobs that depend on it."""
+
+    @abstractmethod
+    def fail(self, job_id: int, worker: str, error: str, retry: bool = True) -> str:
+        """Record a failed attempt. Returns the job's new status (pending if it will be retried)."""
+
+    @abstractmethod
+    def jobs(self, run: str | None = None) -> list[dict]:
+        """All jobs, or those of one run, in enqueue order."""
+
+
+class SQLiteJobQueue(JobQueue):
+    """Job queue in a SQLite database, safe for concurrent processes and nodes.
+
+    Args:
+        path: Database file.
+        aging: Seconds a ready job waits per priority level gained (0 disables aging).
+        share_window: Seconds of history fair share is computed over.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run TEXT NOT NULL,
+        agent TEXT NOT NULL,
+        argv TEXT NOT NULL,
+        status TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        max_attempts INTEGER NOT NULL,
+        worker TEXT,
+        lease_expires REAL,
+        created_at REAL NOT NULL,
+        started_at REAL,
+        finished_at REAL,
+        result TEXT,
+        error TEXT
+    );
+    CREATE TABLE IF NOT EXISTS job_deps (job_id INTEGER NOT NULL, dep_id INTEGER NOT NULL);
+    CREATE TABLE IF NOT EXISTS programs (name TEXT PRIMARY KEY, weight REAL NOT NULL);
+    CREATE TABLE IF NOT EXISTS workers (name TEXT PRIMARY KEY, polled_at REAL NOT NULL, idle INTEGER NOT NULL);
+    CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status);
+    CREATE INDEX IF NOT EXISTS job_deps_job ON job_deps (job_id);
+    CREATE INDEX IF NOT EXISTS job_deps_dep ON job_deps (dep_id);
+    """
+
+    # Scheduling columns, added to queues created before they existed
+    COLUMNS = {
+        "priority": "INTEGER NOT NULL DEFAULT 0",
+        "program": "TEXT",
+        "ready_at": "REAL",
+        "preempted_at": "REAL",
+        "preemptions": "INTEGER NOT NULL DEFAULT 0",
+        "passed_over_at": "REAL",
+        "passed_over_by": "TEXT",
+    }
+
+    def __init__(self, path: str | Path, aging: float = DEFAULT_AGING, share_window: float = DEFAULT_SHARE_WINDOW):
+        self.path = Path(path).expanduser()
+        self.aging = aging
+        self.share_window = share_window
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=60)
+        try:
+            db.executescript(self.SCHEMA)
+            existing = {row[1] for row in db.execute("PRAGMA table_info(jobs)")}
+            for name, decl in self.COLUMNS.items():
+                if name not in existing:
+                    db.execute(f"ALTER TABLE jobs ADD COLUMN {name} {decl}")
+            db.commit()
+        finally:
+            db.close()
+
+    @contextmanager
+    def _tx(self):
+        """A write transaction. BEGIN IMMEDIATE takes the write lock up front, so
+        two workers can never lease the same job."""
+        db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+        finally:
+            db.close()
+
+    @staticmethod
+    def _row(row: sqlite3.Row) -> dict:
+        job = dict(row)
+        job["argv"] = json.loads(job["argv"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def enqueue(
+        self,
+        run: str,
+        agent: str,
+        argv: list[str],
+        depends_on=(),
+        max_attempts: int = 2,
+        priority: int = 0,
+        program: str | None = None,
+    ) -> int:
+        now = time.time()
+        with self._tx() as db:
+            cur = db.execute(
+                "INSERT INTO jobs (run, agent, argv, status, max_attempts, created_at, priority, program) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (run, agent, json.dumps(argv), PENDING, max_attempts, now, priority, program or run),
+            )
+            db.executemany("INSERT INTO job_deps VALUES (?, ?)", [(cur.lastrowid, dep) for dep in depends_on])
+            self._mark_ready(db, [cur.lastrowid], now)
+            return cur.lastrowid
+
+    def set_weight(self, program: str, weight: float) -> None:
+        with self._tx() as db:
+            db.execute("INSERT OR REPLACE INTO programs VALUES (?, ?)", (program, weight))
+
+    def weights(self) -> dict[str, float]:
+        with self._tx() as db:
+            return {row["name"]: row["weight"] for row in db.execute("SELECT name, weight FROM programs")}
+
+    @staticmethod
+    def _mark_ready(db: sqlite3.Connection, job_ids: list[int], now: float) -> None:
+        """Set ready_at on those of the given pending jobs whose dependencies are all done."""
+        for job_id in job_ids:
+            db.execute(
+                """
+                UPDATE jobs SET ready_at = ? WHERE id = ? AND status = ? AND NOT EXISTS (
+                    SELECT 1 FROM job_deps d JOIN jobs p ON p.id = d.dep_id WHERE d.job_id = ? AND p.status != ?
+                )
+                """,
+                (now, job_id, PENDING, job_id, DONE),
+            )
+
+    def _expire(self, db: sqlite3.Connection, now: float) -> None:
+        """Return jobs whose worker stopped heartbeating to the queue (or fail them when out of attempts)."""
+        expired = db.execute(
+            "SELECT id, attempts, max_attempts, worker FROM jobs WHERE status = ? AND lease_expires < ?",
+            (LEASED, now),
+        ).fetchall()
+        for job in expired:
+            error = f"lease expired (worker {job['worker']})"
+            if job["attempts"] < job["max_attempts"]:
+                db.execute(
+                    "UPDATE jobs SET status = ?, worker = NULL, error = ?, ready_at = ? WHERE id = ?",
+                    (PENDING, error, now, job["id"]),
+                )
+            else:
+                self._fail_with_dependents(db, job["id"], error, now)
+
+    def _fail_with_dependents(self, db: sqlite3.Connection, job_id: int, error: str, now: float) -> None:
+        db.execute(
+            "UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_expires = NULL WHERE id = ?",
+            (FAILED, error, now, job_id),
+        )
+        dependents = [r[0] for r in db.execute("SELECT job_id FROM job_deps WHERE dep_id = ?", (job_id,))]
+        for dep in dependents:
+            status = db.execute("SELECT status FROM jobs WHERE id = ?", (dep,)).fetchone()[0]
+            if status == PENDING:
+                self._fail_with_dependents(db, dep, f"dependency {job_id} failed", now)
+
+    def effective_priority(self, job, now: float) -> int:
+        """A ready job's priority plus one level per `aging` seconds it has waited."""
+        if not self.aging:
+            return job["priority"]
+        waited = now - (job["ready_at"] or job["created_at"])
+        return job["priority"] + int(max(0.0, waited) // self.aging)
+
+    def _usage(self, db: sqlite3.Connection, now: float) -> dict[str, float]:
+        """Worker-seconds each program's jobs used in the last share_window seconds."""
+        since = now - self.share_window
+        rows = db.execute(
+            """
+            SELECT COALESCE(program, run) AS program,
+                   SUM(MIN(COALESCE(finished_at, ?), ?) - MAX(started_at, ?)) AS used
+            FROM jobs WHERE started_at IS NOT NULL AND status != ? AND COALESCE(finished_at, ?) > ?
+            GROUP BY 1
+            """,
+            (now, now, since, PENDING, now, since),
+        )
+        return {row["program"]: row["used"] or 0.0 for row in rows}
+
+    def lease(self, worker: str, lease_seconds: float) -> dict | None:
+        now = time.time()
+        with self._tx() as db:
+            self._expire(db, now)
+            ready = db.execute(
+                """
+                SELECT * FROM jobs j WHERE status = ? AND NOT EXISTS (
+                    SELECT 1 FROM job_deps d JOIN jobs p ON p.id = d.dep_id
+                    WHERE d.job_id = j.id AND p.status != ?
+                ) ORDER BY id
+                """,
+                (PENDING, DONE),
+            ).fetchall()
+            self._poll(db, worker, idle=not ready, now=now)
+            if not ready:
+                # Whatever was passed over has been leased since
+                db.execute(
+                    "UPDATE jobs SET passed_over_at = NULL, passed_over_by = NULL WHERE passed_over_at IS NOT NULL"
+                )
+                return None
+            usage = self._usage(db, now)
+            weights = {row["name"]: row["weight"] for row in db.execute("SELECT name, weight FROM programs")}
+
+            def rank(row):
+                program = row["program"] or row["run"]
+                share = usage.get(program, 0.0) / max(weights.get(program, 1.0), 1e-9)
+                return -self.effective_priority(row, now), share, row["id"]
+
+            row = min(ready, key=rank)
+            db.execute(
+                "UPDATE jobs SET status = ?, worker = ?, lease_expires = ?, attempts = attempts + 1, "
+                "started_at = ? WHERE id = ?",
+                (LEASED, worker, now + lease_seconds, now, row["id"]),
+            )
+            # The run got a slot again, so it can be preempted afresh
+            db.execute(
+                "UPDATE jobs SET preempted_at = NULL, passed_over_at = NULL, passed_over_by = NULL "
+                "WHERE run = ? AND status = ?",
+                (row["run"], PENDING),
+            )
+            job = self._row(row)
+            job.update(status=LEASED, worker=worker, attempts=row["attempts"] + 1, started_at=now)
+            job["preempted"] = self._confirm_preemptions(db, now)
+            # A worker that polled within the last lease period and got nothing is presumed still polling
+            idle_workers = db.execute(
+                "SELECT COUNT(*) FROM workers WHERE idle = 1 AND name != ? AND polled_at >= ?",
+                (worker, now - lease_seconds),
+            ).fetchone()[0]
+            job["preempted"] += self._preempt(db, ready, row, self.effective_priority(row, now), idle_workers, now)
+            return job
+
+    @staticmethod
+    def _poll(db: sqlite3.Connection, worker: str, idle: bool, now: float) -> None:
+        db.execute("INSERT OR REPLACE INTO workers VALUES (?, ?, ?)", (worker, now, int(idle)))
+
+    def _preempt(
+        self, db: sqlite3.Connection, ready: list, leased: sqlite3.Row, priority: int, idle_workers: int, now: float
+    ) -> list:
+        """Find in-progress runs whose ready jobs were passed over for a higher-priority job.
+
+        With no other worker idle, the runs are preempted now. Otherwise their
+        jobs are marked passed over, and _confirm_preemptions decides at the
+        next lease. A run is reported once per preemption, until one of its
+        jobs is leased again.
+        """
+        passed_over: dict[str, list] = {}
+        for row in ready:
+            if row["run"] == leased["run"] or row["preempted_at"] is not None or row["passed_over_at"] is not None:
+                continue
+            if self.effective_priority(row, now) < priority:
+                passed_over.setdefault(row["run"], []).append(row)
+        if not passed_over:
+            return []
+        by = {"run": leased["run"], "agent": leased["agent"], "priority": leased["priority"]}
+        preempted = []
+        for run, rows in passed_over.items():
+            started = db.execute("SELECT 1 FROM jobs WHERE run = ? AND status IN (?, ?) LIMIT 1", (run, DONE, LEASED))
+            if started.fetchone() is None:
+                continue
+            if idle_workers:
+                db.executemany(
+                    "UPDATE jobs SET passed_over_at = ?, passed_over_by = ? WHERE id = ?",
+                    [(now, json.dumps(by), row["id"]) for row in rows],
+                )
+            else:
+                preempted.append(self._record_preempted(db, run, rows, by, now))
+        return preempted
+
+    def _confirm_preemptions(self, db: sqlite3.Connection, now: float) -> list:
+        """Preempt the runs whose passed-over jobs were not leased by the next lease after all."""
+        passed_over: dict[str, list] = {}
+        rows = db.execute(
+            "SELECT * FROM jobs WHERE status = ? AND passed_over_at IS NOT NULL AND preempted_at IS NULL ORDER BY id",
+            (PENDING,),
+        )
+        for row in rows:
+            passed_over.setdefault(row["run"], []).append(row)
+        return [
+            self._record_preempted(db, run, rows, json.loads(rows[0]["passed_over_by"]), now)
+            for run, rows in passed_over.items()
+        ]
+
+    @staticmethod
+    def _record_preempted(db: sqlite3.Connection, run: str, rows: list, by: dict, now: float) -> dict:
+        db.executemany(
+            "UPDATE jobs SET preempted_at = ?, preemptions = preemptions + 1, passed_over_at = NULL, "
+            "passed_over_by = NULL WHERE id = ?",
+            [(now, row["id"]) for row in rows],
+        )
+        pending = db.execute("SELECT agent FROM jobs WHERE run = ? AND status = ? ORDER BY id", (run, PENDING))
+        return {
+            "run": run,
+            "workspace": _job_workspace(json.loads(rows[0]["argv"])),
+            "agents": [r[0] for r in pending],
+            "priority": rows[0]["priority"],
+            "by": by,
+        }
+
+    def heartbeat(self, job_id: int, worker: str, lease_seconds: float) -> bool:
+        with self._tx() as db:
+            cur = db.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND worker = ? AND status = ?",
+                (time.time() + lease_seconds, job_id, worker, LEASED),
+            )
+            return cur.rowcount == 1
+
+    def complete(self, job_id: int, worker: str, result: dict) -> None:
+        now = time.time()
+        with self._tx() as db:
+            db.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, finished_at = ?, lease_expires = NULL "
+                "WHERE id = ? AND worker = ?",
+                (DONE, json.dumps(result), now, job_id, worker),
+            )
+            dependents = [r[0] for r in db.execute("SELECT job_id FROM job_deps WHERE dep_id = ?", (job_id,))]
+            self._mark_ready(db, dependents, now)
+
+    def fail(self, job_id: int, worker: str, error: str, retry: bool = True) -> str:
+        now = time.time()
+        with self._tx() as db:
+            row = db.execute("SELECT * FROM jobs WHERE id = ? AND worker = ?", (job_id, worker)).fetchone()
+            if row is None or row["status"] != LEASED:
+                return row["status"] if row else FAILED
+            if retry and row["attempts"] < row["max_attempts"]:
+                db.execute(
+                    "UPDATE jobs SET status = ?, worker = NULL, lease_expires = NULL, error = ?, ready_at = ? "
+                    "WHERE id = ?",
+                    (PENDING, error, now, job_id),
+                )
+                return PENDING
+            self._fail_with_dependents(db, job_id, error, now)
+            return FAILED
+
+    def jobs(self, run: str | None = None) -> list[dict]:
+        with self._tx() as db:
+            self._expire(db, time.time())
+            query, params = "SELECT * FROM jobs", ()
+            if run:
+                query, params = "SELECT * FROM jobs WHERE run = ?", (run,)
+            return [self._row(r) for r in db.execute(query + " ORDER BY id", params)]
+
+
+BACKENDS = {"sqlite": SQLiteJobQueue}
+
+
+def open_queue(config: dict) -> JobQueue:
+    """Open the configured queue backend."""
+    qcfg = config.get("queue", {})
+    backend = qcfg.get("backend", "sqlite")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown queue backend: {backend}. Valid: {list(BACKENDS)}")
+    return BACKENDS[backend](
+        qcfg.get("path", "~/.bounty-pipeline/queue.db"),
+        aging=qcfg.get("aging", DEFAULT_AGING),
+        share_window=qcfg.get("share_window", DEFAULT_SHARE_WINDOW),
+    )
+
+
+def enqueue_run(
+    queue: JobQueue,
+    workspace: Path,
+    target_type: str,
+    skip: set[str] | None = None,
+    max_attempts: int = 2,
+    priority: int = 0,
+    program: str | None = None,
+) -> dict[str, int]:
+    """Enqueue one job per agent of a run's pipeline. Returns {agent: job id}.
+
+    Skipped agents are left out and don't hold back the agents after them.
+    Runs enqueued with the same program share that program's fair share.
+    """
+    skip = skip or set()
+    job_ids: dict[str, int] = {}
+    for agent, deps in get_agent_dependencies(target_type).items():
+        if agent in skip:
+            continue
+        argv = ["run-agent", "--workspace", str(workspace), "--agent", agent]
+        depends_on = [job_ids[d] for d in deps if d in job_ids]
+        job_ids[agent] = queue.enqueue(
+            Path(workspace).name, agent, argv, depends_on, max_attempts, priority=priority, program=program
+        )
+    return job_ids
+
+
+def default_worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class Worker:
+    """Leases jobs from a queue and runs them as orchestrator subprocesses.
+
+    Args:
+        queue: Queue backend.
+        name: Worker identity recorded on leases (default host:pid).
+        lease_seconds: Lease length; a job is reclaimed this long after its
+            worker's last heartbeat.
+        heartbeat_interval: Seconds between lease renewals while a job runs.
+        poll_interval: Seconds between lease attempts while the queue is idle.
+        orchestrator_args: Arguments placed before each job's argv (e.g. --config).
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        name: str | None = None,
+        lease_seconds: float = 60,
+        heartbeat_interval: float = 15,
+        poll_interval: float = 2,
+        orchestrator_args: list[str] | None = None,
+    ):
+        self.queue = queue
+        self.name = name or default_worker_name()
+        self.lease_seconds = lease_seconds
+        self.heartbeat_interval = heartbeat_interval
+        self.poll_interval = poll_interval
+        self.orchestrator_args = orchestrator_args or []
+
+    def run(self, max_jobs: int | None = None, idle_exit: float | None = None, on_event=None) -> dict:
+        """Process jobs until max_jobs have run or the queue stays idle for idle_exit seconds.
+
+        Returns counts of {done, failed, retried}.
+        """
+        counts = {"done": 0, "failed": 0, "retried": 0}
+        idle_since = time.monotonic()
+        while max_jobs is None or sum(counts.values()) < max_jobs:
+            job = self.queue.lease(self.name, self.lease_seconds)
+            if job is None:
+                if idle_exit is not None and time.monotonic() - idle_since >= idle_exit:
+                    break
+                time.sleep(self.poll_interval)
+                continue
+            if on_event:
+                on_event("leased", job)
+            self.clear_preemption(job)
+            for preempted in job.get("preempted", []):
+                self.record_preemption(preempted)
+                if on_event:
+                    on_event("preempted", preempted)
+            status = self.execute(job)
+            counts[{DONE: "done", FAILED: "failed", PENDING: "retried"}[status]] += 1
+            if on_event:
+                on_event(status, job)
+            idle_since = time.monotonic()
+        return counts
+
+    def record_preemption(self, preempted: dict) -> None:
+        """Checkpoint a run preempted at a phase boundary, so it is visible where it stopped and why."""
+        if not preempted["workspace"]:
+            return
+        data = {
+            "priority": preempted["priority"],
+            "pending_agents": preempted["agents"],
+            "preempted_by": preempted["by"],
+            "worker": self.name,
+        }
+        try:
+            save_checkpoint(Path(preempted["workspace"]), "preempted", data)
+        except OSError:
+            pass
+
+    def clear_preemption(self, job: dict) -> None:
+        """Remove the run's preempted checkpoint now that one of its jobs has a slot again."""
+        workspace = _job_workspace(job["argv"])
+        if workspace:
+            try:
+                clear_checkpoint(Path(workspace), "preempted")
+            except OSError:
+                pass
+
+    def execute(self, job: dict) -> str:
+        """Run a leased job to completion, heartbeating its lease. Returns its new status."""
+        argv = job["argv"]
+        log_path = None
+        workspace = _job_workspace(argv)
+        if workspace:
+            workspace = Path(workspace)
+            (workspace / JOB_LOG_DIR).mkdir(parents=True, exist_ok=True)
+            log_path = workspace / JOB_LOG_DIR / f"{job['agent']}-{job['id']}.log"
+        cmd = [sys.executable, str(ORCHESTRATOR), *self.orchestrator_args, *argv]
+        start = time.time()
+        with open(log_path or os.devnull, "a") as log:
+            log.write(f"# worker {self.name} attempt {job['attempts']}: {' '.join(cmd)}\n")
+            log.flush()
+            proc = subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+            lost = False
+            renewed = time.monotonic()
+            while True:
+                try:
+                    proc.wait(timeout=self.heartbeat_interval)
+                    break
+                except subprocess.TimeoutExpired:
+                    pass
+                try:
+                    # False: the lease expired and the job was handed to another worker
+                    lost = not self.queue.heartbeat(job["id"], self.name, self.lease_seconds)
+                    renewed = time.monotonic()
+                except sqlite3.Error as e:
+                    # Queue unreachable or locked. Keep trying until the lease has run out,
+                    # since by then another worker may have taken the job.
+                    log.write(f"# worker {self.name}: heartbeat failed: {e}\n")
+                    log.flush()
+                    lost = time.monotonic() - renewed >= self.lease_seconds
+                if lost:
+                    _terminate(proc, TERMINATE_GRACE)
+                    break
+
+        if lost:
+            return PENDING
+        result = {
+            "worker": self.name,
+            "returncode": proc.returncode,
+            "duration": round(time.time() - start, 3),
+            "log": str(log_path) if log_path else None,
+        }
+        if proc.returncode == 0:
+            self.queue.complete(job["id"], self.name, result)
+            return DONE
+        if proc.returncode == CANCELLED_EXIT:
+            return self.queue.fail(job["id"], self.name, "run cancelled", retry=False)
+        return self.queue.fail(job["id"], self.name, f"exit {proc.returncode} (see {result['log']})")
+
+
+def _job_workspace(argv: list[str]) -> str | None:
+    return argv[argv.index("--workspace") + 1] if "--workspace" in argv else None
+
+
+def _terminate(proc: subprocess.Popen, grace: float) -> None:
+    """SIGTERM a job's process group, escalating to SIGKILL after grace seconds, and reap it."""
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+    except ProcessLookupError:
+        pass
+    try:
+        proc.wait(timeout=grace)
+        return
+    except subprocess.TimeoutExpired:
+        pass
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    proc.wait()
+
+
+def queue_summary(jobs: list[dict]) -> dict:
+    """Counts by status overall and per run, plus the workers holding leases."""
+    summary = {"total": len(jobs), "by_status": {}, "runs": {}, "workers": {}}
+    for job in jobs:
+        summary["by_status"][job["status"]] = summary["by_status"].get(job["status"], 0) + 1
+        run = summary["runs"].setdefault(job["run"], {})
+        run[job["status"]] = run.get(job["status"], 0) + 1
+        if job["status"] == LEASED:
+            summary["workers"].setdefault(job["worker"], []).append(f"{job['run']}/{job['agent']}")
+    return summary
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def wait_metrics(jobs: list[dict], now: float | None = None) -> dict:
+    """Queue wait per priority class: from a job becoming ready to its latest attempt starting.
+
+    Returns {priority: {started, mean, p50, p95, max, waiting, oldest, preemptions}}
+    (seconds); "waiting" counts ready jobs not yet started and "oldest" is the
+    longest of their current waits.
+    """
+    now = now or time.time()
+    classes: dict[int, dict] = {}
+    for job in jobs:
+        entry = classes.setdefault(job.get("priority") or 0, {"waits": [], "waiting": [], "preemptions": 0})
+        entry["preemptions"] += job.get("preemptions") or 0
+        ready_at = job.get("ready_at")
+        if ready_at is None:
+            continue
+        if job["status"] == PENDING:
+            entry["waiting"].append(now - ready_at)
+        elif job.get("started_at") and job["started_at"] >= ready_at:
+            entry["waits"].append(job["started_at"] - ready_at)
+    metrics = {}
+    for priority, entry in sorted(classes.items(), reverse=True):
+        waits = entry["waits"]
+        metrics[priority] = {
+            "started": len(waits),
+            "mean": round(sum(waits) / len(waits), 3) if waits else None,
+            "p50": round(_percentile(waits, 0.5), 3) if waits else None,
+            "p95": round(_percentile(waits, 0.95), 3) if waits else None,
+            "max": round(max(waits), 3) if waits else None,
+            "waiting": len(entry["waiting"]),
+            "oldest": round(max(entry["waiting"]), 3) if entry["waiting"] else None,
+            "preemptions": entry["preemptions"],
+        }
+    return metrics
@@ -0,0 +1,92 @@
+"""Multi-app Mobilicustos batch scanning.
+
+A `mobile` pipeline scans a single app, while a release often has dozens of
+builds. This submits one Mobilicustos scan per app with bounded concurrency,
+polls them together (see scan_batch.py) and exports each app's findings to
+mobilicustos-<app>-findings.json, which the correlation phase picks up through
+its *-findings.json glob.
+
+Each app's scan handle is persisted like any other scan (see scans.py), so an
+interrupted batch reattaches to the scans still running on the service.
+"""
+
+import re
+from pathlib import Path
+
+from reports import write_json
+from scan_batch import run_scan_batch
+from scans import resume_or_launch
+from services.mobilicustos import MobilicustosClient
+from workspace import load_scan_handle, save_scan_handle
+
+
+def app_findings_file(app_id: str) -> str:
+    """Workspace file name for one app's findings."""
+    safe = re.sub(r"[^\w\-.]", "_", app_id)[:80]
+    return f"mobilicustos-{safe}-findings.json"
+
+
+def handle_key(app_id: str) -> str:
+    """scans.json entry holding one app's scan handle."""
+    return f"mobilicustos:{app_id}"
+
+
+def run_mobile_batch(
+    client: MobilicustosClient,
+    workspace: Path,
+    app_ids: list[str],
+    scan_type: str = "full",
+    max_in_flight: int = 4,
+    on_event=None,
+) -> dict:
+    """Scan many apps and export findings per app.
+
+    Apps already exported by an earlier run of the same batch are skipped.
+    Writes mobilicustos-batch.json with each app's scan ID, status and output
+    file. Returns that summary.
+    """
+    workspace = Path(workspace)
+    results: dict[str, dict] = {}
+    jobs = []
+    for app_id in dict.fromkeys(app_ids):
+        handle = load_scan_handle(workspace, handle_key(app_id))
+        if (
+            handle
+            and handle.get("state") == "exported"
+            and handle.get("profile") == scan_type
+            and (workspace / app_findings_file(app_id)).exists()
+        ):
+            results[app_id] = {"scan_id": handle["scan_id"], "status": "completed", "error": None, "duration": 0.0}
+        else:
+            jobs.append({"key": app_id, "app_id": app_id})
+
+    def submit(job: dict) -> str:
+        scan_id, _ = resume_or_launch(
+            client, "mobilicustos", workspace, job["app_id"], scan_type, handle_key=handle_key(job["app_id"])
+        )
+        return scan_id
+
+    def export(job: dict, scan_id: str) -> None:
+        save_scan_handle(workspace, handle_key(job["app_id"]), {"state": "completed"})
+        client.export_findings(scan_id, workspace / app_findings_file(job["app_id"]))
+        save_scan_handle(workspace, handle_key(job["app_id"]), {"state": "exported"})
+
+    skipped = set(results)
+    results.update(run_scan_batch(client, jobs, submit, export, max_in_flight=max_in_flight, on_event=on_event))
+
+    apps = {
+        app_id: {
+            **result,
+            "skipped": app_id in skipped,
+            "output": app_findings_file(app_id) if result["status"] == "completed" else None,
+        }
+        for app_id, result in results.items()
+    }
+    summary = {
+        "scan_type": scan_type,
+        "apps": apps,
+        "completed": sum(1 for r in apps.values() if r["status"] == "completed"),
+        "failed": [app_id for app_id, r in apps.items() if r["status"] == "failed"],
+    }
+    write_json(workspace / "mobilicustos-batch.json", summary)
+    return summary
@@ -0,0 +1,444 @@
+"""Live monitor for the runs in progress on this host.
+
+`orchestrator.py watch` follows every active workspace under the runs root
+(or the workspaces it is given) and shows, per run and agent: elapsed time,
+findings and findings/sec, endpoints fuzzed, REST calls and polls, and an
+ETA, with host-wide totals across all concurrent runs.
+
+Everything comes from files the runs already write, so watching costs the
+runs nothing:
+
+  - trace.jsonl (see tracing.py) is tailed: each poll stats the file and
+    parses only the lines appended since the last one. Agent marks give
+    start/end times; REST, poll and subprocess spans are attributed to the
+    open agent that uses that service or tool.
+  - agent output files (pipeline.AGENT_OUTPUTS, and Indago's per-batch and
+    per-wave reports until the merged report exists) are re-read for their
+    finding counts only when their size or mtime changed, and input files
+    (pipeline.AGENT_INPUTS, --targets-from batches) for their item counts.
+
+A REST "poll" is a repeated GET of a path the run already fetched (scan
+status, endpoint exports); "cached" counts the ones answered with a 304.
+
+Runs are found by polling too (the stdlib has no inotify): a run is active
+while its trace was written within the idle window. The runs root is
+rescanned when its mtime changes (a run was created or archived) and every
+`rescan` seconds otherwise, so a large root is not stat'ed on every poll.
+
+ETAs use the run planner (see planner.py): an agent with a known input size
+that has processed part of it is extrapolated from its own throughput;
+otherwise its historical p50 (p90 once that is exceeded) minus elapsed time.
+A run's ETA adds the remaining phases of its pipeline. Agents without history
+count as zero and are listed as unknown.
+"""
+
+import json
+import os
+import time
+from fnmatch import fnmatch
+from pathlib import Path
+
+from archive import ARCHIVE_SUFFIX
+from findings_index import extract_findings
+from pipeline import AGENT_INPUTS, AGENT_OUTPUTS, AGENT_SERVICE_DEPS, get_pipeline
+from planner import AGENT_TOOLS, collect_history, count_items, estimate_agent, run_profile
+from reports import load_json
+from tracing import TRACE_FILE
+from workspace import load_workspace
+
+# Seconds without a trace write after which a run is no longer shown
+DEFAULT_IDLE = 600
+
+# Seconds between full rescans of the runs root
+DEFAULT_RESCAN = 30
+
+# Partial outputs counted while an agent's final outputs do not exist yet
+PARTIAL_OUTPUTS = {
+    "api-fuzz": ["indago-batches/*-report.json", "indago-waves/*-report.json"],
+}
+
+
+class TraceTail:
+    """Incremental reader of a trace.jsonl: read() parses only the lines appended since the last call.
+
+    A partially written last line is kept until it is completed. If the file
+    shrinks or is replaced, reading starts over and `rewound` is set.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.offset = 0
+        self.partial = b""
+        self.inode = None
+        self.mtime = 0.0
+        self.rewound = False
+
+    def read(self) -> list[dict]:
+        self.rewound = False
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return []
+        self.mtime = st.st_mtime
+        if st.st_ino != self.inode or st.st_size < self.offset:
+            self.rewound = self.inode is not None
+            self.inode, self.offset, self.partial = st.st_ino, 0, b""
+        if st.st_size == self.offset:
+            return []
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read()
+        self.offset += len(data)
+        lines = (self.partial + data).split(b"\n")
+        self.partial = lines.pop()
+        records = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+        return records
+
+
+class AgentProgress:
+    """Counters for one agent of a run (or for spans no agent could be matched to)."""
+
+    def __init__(self, name: str | None):
+        self.name = name
+        self.started: float | None = None
+        self.ended: float | None = None
+        self.status: str | None = None
+        self.rest = 0
+        self.polls = 0
+        self.cached = 0
+        self.subprocesses = 0
+        self.endpoints = 0
+        self.findings = 0
+        self.size: int | None = None
+
+    def state(self) -> str:
+        if self.ended is None:
+            return "running"
+        return "done" if self.status in (None, "ok") else self.status
+
+    def elapsed(self, now: float) -> float:
+        if self.started is None:
+            return 0.0
+        return max(0.0, (self.ended or now) - self.started)
+
+    def add(self, other: "AgentProgress") -> None:
+        for field in ("rest", "polls", "cached", "subprocesses", "endpoints", "findings"):
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+
+
+class RunMonitor:
+    """Progress of one run, kept up to date from its trace and output files."""
+
+    def __init__(self, workspace: Path, services: dict[str, str], sizes: dict, findings: dict):
+        self.workspace = workspace
+        self.meta = load_workspace(workspace)
+        self.services = services
+        self.sizes = sizes
+        self.finding_counts = findings
+        self.tail = TraceTail(workspace / TRACE_FILE)
+        self._reset()
+
+    def _reset(self) -> None:
+        self.started: float | None = None
+        self.ended: float | None = None
+        self.agents: dict[str, AgentProgress] = {}
+        self.other = AgentProgress(None)
+        self.fetched: set[tuple[str | None, str]] = set()
+
+    def poll(self) -> None:
+        records = self.tail.read()
+        if self.tail.rewound:
+            self._reset()
+        for record in records:
+            if record.get("type") == "mark":
+                self._apply_mark(record)
+            elif record.get("type") == "span":
+                self._apply_span(record)
+        for agent in self.agents.values():
+            agent.findings = self._findings(agent.name)
+
+    def _apply_mark(self, record: dict) -> None:
+        if record["kind"] == "run":
+            if record["event"] == "start":
+                self.started, self.ended = record["ts"], None
+            else:
+                self.ended = record["ts"]
+        elif record["kind"] == "agent":
+            agent = self.agents.setdefault(record["name"], AgentProgress(record["name"]))
+            if record["event"] == "start":
+                agent.started, agent.ended, agent.status = record["ts"], None, None
+            else:
+                agent.ended, agent.status = record["ts"], record.get("attrs", {}).get("status")
+
+    def _apply_span(self, record: dict) -> None:
+        agent = self._attribute(record)
+        attrs = record.get("attrs", {})
+        if record["kind"] == "rest":
+            agent.rest += 1
+            key = (agent.name, record["name"])
+            if record["name"].startswith("GET ") and key in self.fetched:
+                agent.polls += 1
+            self.fetched.add(key)
+            if attrs.get("cached"):
+                agent.cached += 1
+        elif record["kind"] == "subprocess":
+            agent.subprocesses += 1
+            agent.endpoints += self._targets(attrs.get("args") or [])
+
+    def _attribute(self, record: dict) -> AgentProgress:
+        """The agent a span belongs to: the open agent using its service or tool, else the only open agent."""
+        start = record["start"]
+        open_agents = [
+            a for a in self.agents.values()
+            if a.started is not None and a.started <= start and (a.ended is None or start <= a.ended + 1e-3)
+        ]
+        if record["kind"] == "subprocess":
+            tool = record["name"].split(" ")[0]
+            users = [a for a in open_agents if tool in AGENT_TOOLS.get(a.name, [])]
+        else:
+            service = self.services.get(record.get("attrs", {}).get("service"))
+            users = [a for a in open_agents if service in AGENT_SERVICE_DEPS.get(a.name, [])]
+        if users:
+            return users[-1]
+        return open_agents[0] if len(open_agents) == 1 else self.other
+
+    def _targets(self, args: list[str]) -> int:
+        """Number of endpoints in a tool run's --targets-from file."""
+        if "--targets-from" not in args[:-1]:
+            return 0
+        return self._count_items(Path(args[args.index("--targets-from") + 1])) or 0
+
+    def _input_size(self, agent: str) -> int | None:
+        """planner.input_size, re-reading an input file only when its size or mtime changed."""
+        for name in AGENT_INPUTS.get(agent, []):
+            size = self._count_items(self.workspace / name)
+            if size is not None:
+                return size
+        return None
+
+    def _count_items(self, path: Path) -> int | None:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        cached = self.sizes.get(path)
+        if cached is None or cached[:2] != (st.st_mtime_ns, st.st_size):
+            cached = (st.st_mtime_ns, st.st_size, count_items(load_json(path)))
+            self.sizes[path] = cached
+        return cached[2]
+
+    def _findings(self, agent: str) -> int:
+        final = [self.workspace / name for name in AGENT_OUTPUTS.get(agent, [])]
+        paths = [p for p in final if p.exists()]
+        if not paths:
+            for pattern in PARTIAL_OUTPUTS.get(agent, []):
+                directory, _, glob = pattern.rpartition("/")
+                try:
+                    entries = os.scandir(self.workspace / directory)
+                except FileNotFoundError:
+                    continue
+                with entries:
+                    paths.extend(Path(e.path) for e in entries if fnmatch(e.name, glob))
+        return sum(self._count_findings(p) for p in paths)
+
+    def _count_findings(self, path: Path) -> int:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return 0
+        cached = self.finding_counts.get(path)
+        if cached is None or cached[:2] != (st.st_mtime_ns, st.st_size):
+            cached = (st.st_mtime_ns, st.st_size, len(extract_findings(load_json(path))))
+            self.finding_counts[path] = cached
+        return cached[2]
+
+    def state(self) -> str:
+        if self.ended is not None or self.meta.get("status") == "completed":
+            return "finished"
+        return "running"
+
+    def snapshot(self, now: float, samples: list[dict]) -> dict:
+        """Per-agent and run totals, rates and ETAs."""
+        target_type = self.meta["target_type"]
+        profile = run_profile(self.workspace)
+        started = self.started or min((a.started for a in self.agents.values() if a.started), default=now)
+        agents = {}
+        remaining = {}
+        unknown = []
+        for name, agent in self.agents.items():
+            if agent.size is None:
+                agent.size = self._input_size(name)
+            eta = self._agent_eta(agent, now, samples, target_type, profile)
+            if eta is None and agent.ended is None:
+                unknown.append(name)
+            remaining[name] = eta or 0.0
+            agents[name] = _progress_row(agent, now) | {"state": agent.state(), "size": agent.size, "eta": eta}
+
+        eta = 0.0
+        if self.state() == "running":
+            for phase in get_pipeline(target_type):
+                left = []
+                for name in phase:
+                    if name in remaining:
+                        left.append(remaining[name])
+                        continue
+                    estimate = estimate_agent(samples, name, target_type, profile, self._input_size(name))
+                    if estimate is None:
+                        unknown.append(name)
+                    left.append(estimate["p50"] if estimate else 0.0)
+                eta += max(left, default=0.0)
+
+        totals = AgentProgress(None)
+        for agent in [*self.agents.values(), self.other]:
+            totals.add(agent)
+        elapsed = (self.ended or now) - started
+        return {
+            "run": self.workspace.name,
+            "target": self.meta["target"],
+            "target_type": target_type,
+            "profile": profile,
+            "state": self.state(),
+            "elapsed": elapsed,
+            "eta": eta if self.state() == "running" else 0.0,
+            "unknown": unknown,
+            "agents": agents,
+            "unattributed": _progress_row(self.other, now, elapsed),
+            **_progress_row(totals, now, elapsed),
+        }
+
+    def _agent_eta(
+        self, agent: AgentProgress, now: float, samples: list[dict], target_type: str, profile: str
+    ) -> float | None:
+        if agent.ended is not None:
+            return 0.0
+        elapsed = agent.elapsed(now)
+        if agent.size and 0 < agent.endpoints < agent.size:
+            return (agent.size - agent.endpoints) * elapsed / agent.endpoints
+        estimate = estimate_agent(samples, agent.name, target_type, profile, agent.size)
+        if estimate is None:
+            return None
+        for bound in (estimate["p50"], estimate["p90"]):
+            if bound > elapsed:
+                return bound - elapsed
+        return 0.0
+
+
+def _progress_row(agent: AgentProgress, now: float, elapsed: float | None = None) -> dict:
+    elapsed = agent.elapsed(now) if elapsed is None else elapsed
+    return {
+        "elapsed": elapsed,
+        "findings": agent.findings,
+        "findings_per_sec": agent.findings / elapsed if elapsed > 0 else 0.0,
+        "endpoints": agent.endpoints,
+        "endpoints_per_sec": agent.endpoints / elapsed if elapsed > 0 else 0.0,
+        "rest": agent.rest,
+        "polls": agent.polls,
+        "cached": agent.cached,
+        "subprocesses": agent.subprocesses,
+    }
+
+
+class HostMonitor:
+    """Follows the active runs under a runs root, or a fixed set of workspaces.
+
+    Args:
+        root: Runs root to discover active runs in.
+        config: Resolved config (service URLs map REST spans to services).
+        workspaces: Watch exactly these workspaces instead of discovering runs.
+        idle: Seconds without a trace write after which a discovered run is dropped.
+        rescan: Seconds between full rescans of the root.
+        history: Past workspaces the ETA estimates are drawn from.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        config: dict,
+        workspaces: list[Path] | None = None,
+        idle: float = DEFAULT_IDLE,
+        rescan: float = DEFAULT_RESCAN,
+        history: list[Path] | None = None,
+    ):
+        self.root = root
+        self.fixed = workspaces
+        self.idle = idle
+        self.rescan = rescan
+        self.history = history or []
+        self.services = {cfg["url"].rstrip("/"): name for name, cfg in config["services"].items() if cfg.get("url")}
+        # Shared by all runs: (mtime, size, items) of inputs, (mtime, size, findings) of outputs
+        self.sizes: dict[Path, tuple[int, int, int | None]] = {}
+        self.finding_counts: dict[Path, tuple[int, int, int]] = {}
+        self.runs: dict[Path, RunMonitor] = {}
+        self.samples: list[dict] | None = None
+        self._scanned_at = 0.0
+        self._root_mtime = None
+
+    def poll(self, now: float | None = None) -> list[RunMonitor]:
+        """Discover runs, read what they appended since the last poll and return the active ones."""
+        now = now or time.time()
+        self._discover(now)
+        for ws, run in list(self.runs.items()):
+            run.poll()
+            if self.fixed is None and (not ws.is_dir() or now - run.tail.mtime > self.idle):
+                del self.runs[ws]
+        return list(self.runs.values())
+
+    def _discover(self, now: float) -> None:
+        if self.fixed is not None:
+            for ws in self.fixed:
+                if ws not in self.runs:
+                    self.runs[ws] = RunMonitor(ws, self.services, self.sizes, self.finding_counts)
+            return
+        try:
+            root_mtime = self.root.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if root_mtime == self._root_mtime and now - self._scanned_at < self.rescan:
+            return
+        self._root_mtime, self._scanned_at = root_mtime, now
+        with os.scandir(self.root) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or entry.name.endswith(ARCHIVE_SUFFIX) or not entry.is_dir():
+                    continue
+                ws = Path(entry.path)
+                if ws in self.runs:
+                    continue
+                try:
+                    active = now - os.stat(ws / TRACE_FILE).st_mtime <= self.idle
+                except FileNotFoundError:
+                    continue
+                if active:
+                    try:
+                        self.runs[ws] = RunMonitor(ws, self.services, self.sizes, self.finding_counts)
+                    except FileNotFoundError:
+                        continue
+
+    def snapshot(self, now: float | None = None) -> dict:
+        """Per-run snapshots plus totals across all watched runs."""
+        now = now or time.time()
+        if self.samples is None:
+            self.samples = collect_history(self.history)
+        runs = [run.snapshot(now, self.samples) for run in self.runs.values()]
+        runs.sort(key=lambda r: r["run"])
+        totals = {
+            field: sum(r[field] for r in runs)
+            for field in ("findings", "endpoints", "rest", "polls", "cached", "subprocesses")
+        }
+        running = [r for r in runs if r["state"] == "running"]
+        return {
+            "at": now,
+            "runs": runs,
+            "active_runs": len(running),
+            "running_agents": sum(1 for r in runs for a in r["agents"].values() if a["state"] == "running"),
+            "findings_per_sec": sum(r["findings_per_sec"] for r in running),
+            "endpoints_per_sec": sum(r["endpoints_per_sec"] for r in running),
+            "eta": max((r["eta"] for r in running), default=0.0),
+            **totals,
+        }
@@ -91,6 +91,18 @@ AGENT_INPUTS = {
 }
 
 
+# Agents whose failure cancels the rest of the run, per target type (see
+# cancel.py). In `full` runs the three scans are independent, so by default
+# no single failure aborts the others; a run can override this at init.
+DEFAULT_ABORT_ON = {
+    "web": ["recon"],
+    "mobile": ["mobile-scan"],
+    "cloud": ["cloud-audit"],
+    "full": [],
+    "api": ["api-fuzz"],
+}
+
+
 def get_pipeline(target_type: str) -> list[list[str]]:
     """Get the pipeline phases for a target type."""
     if target_type not in PIPELINES:
@@ -113,6 +125,27 @@ def get_required_services(target_type: str) -> list[str]:
     return sorted(services)
 
 
+def get_agent_dependencies(target_type: str) -> dict[str, list[str]]:
+    """Map each agent of a pipeline to the earlier agents it must wait for.
+
+    An agent waits for the earlier agents producing its AGENT_INPUTS; an agent
+    with no declared inputs (correlate ingests everything) waits for all
+    earlier agents. This is looser than strict phase order, e.g. in `full`
+    runs container-escape only waits for cloud-audit, not recon.
+    """
+    deps = {}
+    earlier: list[str] = []
+    for phase in get_pipeline(target_type):
+        for agent_key in phase:
+            inputs = set(AGENT_INPUTS.get(agent_key, []))
+            if inputs:
+                deps[agent_key] = [a for a in earlier if inputs & set(AGENT_OUTPUTS.get(a, []))]
+            else:
+                deps[agent_key] = list(earlier)
+        earlier.extend(phase)
+    return deps
+
+
 def describe_pipeline(target_type: str) -> str:
     """Return a human-readable description of a pipeline."""
     pipeline = get_pipeline(target_type)
@@ -0,0 +1,218 @@
+"""Run planner: runtime estimates from historical agent timings.
+
+Every traced run records agent start/end marks in its trace.jsonl (see
+tracing.py). This collects those agent durations across past workspaces,
+keyed by target type, scan profile and input size, and uses them to predict
+how long each phase of a new run will take, which agents form the critical
+path, and how many runs of a batch can share the services and tools at once.
+
+Estimates fall back from the most specific history to the least:
+(agent, target type, profile) -> (agent, target type) -> (agent). When an
+agent's input size is known (e.g. endpoints for api-fuzz) and history has
+sizes too, the estimate scales with the per-item time instead.
+"""
+
+import math
+from pathlib import Path
+
+from archive import load_member_json
+from pipeline import AGENT_INPUTS, AGENT_SERVICE_DEPS, get_pipeline
+from tracing import load_workspace_spans
+from usage import aggregate, load_usage
+
+# Minimum samples before a history bucket is trusted
+MIN_SAMPLES = 3
+
+# CLI tools each agent runs (services are in pipeline.AGENT_SERVICE_DEPS)
+AGENT_TOOLS = {
+    "api-fuzz": ["indago"],
+    "waf-bypass": ["burrito"],
+    "container-escape": ["cepheus"],
+    "correlate": ["vinculum"],
+    "attack-paths": ["ariadne"],
+}
+
+
+def count_items(data) -> int | None:
+    """Number of items in an input export (a list, or a dict holding endpoints, containers, ...)."""
+    if isinstance(data, list):
+        return len(data)
+    if isinstance(data, dict):
+        for key in ("endpoints", "containers", "targets", "findings", "nodes"):
+            if isinstance(data.get(key), list):
+                return len(data[key])
+    return None
+
+
+def input_size(workspace: Path, agent: str) -> int | None:
+    """Number of items in the agent's input file (endpoints, containers, ...), if present."""
+    for name in AGENT_INPUTS.get(agent, []):
+        size = count_items(load_member_json(workspace, name))
+        if size is not None:
+            return size
+    return None
+
+
+def run_profile(workspace: Path) -> str:
+    """Scan profile the run's service scans used, or "default"."""
+    scans = load_member_json(workspace, "scans.json", {})
+    for handle in scans.values():
+        if isinstance(handle, dict) and handle.get("profile"):
+            return handle["profile"]
+    return "default"
+
+
+def collect_history(workspaces: list[Path]) -> list[dict]:
+    """Collect completed agent runs from workspace traces.
+
+    Returns samples of {agent, target_type, profile, size, duration}. Agents
+    that failed or never finished are left out. Archived runs count too.
+    """
+    samples = []
+    for ws in workspaces:
+        meta = load_member_json(ws, "run-meta.json", {})
+        spans = load_workspace_spans(ws) if meta else None
+        if not spans:
+            continue
+        profile = run_profile(ws)
+        for span in spans:
+            attrs = span.get("attrs", {})
+            if span["kind"] != "agent" or attrs.get("unfinished") or attrs.get("status") not in (None, "ok"):
+                continue
+            samples.append({
+                "agent": span["name"],
+                "target_type": meta.get("target_type"),
+                "profile": profile,
+                "size": input_size(ws, span["name"]),
+                "duration": span["duration"],
+            })
+    return samples
+
+
+def _quantile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(pct * (len(ordered) - 1)))]
+
+
+def estimate_agent(
+    samples: list[dict],
+    agent: str,
+    target_type: str,
+    profile: str = "default",
+    size: int | None = None,
+) -> dict | None:
+    """Predict an agent's duration from history.
+
+    Returns {p50, p90, samples, basis} in seconds, or None without history.
+    basis names the history bucket used (and "per-item" when scaled by size).
+    """
+    own = [s for s in samples if s["agent"] == agent]
+    buckets = [
+        ("type+profile", [s for s in own if s["target_type"] == target_type and s["profile"] == profile]),
+        ("type", [s for s in own if s["target_type"] == target_type]),
+        ("all", own),
+    ]
+    basis, chosen = next(((b, s) for b, s in buckets if len(s) >= MIN_SAMPLES), ("all", own))
+    if not chosen:
+        return None
+
+    sized = [s for s in chosen if s["size"]]
+    if size and len(sized) >= MIN_SAMPLES:
+        rates = [s["duration"] / s["size"] for s in sized]
+        return {
+            "p50": _quantile(rates, 0.5) * size,
+            "p90": _quantile(rates, 0.9) * size,
+            "samples": len(sized),
+            "basis": f"{basis}, per-item",
+        }
+    durations = [s["duration"] for s in chosen]
+    return {
+        "p50": _quantile(durations, 0.5),
+        "p90": _quantile(durations, 0.9),
+        "samples": len(chosen),
+        "basis": basis,
+    }
+
+
+def plan_run(
+    samples: list[dict],
+    target_type: str,
+    profile: str = "default",
+    sizes: dict[str, int] | None = None,
+    skip: set[str] | None = None,
+) -> dict:
+    """Predict per-phase and total run time for a pipeline.
+
+    Agents in a phase run in parallel, so a phase takes as long as its
+    slowest agent; that agent is the phase's step on the critical path.
+    Agents without history count as zero and are listed in "unknown".
+    """
+    sizes = sizes or {}
+    skip = skip or set()
+    phases = []
+    unknown = []
+    for index, phase in enumerate(get_pipeline(target_type), 1):
+        agents = {}
+        for agent in phase:
+            if agent in skip:
+                continue
+            estimate = estimate_agent(samples, agent, target_type, profile, sizes.get(agent))
+            if estimate is None:
+                unknown.append(agent)
+            else:
+                agents[agent] = estimate
+        if not agents:
+            phases.append({"phase": index, "agents": {}, "p50": 0.0, "p90": 0.0, "critical": None})
+            continue
+        critical = max(agents, key=lambda a: agents[a]["p50"])
+        phases.append({
+            "phase": index,
+            "agents": agents,
+            "p50": agents[critical]["p50"],
+            "p90": max(a["p90"] for a in agents.values()),
+            "critical": critical,
+        })
+
+    total_p50 = sum(p["p50"] for p in phases)
+    for phase in phases:
+        phase["share"] = phase["p50"] / total_p50 if total_p50 else 0.0
+    return {
+        "target_type": target_type,
+        "profile": profile,
+        "phases": phases,
+        "total_p50": total_p50,
+        "total_p90": sum(p["p90"] for p in phases),
+        "critical_path": [p["critical"] for p in phases if p["critical"]],
+        "unknown": unknown,
+    }
+
+
+def recommend_batch(plan: dict, config: dict, workspaces: list[Path], runs: int) -> dict:
+    """Recommend how many runs of a batch to execute at once.
+
+    The limit is the tightest of: each used service's max_in_flight (default
+    4) and each used tool's suggested concurrency from recorded resource usage
+    (see usage.py). Returns the limit, what imposed it and the batch estimate.
+    """
+    agents = {a for phase in plan["phases"] for a in phase["agents"]} | set(plan["unknown"])
+    limits = {}
+    for agent in agents:
+        for service in AGENT_SERVICE_DEPS.get(agent, []):
+            limits[f"service:{service}"] = config["services"].get(service, {}).get("max_in_flight", 4)
+    tool_usage = aggregate(load_usage(workspaces))
+    for agent in agents:
+        for tool in AGENT_TOOLS.get(agent, []):
+            if tool in tool_usage:
+                limits[f"tool:{tool}"] = tool_usage[tool]["suggested_concurrency"]
+
+    concurrency = min([runs, *limits.values()]) if limits else runs
+    bottleneck = min(limits, key=limits.get) if limits and concurrency < runs else None
+    waves = math.ceil(runs / max(1, concurrency))
+    return {
+        "runs": runs,
+        "concurrency": concurrency,
+        "bottleneck": bottleneck,
+        "limits": limits,
+        "batch_p50": waves * plan["total_p50"],
+        "batch_p90": waves * plan["total_p90"],
+    }
@@ -0,0 +1,310 @@
+"""Profiling of the orchestrator process itself.
+
+Two modes:
+  cprofile  deterministic cProfile of the main thread. Exact call counts
+            and per-function times, but it slows Python code down noticeably
+            and does not see worker threads (stream-fuzz batches, cloud
+            shards, container batches).
+  sample    a background thread snapshots every thread's stack each interval
+            (default 5ms) via sys._current_frames(). Overhead is low and
+            independent of how much Python runs. Samples are wall-clock, so
+            time spent waiting (polls, subprocesses, sleeps) shows up too.
+
+Each session writes to <dir>/profiles/<label>-<timestamp>-<pid>.*:
+  .pstats     cProfile stats (open with `python -m pstats` or snakeviz)
+  .collapsed  sampled stacks in collapsed format, one "frame;frame;... count"
+              line per stack (flamegraph.pl, speedscope, inferno)
+  .txt        hot-path summary: top functions by self time with their
+              inclusive time, and for samples the hottest call path
+
+`orchestrator.py --profiler {cprofile,sample} <command>` profiles one CLI
+invocation, writing into the command's workspace if it has one. For library
+use of the service clients, set BOUNTY_PIPELINE_PROFILE=sample (or
+"cprofile", or "sample:<ms>" for another interval). The profile starts when
+the first service client is constructed and is written at exit, into
+BOUNTY_PIPELINE_PROFILE_DIR, else next to BOUNTY_PIPELINE_TRACE_FILE, else
+the current directory.
+"""
+
+import atexit
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+PROFILE_ENV = "BOUNTY_PIPELINE_PROFILE"
+PROFILE_DIR_ENV = "BOUNTY_PIPELINE_PROFILE_DIR"
+PROFILE_DIR = "profiles"
+
+MODES = ("cprofile", "sample")
+DEFAULT_INTERVAL = 0.005
+
+# Functions listed in the hot-path summary
+SUMMARY_TOP = 25
+
+_active: "Profile | None" = None
+_env_checked = False
+
+
+def parse_mode(value: str) -> tuple[str, float]:
+    """Mode and sampling interval (seconds) from "cprofile", "sample" or "sample:<ms>"."""
+    mode, _, interval = value.strip().lower().partition(":")
+    if mode not in MODES:
+        raise ValueError(f"Unknown profile mode: {value!r}. Valid: {list(MODES)}")
+    try:
+        return mode, float(interval) / 1000 if interval else DEFAULT_INTERVAL
+    except ValueError:
+        raise ValueError(f"Invalid sampling interval in {value!r} (expected sample:<ms>)") from None
+
+
+def _frame_name(code) -> str:
+    # co_qualname (Class.method) is Python 3.11+
+    return f"{Path(code.co_filename).name}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class SamplingProfiler:
+    """Collects the stacks of all other threads every `interval` seconds.
+
+    stacks counts each distinct stack, root first, with the thread name as
+    its root frame.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="profiling-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names: dict[int, str] = {}
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            if any(tid not in names for tid in frames):
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for tid, frame in frames.items():
+                if tid == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_name(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(tid, f"thread-{tid}"))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+
+def sample_hot_paths(stacks: Counter, top: int = SUMMARY_TOP) -> tuple[list[dict], list[tuple[str, int]]]:
+    """Top functions by self samples, and the hottest call path, from collapsed stacks.
+
+    Returns (rows of {function, self, total}, [(frame, samples), ...] from the root).
+    """
+    own, inclusive = Counter(), Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(";")[1:]  # drop the thread name
+        if not frames:
+            continue
+        own[frames[-1]] += count
+        for frame in set(frames):
+            inclusive[frame] += count
+    rows = [{"function": f, "self": n, "total": inclusive[f]} for f, n in own.most_common(top)]
+
+    path = []
+    prefix: list[str] = []
+    candidates = stacks
+    while True:
+        children = Counter()
+        for stack, count in candidates.items():
+            frames = stack.split(";")
+            if len(frames) > len(prefix) and frames[:len(prefix)] == prefix:
+                children[frames[len(prefix)]] += count
+        if not children:
+            break
+        frame, count = children.most_common(1)[0]
+        prefix.append(frame)
+        path.append((frame, count))
+        candidates = {s: c for s, c in candidates.items() if s.split(";")[:len(prefix)] == prefix}
+    return rows, path
+
+
+def cprofile_hot_paths(stats, top: int = SUMMARY_TOP) -> list[dict]:
+    """Top functions by self time from pstats.Stats: {function, calls, self, total} (seconds)."""
+    rows = [
+        {
+            "function": f"{Path(filename).name}:{name}" if filename != "~" else name,
+            "line": line,
+            "calls": calls,
+            "self": self_time,
+            "total": total_time,
+        }
+        for (filename, line, name), (_, calls, self_time, total_time, _) in stats.stats.items()
+    ]
+    rows.sort(key=lambda row: row["self"], reverse=True)
+    return rows[:top]
+
+
+class Profile:
+    """One profiling session. start() begins collecting; stop() writes the output files.
+
+    Args:
+        mode: "cprofile" or "sample".
+        output_dir: Directory the files go into (a profiles/ subdirectory is created).
+        label: Prefix of the file names, e.g. the CLI command.
+        interval: Sampling interval in seconds (sample mode).
+    """
+
+    def __init__(self, mode: str, output_dir: str | Path, label: str = "profile", interval: float = DEFAULT_INTERVAL):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode: {mode}. Valid: {list(MODES)}")
+        self.mode = mode
+        self.output_dir = Path(output_dir).expanduser() / PROFILE_DIR
+        self.label = label
+        self.interval = interval
+        self.started = 0.0
+        self._profiler = None
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        if self.mode == "cprofile":
+            import cProfile
+
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            self._profiler = SamplingProfiler(self.interval)
+            self._profiler.start()
+
+    def stop(self) -> dict:
+        """Stop profiling and write the files. Returns {mode, seconds, files, summary}."""
+        if self.mode == "cprofile":
+            self._profiler.disable()
+        else:
+            self._profiler.stop()
+        seconds = time.perf_counter() - self.started
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stem = self.output_dir / f"{self.label}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        files = []
+        if self.mode == "cprofile":
+            import pstats
+
+            path = Path(f"{stem}.pstats")
+            self._profiler.dump_stats(path)
+            files.append(path)
+            rows = cprofile_hot_paths(pstats.Stats(self._profiler))
+            summary = _format_cprofile(rows, seconds)
+        else:
+            path = Path(f"{stem}.collapsed")
+            path.write_text(self._profiler.collapsed())
+            files.append(path)
+            rows, hottest = sample_hot_paths(self._profiler.stacks)
+            summary = _format_samples(
+                rows, hottest, self._profiler.samples, sum(self._profiler.stacks.values()), self.interval, seconds
+            )
+        path = Path(f"{stem}.txt")
+        path.write_text(summary)
+        files.append(path)
+        return {"mode": self.mode, "seconds": seconds, "files": [str(f) for f in files], "summary": summary}
+
+
+def _format_cprofile(rows: list[dict], seconds: float) -> str:
+    lines = [
+        f"cProfile of the main thread, {seconds:.2f}s wall",
+        "",
+        f"{'self s':>9} {'total s':>9} {'calls':>9}  function",
+    ]
+    for row in rows:
+        lines.append(
+            f"{row['self']:9.3f} {row['total']:9.3f} {row['calls']:9d}  {row['function']}"
+            + (f" (line {row['line']})" if row["line"] else "")
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _format_samples(rows: list[dict], hottest: list, samples: int, stacks: int, interval: float, seconds: float) -> str:
+    # Each sample holds one stack per thread; shares are of all sampled thread stacks
+    total = max(stacks, 1)
+    lines = [
+        f"{samples} samples ({stacks} thread stacks) every {interval * 1000:g}ms over {seconds:.2f}s wall",
+        "",
+        f"{'self':>6} {'total':>6}  function (share of thread stacks: self / inclusive)",
+    ]
+    for row in rows:
+        lines.append(f"{row['self'] / total:6.1%} {row['total'] / total:6.1%}  {row['function']}")
+    # Import machinery frames are kept in the .collapsed file but skipped here
+    hottest = [(frame, count) for frame, count in hottest if not frame.startswith("<frozen ")]
+    if hottest:
+        lines += ["", "Hottest path:"]
+        lines += [f"  {count / total:6.1%}  {frame}" for frame, count in hottest]
+    return "\n".join(lines) + "\n"
+
+
+def start(mode: str, output_dir: str | Path, label: str = "profile", interval: float = DEFAULT_INTERVAL) -> Profile:
+    """Start the process-wide profiling session."""
+    global _active
+    if _active is not None:
+        raise RuntimeError("A profiling session is already active")
+    _active = Profile(mode, output_dir, label, interval)
+    _active.start()
+    return _active
+
+
+def stop() -> dict | None:
+    """Stop the process-wide session, if any, and write its files."""
+    global _active
+    session, _active = _active, None
+    return session.stop() if session else None
+
+
+def active() -> Profile | None:
+    return _active
+
+
+def start_from_env(label: str = "profile") -> Profile | None:
+    """Start profiling if BOUNTY_PIPELINE_PROFILE is set and no session is active; written at exit.
+
+    Only the first call in a process looks at the environment. An invalid
+    value is reported on stderr and ignored.
+    """
+    global _env_checked
+    if _env_checked:
+        return None
+    _env_checked = True
+    value = os.environ.get(PROFILE_ENV)
+    if not value or _active is not None:
+        return None
+    try:
+        mode, interval = parse_mode(value)
+    except ValueError as e:
+        print(f"{PROFILE_ENV} ignored: {e}", file=sys.stderr)
+        return None
+    output_dir = os.environ.get(PROFILE_DIR_ENV)
+    if not output_dir:
+        from tracing import TRACE_ENV
+
+        trace_file = os.environ.get(TRACE_ENV)
+        output_dir = Path(trace_file).expanduser().parent if trace_file else Path.cwd()
+    session = start(mode, output_dir, label, interval)
+    atexit.register(_report_at_exit)
+    return session
+
+
+def _report_at_exit() -> None:
+    result = stop()
+    if result:
+        print(f"Profile written: {', '.join(result['files'])}", file=sys.stderr)
@@ -0,0 +1,55 @@
+"""Report file helpers for bounty-pipeline.
+
+Tool reports are JSON objects whose exact schema varies per tool. These helpers
+read them defensively and merge partial reports (per batch, per shard) into the
+single file each downstream tool expects.
+"""
+
+import json
+from pathlib import Path
+
+
+def load_json(path: str | Path, default=None):
+    """Load a JSON file, returning default if it is missing or unparseable."""
+    path = Path(path)
+    if not path.exists():
+        return default
+    try:
+        return json.loads(path.read_text())
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return default
+
+
+def write_json(path: str | Path, data) -> Path:
+    """Write data as pretty-printed JSON, matching the other workspace files."""
+    path = Path(path)
+    path.write_text(json.dumps(data, indent=2))
+    return path
+
+
+def merge_reports(reports: list[dict]) -> dict:
+    """Merge several reports of the same shape into one.
+
+    List values are concatenated, numeric values are summed, nested dicts are
+    merged recursively and any other value is taken from the first report that
+    has it.
+    """
+    merged: dict = {}
+    for report in reports:
+        if not isinstance(report, dict):
+            continue
+        for key, value in report.items():
+            if key not in merged:
+                merged[key] = list(value) if isinstance(value, list) else value
+                if isinstance(value, dict):
+                    merged[key] = merge_reports([value])
+                continue
+            current = merged[key]
+            if isinstance(current, list) and isinstance(value, list):
+                current.extend(value)
+            elif isinstance(current, dict) and isinstance(value, dict):
+                merged[key] = merge_reports([current, value])
+            elif isinstance(current, (int, float)) and isinstance(value, (int, float)) \
+                    and not isinstance(current, bool) and not isinstance(value, bool):
+                merged[key] = current + value
+    return merged
@@ -0,0 +1,172 @@
+"""Resumable server-side scans for bounty-pipeline.
+
+Reticustos, Nubicustos and Mobilicustos scans run for 15-30 minutes on the
+service side. The scan handle is saved to <workspace>/scans.json the moment
+the scan is created, and every later step updates its state:
+
+  registered -> started -> completed -> exported
+
+If the orchestrator or an agent dies mid-scan, running the same step again
+reattaches to the original scan_id via poll_scan instead of launching a new
+scan. A scan is only relaunched when the service reports it failed or no
+longer knows about it.
+
+With a ScanRegistry (see coalesce.py), a new scan is also shared with other
+runs requesting the same target and profile.
+"""
+
+from pathlib import Path
+from urllib.error import HTTPError
+
+from workspace import load_scan_handle, save_scan_handle
+
+# Files each service's scan is exported to, matching pipeline.AGENT_OUTPUTS
+SCAN_EXPORTS = {
+    "reticustos": ["reticustos-findings.json", "reticustos-endpoints.json"],
+    "nubicustos": ["nubicustos-findings.json", "nubicustos-containers.json"],
+    "mobilicustos": ["mobilicustos-findings.json"],
+}
+
+FAILED_STATUSES = ("failed", "error", "cancelled")
+
+# Config "defaults" key holding each service's default profile / scan type
+DEFAULT_PROFILE_KEYS = {
+    "reticustos": ("reticustos_profile", "standard"),
+    "nubicustos": ("nubicustos_profile", "comprehensive"),
+    "mobilicustos": ("mobilicustos_scan_type", "full"),
+}
+
+
+def default_profile(config: dict, service: str) -> str:
+    """Get the configured default scan profile for a service."""
+    key, fallback = DEFAULT_PROFILE_KEYS[service]
+    return config.get("defaults", {}).get(key, fallback)
+
+
+def scan_id_of(scan: dict) -> str:
+    """Extract the scan ID from a create/register response."""
+    scan_id = scan.get("id") or scan.get("scan_id")
+    if scan_id is None:
+        raise RuntimeError(f"Service response has no scan ID: {scan}")
+    return str(scan_id)
+
+
+def launch_scan(
+    client, service: str, workspace: Path, target: str, profile: str, handle_key: str | None = None
+) -> str:
+    """Create (and for Reticustos, start) a scan, persisting its handle first.
+
+    handle_key names the scans.json entry (default: the service name); batch
+    runs use one entry per target.
+    """
+    handle_key = handle_key or service
+    handle = {"target": target, "profile": profile}
+    if service == "reticustos":
+        scan_id = scan_id_of(client.register_target(target))
+        save_scan_handle(workspace, handle_key, {**handle, "scan_id": scan_id, "state": "registered"})
+        client.start_scan(scan_id, profile=profile)
+    elif service == "nubicustos":
+        scan_id = scan_id_of(client.create_scan(target, profile=profile))
+    elif service == "mobilicustos":
+        scan_id = scan_id_of(client.create_scan(target, scan_type=profile))
+    else:
+        raise ValueError(f"Unknown scan service: {service}. Valid: {list(SCAN_EXPORTS)}")
+    save_scan_handle(workspace, handle_key, {**handle, "scan_id": scan_id, "state": "started"})
+    return scan_id
+
+
+def resume_or_launch(
+    client,
+    service: str,
+    workspace: Path,
+    target: str,
+    profile: str,
+    registry=None,
+    handle_key: str | None = None,
+) -> tuple[str, str]:
+    """Reattach to this workspace's scan for the service, or get a new one.
+
+    Without a registry a new scan is always launched. With one, a scan another
+    run already has in flight (or finished within the TTL) is shared instead.
+
+    Returns (scan_id, source) where source is "reattached", "inflight",
+    "cached" or "launched".
+    """
+    handle_key = handle_key or service
+    handle = load_scan_handle(workspace, handle_key)
+    if handle and handle.get("target") == target and handle.get("profile") == profile:
+        scan_id = handle["scan_id"]
+        try:
+            status = client.get_scan(scan_id).get("status", "")
+        except HTTPError as e:
+            if e.code != 404:
+                raise
+            status = None
+        if status is not None and status not in FAILED_STATUSES:
+            if handle.get("state") == "registered" and status in ("", "pending", "created", "registered"):
+                client.start_scan(scan_id, profile=profile)
+                save_scan_handle(workspace, handle_key, {"state": "started"})
+            return scan_id, "reattached"
+
+    if registry is None:
+        return launch_scan(client, service, workspace, target, profile, handle_key), "launched"
+
+    scan_id, source = registry.acquire(
+        service, target, profile, lambda: launch_scan(client, service, workspace, target, profile, handle_key)
+    )
+    if source != "launched":
+        save_scan_handle(
+            workspace, handle_key, {"target": target, "profile": profile, "scan_id": scan_id, "state": "started"}
+        )
+    return scan_id, source
+
+
+def export_scan(client, service: str, workspace: Path, scan_id: str) -> list[Path]:
+    """Export a completed scan's results to the standard workspace files."""
+    if service == "reticustos":
+        paths = [
+            client.export_findings(scan_id, workspace / "reticustos-findings.json"),
+            client.export_endpoints(scan_id, workspace / "reticustos-endpoints.json"),
+        ]
+    elif service == "nubicustos":
+        paths = [
+            client.export_findings(scan_id, workspace / "nubicustos-findings.json"),
+            client.export_containers(scan_id, workspace / "nubicustos-containers.json"),
+        ]
+    else:
+        paths = [client.export_findings(scan_id, workspace / "mobilicustos-findings.json")]
+    return paths
+
+
+def run_scan(client, service: str, workspace: Path, target: str, profile: str, registry=None) -> dict:
+    """Run a service scan end to end, resuming wherever a previous attempt stopped.
+
+    Returns {scan_id, source, skipped, outputs}. skipped is True when the
+    scan was already exported and its files are still in the workspace.
+    """
+    workspace = Path(workspace)
+    handle = load_scan_handle(workspace, service)
+    outputs = [workspace / name for name in SCAN_EXPORTS[service]]
+    if (
+        handle
+        and handle.get("state") == "exported"
+        and handle.get("target") == target
+        and handle.get("profile") == profile
+        and all(p.exists() for p in outputs)
+    ):
+        return {"scan_id": handle["scan_id"], "source": "reattached", "skipped": True, "outputs": outputs}
+
+    scan_id, source = resume_or_launch(client, service, workspace, target, profile, registry=registry)
+    try:
+        client.poll_scan(scan_id)
+    except BaseException:
+        # Failed, timed out or cancelled: don't leave the entry "running" for other runs to attach to
+        if registry is not None:
+            registry.finish(service, target, profile, scan_id, succeeded=False)
+        raise
+    if registry is not None:
+        registry.finish(service, target, profile, scan_id, succeeded=True)
+    save_scan_handle(workspace, service, {"state": "completed"})
+    outputs = export_scan(client, service, workspace, scan_id)
+    save_scan_handle(workspace, service, {"state": "exported"})
+    return {"scan_id": scan_id, "source": source, "skipped": False, "outputs": outputs}
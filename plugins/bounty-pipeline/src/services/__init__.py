@@ -0,0 +1,56 @@
+"""Service clients and CLI tool wrappers for bounty-pipeline."""
+
+from config import get_service_config, get_tool_path
+from http_cache import ResponseCache
+from services.ariadne import AriadneClient
+from services.bypassburrito import BypassBurritoClient
+from services.cepheus import CepheusClient
+from services.indago import IndagoClient
+from services.mobilicustos import MobilicustosClient
+from services.nubicustos import NubicustosClient
+from services.reticustos import ReticustosClient
+from services.vinculum import VinculumClient
+from tool_registry import ToolRegistry
+
+SERVICE_CLIENTS = {
+    "reticustos": ReticustosClient,
+    "mobilicustos": MobilicustosClient,
+    "nubicustos": NubicustosClient,
+}
+
+TOOL_CLIENTS = {
+    "indago": IndagoClient,
+    "burrito": BypassBurritoClient,
+    "cepheus": CepheusClient,
+    "vinculum": VinculumClient,
+    "ariadne": AriadneClient,
+}
+
+
+def get_service_client(config: dict, service_name: str, cancel_token=None):
+    """Build a REST client for a Docker service from pipeline config.
+
+    Clients share the process-wide response cache (see http_cache.py).
+    """
+    svc = get_service_config(config, service_name)
+    return SERVICE_CLIENTS[service_name](
+        svc.get("url", ""),
+        timeout=svc.get("timeout", 600),
+        poll_interval=svc.get("poll_interval", 15),
+        cancel_token=cancel_token,
+        cache=ResponseCache.for_config(config),
+    )
+
+
+def get_tool_client(config: dict, tool_name: str, workspace=None, cancel_token=None):
+    """Build a CLI wrapper for a local tool from pipeline config.
+
+    Passing a workspace records each invocation's resource usage there. The
+    wrapper shares the on-disk capability cache (see tool_registry.py).
+    """
+    return TOOL_CLIENTS[tool_name](
+        get_tool_path(config, tool_name),
+        workspace=workspace,
+        cancel_token=cancel_token,
+        registry=ToolRegistry.for_config(config),
+    )
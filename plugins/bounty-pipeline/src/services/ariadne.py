@@ -12,6 +12,8 @@ from services.base import CLIToolWrapper
 class AriadneClient(CLIToolWrapper):
     """Wrapper for the Ariadne attack path synthesizer CLI."""
 
+    SUBCOMMANDS = ["analyze", "export-endpoints"]
+
     def analyze(
         self,
         input_path: str,
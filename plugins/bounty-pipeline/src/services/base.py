@@ -1,24 +1,61 @@
 """Base classes for bounty-pipeline service clients.
 
 RESTServiceClient: for Docker-based FastAPI services (Reticustos, Mobilicustos, Nubicustos).
+  GETs are conditional, revalidating responses held in a ResponseCache (see http_cache.py).
 CLIToolWrapper: for local CLI tools (Indago, BypassBurrito, Cepheus, Vinculum, Ariadne).
 """
 
 import json
+import os
+import signal
 import subprocess
+import threading
 import time
 from pathlib import Path
 from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
+import cancel
+import profiling
+import tracing
+import usage
+from cancel import CancelToken
+from http_cache import CachedResponse, ResponseCache
+from tool_registry import ToolRegistry
+
 
 class RESTServiceClient:
-    """Base client for FastAPI REST services running in Docker."""
+    """Base client for FastAPI REST services running in Docker.
+
+    Polls wait on the cancel token (or the process-wide one, see cancel.py)
+    and raise cancel.Cancelled once the run is cancelled.
+
+    GET responses with an ETag or Last-Modified are kept in the response
+    cache (a private in-memory one unless a shared cache is passed) and
+    revalidated on the next GET of the same URL; a 304 returns the cached,
+    already-decoded result. Results may be shared between calls, so callers
+    must not modify them.
+    """
 
-    def __init__(self, base_url: str, timeout: int = 600, poll_interval: int = 15):
+    def __init__(
+        self,
+        base_url: str,
+        timeout: int = 600,
+        poll_interval: int = 15,
+        cancel_token: CancelToken | None = None,
+        cache: ResponseCache | None = None,
+    ):
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.poll_interval = poll_interval
+        self.cancel_token = cancel_token
+        self.cache = cache or ResponseCache()
+        # Library use: profile the process when BOUNTY_PIPELINE_PROFILE is set (see profiling.py)
+        profiling.start_from_env("services")
+
+    def wait(self, seconds: float) -> None:
+        """Sleep between polls, waking early with Cancelled if the run is cancelled."""
+        cancel.sleep(seconds, self.cancel_token)
 
     def health_check(self) -> tuple[bool, str]:
         """Check if the service is healthy."""
@@ -28,16 +65,42 @@ class RESTServiceClient:
         except Exception as e:
             return False, str(e)
 
-    def get_json(self, path: str, params: dict | None = None) -> dict:
-        """GET a JSON endpoint."""
+    def _url(self, path: str, params: dict | None = None) -> str:
         url = f"{self.base_url}{path}"
         if params:
             query = "&".join(f"{k}={v}" for k, v in params.items())
             url = f"{url}?{query}"
+        return url
+
+    def _conditional_get(self, url: str, timeout: int, attrs: dict) -> CachedResponse:
+        """GET a URL, revalidating the cached response if there is one."""
+        cached = self.cache.get(url)
         req = Request(url, method="GET")
         req.add_header("Accept", "application/json")
-        with urlopen(req, timeout=30) as resp:
-            return json.loads(resp.read().decode())
+        for name, value in (cached.headers() if cached else {}).items():
+            req.add_header(name, value)
+        try:
+            with urlopen(req, timeout=timeout) as resp:
+                body = resp.read()
+                response = CachedResponse(resp.headers.get("ETag"), resp.headers.get("Last-Modified"), body)
+            attrs["status"] = resp.status
+        except HTTPError as e:
+            if e.code != 304 or cached is None:
+                raise
+            e.close()
+            attrs["status"] = 304
+            attrs["cached"] = True
+            self.cache.record(hit=True)
+            return cached
+        attrs["bytes"] = len(body)
+        self.cache.record(hit=False)
+        self.cache.store(url, response)
+        return response
+
+    def get_json(self, path: str, params: dict | None = None) -> dict:
+        """GET a JSON endpoint (conditionally, see the class docstring)."""
+        with tracing.span("rest", f"GET {path}", service=self.base_url) as attrs:
+            return self._conditional_get(self._url(path, params), 30, attrs).json()
 
     def post_json(self, path: str, data: dict) -> dict:
         """POST JSON to an endpoint."""
@@ -46,20 +109,17 @@ class RESTServiceClient:
         req = Request(url, data=body, method="POST")
         req.add_header("Content-Type", "application/json")
         req.add_header("Accept", "application/json")
-        with urlopen(req, timeout=30) as resp:
-            return json.loads(resp.read().decode())
+        with tracing.span("rest", f"POST {path}", service=self.base_url) as attrs:
+            with urlopen(req, timeout=30) as resp:
+                body = resp.read()
+            attrs["status"] = resp.status
+            return json.loads(body.decode())
 
     def download_json(self, path: str, dest: Path, params: dict | None = None) -> Path:
-        """Download a JSON response to a file."""
-        url = f"{self.base_url}{path}"
-        if params:
-            query = "&".join(f"{k}={v}" for k, v in params.items())
-            url = f"{url}?{query}"
-        req = Request(url, method="GET")
-        req.add_header("Accept", "application/json")
-        with urlopen(req, timeout=60) as resp:
-            data = resp.read()
-        dest.write_bytes(data)
+        """Download a JSON response to a file (conditionally, see the class docstring)."""
+        with tracing.span("rest", f"GET {path}", service=self.base_url, dest=str(dest)) as attrs:
+            response = self._conditional_get(self._url(path, params), 60, attrs)
+        dest.write_bytes(response.body)
         return dest
 
     def poll_until_complete(
@@ -74,42 +134,90 @@ class RESTServiceClient:
         Returns the final response data.
         Raises TimeoutError if the timeout is exceeded.
         Raises RuntimeError if an error status is reached.
+        Raises cancel.Cancelled if the run is cancelled while waiting.
         """
         if target_values is None:
             target_values = ["completed", "finished", "done"]
         if error_values is None:
             error_values = ["failed", "error"]
 
-        start = time.time()
-        while time.time() - start < self.timeout:
-            data = self.get_json(path)
-            status = data.get(check_field, "")
-            if status in target_values:
-                return data
-            if status in error_values:
-                raise RuntimeError(f"Service returned error status: {status}. Response: {data}")
-            time.sleep(self.poll_interval)
+        with tracing.span("poll", path, service=self.base_url) as attrs:
+            attrs["polls"] = 0
+            start = time.time()
+            while time.time() - start < self.timeout:
+                data = self.get_json(path)
+                attrs["polls"] += 1
+                status = data.get(check_field, "")
+                attrs["status"] = status
+                if status in target_values:
+                    return data
+                if status in error_values:
+                    raise RuntimeError(f"Service returned error status: {status}. Response: {data}")
+                self.wait(self.poll_interval)
 
-        raise TimeoutError(f"Polling {path} timed out after {self.timeout}s (last status: {status})")
+            raise TimeoutError(f"Polling {path} timed out after {self.timeout}s (last status: {status})")
 
 
 class CLIToolWrapper:
-    """Base wrapper for CLI tools."""
+    """Base wrapper for CLI tools.
+
+    If bound to a workspace, every run's resource usage is appended to the
+    workspace's tool-usage.jsonl. The most recent usage is also kept in
+    last_usage.
+
+    Each run gets its own process group, so when the run is cancelled (see
+    cancel.py) or times out, the tool and any children it spawned are killed.
+
+    Version and supported flags come from a ToolRegistry, which probes the
+    binary once per build; SUBCOMMANDS lists the subcommands whose --help is
+    probed too.
+    """
+
+    SUBCOMMANDS: list[str] = []
 
-    def __init__(self, binary_path: str):
+    def __init__(
+        self,
+        binary_path: str,
+        workspace: str | Path | None = None,
+        cancel_token: CancelToken | None = None,
+        registry: ToolRegistry | None = None,
+    ):
         self.binary_path = str(Path(binary_path).expanduser())
+        self.workspace = Path(workspace).expanduser() if workspace else None
+        self.cancel_token = cancel_token
+        self.registry = registry or ToolRegistry()
+        self.last_usage: dict | None = None
+        profiling.start_from_env("services")
+
+    @property
+    def tool_name(self) -> str:
+        return Path(self.binary_path).name
 
     def check_installed(self) -> bool:
         """Check if the tool binary exists and is executable."""
         path = Path(self.binary_path)
         return path.exists() and path.is_file() and bool(path.stat().st_mode & 0o111)
 
+    def capabilities(self) -> dict | None:
+        """Cached version and flags of the installed binary (None if it is missing)."""
+        return self.registry.probe(self.binary_path, self.SUBCOMMANDS)
+
     def version(self) -> str:
         """Get the tool version string."""
-        rc, stdout, stderr = self.run(["--version"])
-        if rc == 0:
-            return stdout.strip()
-        return f"unknown (exit {rc})"
+        caps = self.capabilities()
+        return caps["version"] if caps else "unknown (not installed)"
+
+    def supports(self, flag: str, subcommand: str = "") -> bool:
+        """Whether the installed tool's help lists a flag (for the subcommand, or top level).
+
+        Assumes support when the help output could not be parsed, so flags
+        are only dropped for tools known not to accept them.
+        """
+        caps = self.capabilities()
+        if not caps:
+            return True
+        flags = caps["flags"].get(subcommand) or caps["flags"].get("")
+        return not flags or flag in flags
 
     def run(
         self,
@@ -121,23 +229,24 @@ class CLIToolWrapper:
         """Run the tool with arguments.
 
         Returns (returncode, stdout, stderr).
+        Raises cancel.Cancelled (after killing the tool) if the run is cancelled.
         """
-        import os
-
         cmd = [self.binary_path] + args
         run_env = os.environ.copy()
         if env:
             run_env.update(env)
 
-        result = subprocess.run(
-            cmd,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=timeout or 600,
-            env=run_env,
-        )
-        return result.returncode, result.stdout, result.stderr
+        name = f"{self.tool_name} {args[0]}" if args else self.tool_name
+        with tracing.span("subprocess", name, args=args) as attrs:
+            token = self.cancel_token or cancel.current()
+            returncode, stdout, stderr, run_usage = _run_measured(cmd, cwd, timeout or 600, run_env, token)
+            attrs["returncode"] = returncode
+            attrs.update(run_usage)
+
+        self.last_usage = run_usage
+        if self.workspace:
+            usage.record_usage(self.workspace, self.tool_name, args, returncode, run_usage)
+        return returncode, stdout, stderr
 
     def run_or_fail(
         self,
@@ -153,3 +262,88 @@ class CLIToolWrapper:
                 f"{self.binary_path} exited with code {rc}\nstdout: {stdout}\nstderr: {stderr}"
             )
         return stdout
+
+
+# Seconds a cancelled tool gets to exit after SIGTERM before SIGKILL
+TERMINATE_GRACE = 5.0
+
+
+def _kill_group(proc: subprocess.Popen, grace: float) -> None:
+    """Terminate a child's process group, escalating to SIGKILL after grace seconds, and reap it."""
+    try:
+        os.killpg(proc.pid, signal.SIGTERM if grace > 0 else signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    deadline = time.monotonic() + grace
+    while time.monotonic() < deadline:
+        if os.wait4(proc.pid, os.WNOHANG)[0]:
+            return
+        time.sleep(0.05)
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    os.wait4(proc.pid, 0)
+
+
+def _run_measured(
+    cmd: list[str],
+    cwd: str | Path | None,
+    timeout: float,
+    env: dict,
+    token: CancelToken | None = None,
+) -> tuple[int, str, str, dict]:
+    """Run a command like subprocess.run, also measuring its resource usage.
+
+    The child is reaped with os.wait4 to get its own rusage (CPU, peak RSS,
+    block I/O) rather than the aggregate of all children. /proc/<pid>/io is
+    sampled while it runs, since it disappears once the process exits.
+
+    Raises subprocess.TimeoutExpired if the timeout is exceeded.
+    Raises cancel.Cancelled if the token is cancelled while the command runs.
+    """
+    proc = subprocess.Popen(
+        cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, env=env, start_new_session=True
+    )
+    output: dict[str, str] = {}
+
+    def drain(name: str, stream) -> None:
+        output[name] = stream.read()
+        stream.close()
+
+    readers = [
+        threading.Thread(target=drain, args=("stdout", proc.stdout), daemon=True),
+        threading.Thread(target=drain, args=("stderr", proc.stderr), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    start = time.perf_counter()
+    proc_io = None
+    delay = 0.001
+    while True:
+        pid, status, rusage = os.wait4(proc.pid, os.WNOHANG)
+        if pid:
+            break
+        proc_io = usage.read_proc_io(proc.pid) or proc_io
+        if time.perf_counter() - start > timeout:
+            _kill_group(proc, 0)
+            proc.returncode = -9
+            for reader in readers:
+                reader.join()
+            raise subprocess.TimeoutExpired(cmd, timeout, output.get("stdout"), output.get("stderr"))
+        if token is not None and token.is_cancelled():
+            _kill_group(proc, TERMINATE_GRACE)
+            proc.returncode = -signal.SIGTERM
+            for reader in readers:
+                reader.join()
+            raise cancel.Cancelled(token.reason or "cancelled")
+        time.sleep(delay)
+        delay = min(delay * 2, 0.05)
+
+    wall = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    for reader in readers:
+        reader.join()
+    run_usage = usage.usage_from_rusage(rusage, wall, proc_io)
+    return proc.returncode, output.get("stdout", ""), output.get("stderr", ""), run_usage
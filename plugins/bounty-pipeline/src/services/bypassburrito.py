@@ -12,6 +12,8 @@ from services.base import CLIToolWrapper
 class BypassBurritoClient(CLIToolWrapper):
     """Wrapper for the BypassBurrito WAF bypass CLI."""
 
+    SUBCOMMANDS = ["bypass", "detect"]
+
     def bypass(
         self,
         from_indago: str | None = None,
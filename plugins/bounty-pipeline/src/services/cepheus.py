@@ -12,6 +12,8 @@ from services.base import CLIToolWrapper
 class CepheusClient(CLIToolWrapper):
     """Wrapper for the Cepheus container escape CLI."""
 
+    SUBCOMMANDS = ["analyze", "enumerate"]
+
     def analyze(
         self,
         posture_file: str,
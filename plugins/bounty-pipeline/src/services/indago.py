@@ -12,6 +12,8 @@ from services.base import CLIToolWrapper
 class IndagoClient(CLIToolWrapper):
     """Wrapper for the Indago API fuzzer CLI."""
 
+    SUBCOMMANDS = ["scan"]
+
     def scan(
         self,
         spec: str | None = None,
@@ -28,7 +30,8 @@ class IndagoClient(CLIToolWrapper):
     ) -> tuple[int, str, str]:
         """Run an Indago API security scan.
 
-        One of spec or targets_from is required.
+        One of spec or targets_from is required. Tuning flags the installed
+        Indago build does not list in `scan --help` are left out.
         """
         args = ["scan"]
 
@@ -41,9 +44,9 @@ class IndagoClient(CLIToolWrapper):
         args.extend(["-f", format])
         if export_waf_blocked:
             args.extend(["--export-waf-blocked", str(export_waf_blocked)])
-        if concurrency:
+        if concurrency and self.supports("--concurrency", "scan"):
             args.extend(["--concurrency", str(concurrency)])
-        if rate_limit:
+        if rate_limit and self.supports("--rate-limit", "scan"):
             args.extend(["--rate-limit", str(rate_limit)])
         if timeout:
             args.extend(["--timeout", timeout])
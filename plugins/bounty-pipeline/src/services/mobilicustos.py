@@ -27,6 +27,10 @@ class MobilicustosClient(RESTServiceClient):
             "scan_type": scan_type,
         })
 
+    def get_scan(self, scan_id: str) -> dict:
+        """Get the current scan object (status, progress)."""
+        return self.get_json(f"/api/scans/{scan_id}")
+
     def poll_scan(self, scan_id: str) -> dict:
         """Poll until the scan completes. Returns final scan data."""
         return self.poll_until_complete(
@@ -13,19 +13,35 @@ from services.base import RESTServiceClient
 class NubicustosClient(RESTServiceClient):
     """Client for the Nubicustos cloud security service."""
 
-    def create_scan(self, target: str, profile: str = "comprehensive") -> dict:
+    def create_scan(
+        self,
+        target: str,
+        profile: str = "comprehensive",
+        accounts: list[str] | None = None,
+        regions: list[str] | None = None,
+    ) -> dict:
         """Create a new cloud security scan.
 
         Args:
             target: Cloud target identifier (AWS account, Azure sub, etc.).
             profile: Scan profile — "quick", "standard", or "comprehensive".
+            accounts: Limit the scan to these accounts / subscriptions.
+            regions: Limit the scan to these regions.
 
         Returns the created scan object including scan_id.
         """
-        return self.post_json("/api/scans/", {
+        payload = {
             "target": target,
             "profile": profile,
-        })
+        }
+        scope = {k: v for k, v in (("accounts", accounts), ("regions", regions)) if v}
+        if scope:
+            payload["scope"] = scope
+        return self.post_json("/api/scans/", payload)
+
+    def get_scan(self, scan_id: str) -> dict:
+        """Get the current scan object (status, progress)."""
+        return self.get_json(f"/api/scans/{scan_id}")
 
     def poll_scan(self, scan_id: str) -> dict:
         """Poll until the scan completes. Returns final scan data."""
@@ -1,9 +1,12 @@
 """Reticustos service client — network reconnaissance.
 
 REST API client for the Reticustos Docker service.
-Handles: target registration, scan execution, polling, endpoint export.
+Handles: target registration, scan execution, polling, endpoint export,
+and incremental endpoint streaming while a scan is still running.
 """
 
+import time
+from collections.abc import Iterator
 from pathlib import Path
 
 from services.base import RESTServiceClient
@@ -32,6 +35,56 @@ class ReticustosClient(RESTServiceClient):
             error_values=["failed", "error", "cancelled"],
         )
 
+    def get_scan(self, scan_id: str) -> dict:
+        """Get the current scan object (status, progress)."""
+        return self.get_json(f"/api/scans/{scan_id}")
+
+    def get_endpoints(self, scan_id: str) -> list[dict]:
+        """Get the endpoints discovered so far for a scan.
+
+        Works for in-progress scans; the export reflects what has been
+        discovered at the time of the call.
+        """
+        data = self.get_json("/api/exports/endpoints", params={"scan_id": scan_id})
+        if isinstance(data, list):
+            return data
+        return data.get("endpoints", [])
+
+    def stream_endpoints(self, scan_id: str) -> Iterator[list[dict]]:
+        """Yield newly discovered endpoints on every poll until the scan completes.
+
+        Pulls the endpoint export every poll_interval while the scan runs and
+        yields only endpoints not seen in a previous pull (an empty list when
+        nothing new turned up, so consumers can act on elapsed time). The pull
+        made once the scan reports completion catches late discoveries.
+
+        Raises TimeoutError if the timeout is exceeded.
+        Raises RuntimeError if the scan reaches an error status.
+        Raises cancel.Cancelled if the run is cancelled while waiting.
+        """
+        seen: set[str] = set()
+        start = time.time()
+        status = ""
+        while time.time() - start < self.timeout:
+            status = self.get_scan(scan_id).get("status", "")
+            if status in ("failed", "error", "cancelled"):
+                raise RuntimeError(f"Reticustos scan {scan_id} ended with status: {status}")
+
+            new = []
+            for endpoint in self.get_endpoints(scan_id):
+                key = endpoint_key(endpoint)
+                if key not in seen:
+                    seen.add(key)
+                    new.append(endpoint)
+            yield new
+            if status == "completed":
+                return
+            self.wait(self.poll_interval)
+
+        raise TimeoutError(
+            f"Streaming endpoints for scan {scan_id} timed out after {self.timeout}s (last status: {status})"
+        )
+
     def get_findings(self, scan_id: str) -> dict:
         """Get scan findings."""
         return self.get_json(f"/api/scans/{scan_id}/findings")
@@ -53,3 +106,10 @@ class ReticustosClient(RESTServiceClient):
         import json
         output_path.write_text(json.dumps(findings, indent=2))
         return output_path
+
+
+def endpoint_key(endpoint: dict) -> str:
+    """Identity of an exported endpoint, used to detect new discoveries."""
+    method = str(endpoint.get("method", "GET")).upper()
+    url = endpoint.get("url") or f"{endpoint.get('host', '')}{endpoint.get('path', '')}"
+    return f"{method} {url}"
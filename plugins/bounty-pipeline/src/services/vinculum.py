@@ -12,6 +12,8 @@ from services.base import CLIToolWrapper
 class VinculumClient(CLIToolWrapper):
     """Wrapper for the Vinculum correlation engine CLI."""
 
+    SUBCOMMANDS = ["ingest", "stats"]
+
     def ingest(
         self,
         files: list[str],
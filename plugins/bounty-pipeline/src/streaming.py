@@ -0,0 +1,173 @@
+"""Streaming recon-to-fuzz handoff for bounty-pipeline.
+
+In `web` mode api-fuzz normally waits for the whole Reticustos scan to finish.
+This module overlaps the two: endpoints discovered so far are pulled from
+Reticustos while the scan runs and fed to Indago in micro-batches, so the first
+fuzzing findings arrive minutes into recon instead of after it.
+
+Streamed endpoints are canonicalized (see endpoints.py) as they arrive, so
+endpoints that only differ in IDs or query order are fuzzed once.
+
+Batch inputs and reports live under <workspace>/indago-batches/ so Vinculum's
+`*-report.json` glob only sees the merged indago-report.json / waf-blocked.json.
+"""
+
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from cancel import Cancelled
+from endpoints import EndpointCanonicalizer, canonicalize_file
+from reports import load_json, merge_reports, write_json
+from services.indago import IndagoClient
+from services.reticustos import ReticustosClient
+
+BATCH_DIR = "indago-batches"
+
+
+def _run_batch(
+    indago: IndagoClient,
+    batch_dir: Path,
+    index: int,
+    endpoints: list[dict],
+    scan_kwargs: dict,
+) -> dict:
+    """Write one micro-batch of endpoints and fuzz it with Indago.
+
+    A batch that times out or otherwise fails is returned with returncode -1,
+    so the batches around it are still merged. Cancellation propagates.
+    """
+    prefix = batch_dir / f"batch-{index:03d}"
+    targets = write_json(f"{prefix}-endpoints.json", {"export_source": "reticustos", "endpoints": endpoints})
+    report = Path(f"{prefix}-report.json")
+    waf_blocked = Path(f"{prefix}-waf-blocked.json")
+
+    started = time.time()
+    try:
+        rc, _, stderr = indago.scan(
+            targets_from=str(targets),
+            output=str(report),
+            export_waf_blocked=str(waf_blocked),
+            **scan_kwargs,
+        )
+    except Cancelled:
+        raise
+    except Exception as e:
+        rc, stderr = -1, f"{type(e).__name__}: {e}"
+    return {
+        "batch": index,
+        "endpoints": len(endpoints),
+        "returncode": rc,
+        "stderr": stderr.strip()[-500:] if rc != 0 else "",
+        "duration": round(time.time() - started, 2),
+        "report": str(report),
+        "waf_blocked": str(waf_blocked),
+    }
+
+
+def merge_batch_outputs(workspace: Path, batches: list[dict]) -> dict:
+    """Merge per-batch Indago outputs into indago-report.json and waf-blocked.json."""
+    ok = [b for b in batches if b["returncode"] == 0]
+    report = merge_reports([load_json(b["report"], {}) for b in ok])
+    waf_blocked = merge_reports([load_json(b["waf_blocked"], {}) for b in ok])
+    waf_blocked.setdefault("total_blocked", len(waf_blocked.get("targets", [])))
+    write_json(workspace / "indago-report.json", report)
+    write_json(workspace / "waf-blocked.json", waf_blocked)
+    return {"report": report, "waf_blocked": waf_blocked}
+
+
+def stream_fuzz(
+    reticustos: ReticustosClient,
+    indago: IndagoClient,
+    scan_id: str,
+    workspace: Path,
+    batch_size: int = 50,
+    max_batch_wait: float = 60.0,
+    scan_kwargs: dict | None = None,
+    on_batch: Callable[[dict], None] | None = None,
+    canonical_samples: int | None = 1,
+) -> dict:
+    """Fuzz endpoints with Indago while the Reticustos scan is still running.
+
+    A batch is dispatched when batch_size endpoints are pending, or when the
+    oldest pending endpoint has waited max_batch_wait seconds. Indago batches
+    run one at a time in a background thread while polling continues.
+    Only canonical_samples endpoints per route template are fuzzed (None
+    fuzzes every endpoint as exported).
+
+    After the scan completes, the full endpoint export and findings are written
+    to the workspace as the recon-agent would, and batch outputs are merged.
+
+    Returns a summary dict with per-batch results and time-to-first-batch.
+    """
+    workspace = Path(workspace)
+    batch_dir = workspace / BATCH_DIR
+    batch_dir.mkdir(exist_ok=True)
+    scan_kwargs = scan_kwargs or {}
+    canonicalizer = EndpointCanonicalizer(canonical_samples) if canonical_samples else None
+
+    started = time.time()
+    pending: list[dict] = []
+    pending_since: float | None = None
+    batches: list[dict] = []
+    first_batch_done: float | None = None
+    running: Future | None = None
+
+    def collect(future: Future) -> None:
+        nonlocal first_batch_done
+        result = future.result()
+        batches.append(result)
+        if first_batch_done is None:
+            first_batch_done = time.time() - started
+        if on_batch:
+            on_batch(result)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+
+        def dispatch(endpoints: list[dict]) -> Future:
+            index = len(batches) + 1
+            return pool.submit(_run_batch, indago, batch_dir, index, endpoints, scan_kwargs)
+
+        for new in reticustos.stream_endpoints(scan_id):
+            if canonicalizer:
+                new = canonicalizer.add(new)
+            if new and not pending:
+                pending_since = time.time()
+            pending.extend(new)
+
+            if running is not None and running.done():
+                collect(running)
+                running = None
+
+            waited = time.time() - pending_since if pending_since is not None else 0.0
+            if running is None and pending and (len(pending) >= batch_size or waited >= max_batch_wait):
+                running = dispatch(pending[:batch_size])
+                pending = pending[batch_size:]
+                pending_since = time.time() if pending else None
+
+        # Recon finished: drain what is left in full-size batches.
+        while pending or running is not None:
+            if running is not None:
+                collect(running)
+                running = None
+            if pending:
+                running = dispatch(pending[:batch_size])
+                pending = pending[batch_size:]
+
+    reticustos.export_endpoints(scan_id, workspace / "reticustos-endpoints.json")
+    reticustos.export_findings(scan_id, workspace / "reticustos-findings.json")
+    if canonicalizer:
+        canonicalize_file(workspace / "reticustos-endpoints.json", samples=canonical_samples)
+    merged = merge_batch_outputs(workspace, batches)
+
+    return {
+        "scan_id": scan_id,
+        "batches": batches,
+        "endpoints_fuzzed": sum(b["endpoints"] for b in batches),
+        "canonicalization": canonicalizer.stats() if canonicalizer else None,
+        "failed_batches": [b["batch"] for b in batches if b["returncode"] != 0],
+        "waf_blocked": merged["waf_blocked"].get("total_blocked", 0),
+        "time_to_first_batch": round(first_batch_done, 2) if first_batch_done is not None else None,
+        "duration": round(time.time() - started, 2),
+    }
@@ -0,0 +1,165 @@
+"""Cached CLI tool capabilities.
+
+CLIToolWrapper.version() used to spawn the tool on every call, and nothing
+remembered which flags an installed tool version accepts. The registry probes
+each binary once, running `--version` and `--help` (and `<subcommand> --help`
+for the subcommands its wrapper uses), and caches the version and parsed flags
+on disk keyed by the binary's resolved path, mtime and size. A rebuilt or
+upgraded binary changes the key and is probed again.
+
+The cache file lives next to the other caches under the workspace root's
+parent and is shared by concurrent orchestrator processes (flock-guarded).
+"""
+
+import fcntl
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from config import get_workspace_root
+
+REGISTRY_FILE = "tool-registry.json"
+
+# Seconds each probe command may run
+PROBE_TIMEOUT = 15
+
+# Long and short options as printed in --help output
+FLAG_PATTERN = re.compile(r"(?<![\w-])(--[A-Za-z0-9][\w-]*|-[A-Za-z])(?![\w-])")
+
+_thread_lock = threading.Lock()
+
+
+def fingerprint(binary_path: str | Path) -> str | None:
+    """Identity of an installed binary (resolved path, mtime, size), or None if missing."""
+    try:
+        real = os.path.realpath(Path(binary_path).expanduser())
+        st = os.stat(real)
+    except OSError:
+        return None
+    return f"{real}|{st.st_mtime_ns}|{st.st_size}"
+
+
+def parse_flags(help_text: str) -> list[str]:
+    """Extract the option names listed in a tool's help output."""
+    return sorted(set(FLAG_PATTERN.findall(help_text)))
+
+
+def _probe_command(cmd: list[str]) -> tuple[int, str]:
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=PROBE_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        return -1, str(e)
+    return result.returncode, result.stdout + result.stderr
+
+
+class ToolRegistry:
+    """Probe-once cache of tool versions and supported flags.
+
+    Args:
+        path: Cache file, or None to cache in memory only.
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path).expanduser() if path else None
+        self._memory: dict[str, dict] = {}
+        self.probes = 0
+
+    @classmethod
+    def for_config(cls, config: dict) -> "ToolRegistry":
+        """Registry shared by all runs under the configured workspace root."""
+        return cls(get_workspace_root(config).parent / "cache" / REGISTRY_FILE)
+
+    @contextmanager
+    def _locked(self):
+        """Read the cache file under an exclusive lock and write it back on exit."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with _thread_lock, open(self.path.with_suffix(".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                try:
+                    data = json.loads(self.path.read_text())
+                except (OSError, ValueError):
+                    data = {}
+                yield data
+                tmp = self.path.with_suffix(".tmp")
+                tmp.write_text(json.dumps(data, indent=2))
+                tmp.replace(self.path)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _read(self, key: str) -> dict | None:
+        if key in self._memory:
+            return self._memory[key]
+        if self.path is None or not self.path.exists():
+            return None
+        try:
+            entry = json.loads(self.path.read_text()).get(key)
+        except (OSError, ValueError):
+            return None
+        if entry:
+            self._memory[key] = entry
+        return entry
+
+    def lookup(self, binary_path: str | Path) -> dict | None:
+        """Cached capabilities for the binary as installed now, without probing."""
+        key = fingerprint(binary_path)
+        return self._read(key) if key else None
+
+    def probe(
+        self,
+        binary_path: str | Path,
+        subcommands: list[str] | None = None,
+        refresh: bool = False,
+    ) -> dict | None:
+        """Capabilities of a binary, probing it only if not cached for its current fingerprint.
+
+        Returns {version, flags: {"" | subcommand: [flags]}, probed_at}, or
+        None if the binary does not exist.
+        """
+        key = fingerprint(binary_path)
+        if key is None:
+            return None
+        entry = None if refresh else self._read(key)
+        if entry is not None and all(sub in entry["flags"] for sub in subcommands or []):
+            return entry
+
+        binary = str(Path(binary_path).expanduser())
+        self.probes += 1
+        rc, out = _probe_command([binary, "--version"])
+        flags = {}
+        for sub in ["", *(subcommands or [])]:
+            _, help_text = _probe_command([binary, *([sub] if sub else []), "--help"])
+            flags[sub] = parse_flags(help_text)
+        entry = {
+            "version": out.strip().splitlines()[0] if rc == 0 and out.strip() else f"unknown (exit {rc})",
+            "flags": flags,
+            "probed_at": time.time(),
+        }
+        self._memory[key] = entry
+        if self.path is not None:
+            real = key.split("|", 1)[0]
+            with self._locked() as data:
+                # Drop entries for older builds of the same binary.
+                for old in [k for k in data if k.split("|", 1)[0] == real]:
+                    del data[old]
+                data[key] = entry
+        return entry
+
+    def entries(self) -> dict[str, dict]:
+        """All cached entries, keyed by fingerprint."""
+        if self.path is None or not self.path.exists():
+            return dict(self._memory)
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def clear(self) -> None:
+        self._memory.clear()
+        if self.path is not None and self.path.exists():
+            self.path.unlink()
@@ -0,0 +1,314 @@
+"""Run tracing for bounty-pipeline.
+
+Records nested timing spans (run -> phase -> agent -> REST call / subprocess /
+poll) to <workspace>/trace.jsonl, one JSON object per line. Spans are written
+when they close, so a trace from a crashed run still holds everything that
+finished.
+
+Two record types are written:
+  {"type": "span", ...}  timed in-process operations (service clients, tools)
+  {"type": "mark", ...}  start/end events from separate processes, e.g. the
+                         /bounty command marking phase and agent boundaries
+
+Tracing is off unless a trace file is configured, either with configure() or
+through the BOUNTY_PIPELINE_TRACE_FILE environment variable (for library use of
+the service clients). When off, span() costs a single lookup.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+TRACE_FILE = "trace.jsonl"
+TRACE_ENV = "BOUNTY_PIPELINE_TRACE_FILE"
+
+# Nesting order used to re-parent spans recorded by different processes.
+KIND_RANK = {"run": 0, "phase": 1, "agent": 2, "command": 3}
+
+_current_span: ContextVar[str | None] = ContextVar("bounty_pipeline_span", default=None)
+_write_lock = threading.Lock()
+_trace_path: Path | None = None
+
+
+def configure(path: str | Path | None) -> Path | None:
+    """Enable tracing to a file, or a workspace's trace.jsonl if given a directory.
+
+    Passing None disables tracing (unless the environment variable is set).
+    """
+    global _trace_path
+    if path is None:
+        _trace_path = None
+        return None
+    path = Path(path).expanduser()
+    _trace_path = path / TRACE_FILE if path.is_dir() else path
+    return _trace_path
+
+
+def get_trace_path() -> Path | None:
+    """Return the active trace file, if tracing is enabled."""
+    if _trace_path is not None:
+        return _trace_path
+    env_path = os.environ.get(TRACE_ENV)
+    return Path(env_path).expanduser() if env_path else None
+
+
+def _write(record: dict, path: Path | None = None) -> None:
+    path = path or get_trace_path()
+    if path is None:
+        return
+    line = json.dumps(record, default=str) + "\n"
+    with _write_lock:
+        with open(path, "a") as f:
+            f.write(line)
+
+
+@contextmanager
+def span(kind: str, name: str, **attrs):
+    """Time a block of work as a span nested under the current span.
+
+    Yields the attrs dict so the block can attach results (status codes,
+    counts) before the span is written.
+    """
+    path = get_trace_path()
+    if path is None:
+        yield attrs
+        return
+
+    span_id = os.urandom(8).hex()
+    parent = _current_span.get()
+    token = _current_span.set(span_id)
+    start = time.time()
+    t0 = time.perf_counter()
+    error = None
+    try:
+        yield attrs
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        record = {
+            "type": "span",
+            "id": span_id,
+            "parent": parent,
+            "kind": kind,
+            "name": name,
+            "start": start,
+            "duration": time.perf_counter() - t0,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "attrs": attrs,
+        }
+        if error:
+            record["error"] = error[:500]
+        _write(record, path)
+
+
+def mark(workspace: str | Path, kind: str, name: str, event: str, **attrs) -> None:
+    """Record a start/end boundary for work traced from outside this process."""
+    if event not in ("start", "end"):
+        raise ValueError(f"Unknown mark event: {event}. Valid: ['start', 'end']")
+    record = {"type": "mark", "kind": kind, "name": name, "event": event, "ts": time.time(), "attrs": attrs}
+    _write(record, Path(workspace).expanduser() / TRACE_FILE)
+
+
+def load_spans(trace_file: str | Path) -> list[dict]:
+    """Load a trace file into a flat list of spans with resolved parents.
+
+    Start/end marks are paired into spans (an unmatched start is closed at the
+    last timestamp in the trace). Spans without an in-process parent are
+    attached to the innermost enclosing span of a higher-level kind.
+    """
+    with open(trace_file) as f:
+        return parse_spans(f)
+
+
+def load_workspace_spans(workspace: str | Path) -> list[dict] | None:
+    """Spans of a run's trace, from its directory or archive; None without a trace."""
+    from archive import read_member
+
+    data = read_member(workspace, TRACE_FILE)
+    return parse_spans(data.decode(errors="replace").splitlines()) if data is not None else None
+
+
+def parse_spans(lines) -> list[dict]:
+    """Spans from trace.jsonl lines (see load_spans)."""
+    spans: list[dict] = []
+    open_marks: dict[tuple[str, str], list[dict]] = {}
+    last_ts = 0.0
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            rec = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if rec.get("type") == "span":
+            rec["end"] = rec["start"] + rec["duration"]
+            spans.append(rec)
+            last_ts = max(last_ts, rec["end"])
+        elif rec.get("type") == "mark":
+            last_ts = max(last_ts, rec["ts"])
+            key = (rec["kind"], rec["name"])
+            if rec["event"] == "start":
+                open_marks.setdefault(key, []).append(rec)
+            elif open_marks.get(key):
+                begin = open_marks[key].pop()
+                spans.append(_span_from_marks(begin, rec["ts"], {**begin["attrs"], **rec["attrs"]}))
+
+    for pending in open_marks.values():
+        for begin in pending:
+            spans.append(_span_from_marks(begin, last_ts, {**begin["attrs"], "unfinished": True}))
+
+    _assign_parents(spans)
+    return spans
+
+
+def _span_from_marks(begin: dict, end_ts: float, attrs: dict) -> dict:
+    return {
+        "type": "span",
+        "id": f"mark-{os.urandom(6).hex()}",
+        "parent": None,
+        "kind": begin["kind"],
+        "name": begin["name"],
+        "start": begin["ts"],
+        "end": end_ts,
+        "duration": max(0.0, end_ts - begin["ts"]),
+        "pid": 0,
+        "tid": 0,
+        "attrs": attrs,
+    }
+
+
+def _assign_parents(spans: list[dict]) -> None:
+    ids = {s["id"] for s in spans}
+    containers = sorted(
+        (s for s in spans if s["kind"] in KIND_RANK),
+        key=lambda s: s["duration"],
+    )
+    for s in spans:
+        if s["parent"] in ids:
+            continue
+        rank = KIND_RANK.get(s["kind"], len(KIND_RANK))
+        s["parent"] = None
+        for c in containers:
+            if c is s or KIND_RANK[c["kind"]] >= rank:
+                continue
+            if c["start"] <= s["start"] and s["end"] <= c["end"] + 1e-3:
+                s["parent"] = c["id"]
+                break
+
+
+def _children(spans: list[dict]) -> dict[str | None, list[dict]]:
+    children: dict[str | None, list[dict]] = {}
+    for s in spans:
+        children.setdefault(s["parent"], []).append(s)
+    return children
+
+
+def critical_path(spans: list[dict]) -> list[tuple[int, dict]]:
+    """Return the critical path as (depth, span) pairs.
+
+    Starting from the root span (or the whole trace when several spans have
+    no parent), repeatedly takes the child that
+    finishes last, then the child that finishes last before that one started,
+    and so on, recursing into each — the chain of work that determined the
+    end-to-end duration.
+    """
+    if not spans:
+        return []
+    children = _children(spans)
+    roots = children.get(None, [])
+    if len(roots) == 1:
+        root = roots[0]
+    else:
+        start = min(s["start"] for s in roots)
+        end = max(s["end"] for s in roots)
+        root = {"id": "__trace__", "kind": "run", "name": "trace", "start": start, "end": end, "duration": end - start}
+        children["__trace__"] = roots
+
+    path: list[tuple[int, dict]] = []
+
+    def walk(node: dict, depth: int) -> None:
+        path.append((depth, node))
+        kids = sorted(children.get(node["id"], []), key=lambda s: s["end"], reverse=True)
+        chain = []
+        cursor = node["end"] + 1e-3
+        for kid in kids:
+            if kid["end"] <= cursor:
+                chain.append(kid)
+                cursor = kid["start"]
+        for kid in reversed(chain):
+            walk(kid, depth + 1)
+
+    walk(root, 0)
+    return path
+
+
+def slowest(spans: list[dict], limit: int = 10, kinds: set[str] | None = None) -> list[dict]:
+    """Return the longest spans, optionally restricted to some kinds."""
+    selected = [s for s in spans if kinds is None or s["kind"] in kinds]
+    return sorted(selected, key=lambda s: s["duration"], reverse=True)[:limit]
+
+
+def to_chrome_trace(spans: list[dict]) -> dict:
+    """Convert spans to Chrome trace-event JSON (chrome://tracing, Perfetto)."""
+    if not spans:
+        return {"traceEvents": []}
+    origin = min(s["start"] for s in spans)
+    events = []
+    for s in spans:
+        events.append({
+            "name": s["name"],
+            "cat": s["kind"],
+            "ph": "X",
+            "ts": round((s["start"] - origin) * 1e6),
+            "dur": round(s["duration"] * 1e6),
+            "pid": s["pid"],
+            "tid": s["tid"] if s["pid"] else KIND_RANK.get(s["kind"], 0),
+            "args": s.get("attrs", {}),
+        })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+_ID_SEGMENT = re.compile(r"/(?=[^/]*\d)[^/?]+")
+
+
+def _operation(span: dict) -> str:
+    """Low-cardinality operation name: path segments holding IDs become {id}."""
+    if span["kind"] in ("rest", "poll"):
+        return _ID_SEGMENT.sub("/{id}", span["name"])
+    return span["name"]
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def to_prometheus(spans: list[dict]) -> str:
+    """Render span durations as a Prometheus textfile-collector file."""
+    stats: dict[tuple[str, str], list[float]] = {}
+    for s in spans:
+        stats.setdefault((s["kind"], _operation(s)), []).append(s["duration"])
+
+    lines = [
+        "# HELP bounty_pipeline_span_duration_seconds Time spent in pipeline operations.",
+        "# TYPE bounty_pipeline_span_duration_seconds summary",
+    ]
+    for (kind, op), durations in sorted(stats.items()):
+        labels = f'kind="{_label(kind)}",operation="{_label(op)}"'
+        lines.append(f"bounty_pipeline_span_duration_seconds_sum{{{labels}}} {sum(durations):.6f}")
+        lines.append(f"bounty_pipeline_span_duration_seconds_count{{{labels}}} {len(durations)}")
+    lines.append("# HELP bounty_pipeline_span_duration_seconds_max Longest single operation.")
+    lines.append("# TYPE bounty_pipeline_span_duration_seconds_max gauge")
+    for (kind, op), durations in sorted(stats.items()):
+        labels = f'kind="{_label(kind)}",operation="{_label(op)}"'
+        lines.append(f"bounty_pipeline_span_duration_seconds_max{{{labels}}} {max(durations):.6f}")
+    return "\n".join(lines) + "\n"
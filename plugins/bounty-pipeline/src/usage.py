@@ -0,0 +1,152 @@
+"""Per-tool resource accounting for bounty-pipeline CLI subprocesses.
+
+Every CLIToolWrapper.run measures the child's wall time, user/sys CPU, peak RSS
+and bytes read/written. When the wrapper is bound to a workspace, each
+invocation is appended to <workspace>/tool-usage.jsonl. Aggregating those
+records across runs shows whether a tool is CPU-, memory-, I/O- or wait-bound
+and how many copies a host can run at once.
+"""
+
+import json
+import os
+import statistics
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+USAGE_FILE = "tool-usage.jsonl"
+
+
+def read_proc_io(pid: int) -> dict | None:
+    """Read /proc/<pid>/io counters (Linux only). Returns None if unavailable."""
+    try:
+        text = Path(f"/proc/{pid}/io").read_text()
+    except OSError:
+        return None
+    counters = {}
+    for line in text.splitlines():
+        key, _, value = line.partition(":")
+        if key in ("rchar", "wchar", "read_bytes", "write_bytes"):
+            counters[key] = int(value)
+    return counters
+
+
+def usage_from_rusage(rusage, wall: float, proc_io: dict | None) -> dict:
+    """Build a usage record from os.wait4 rusage and the last /proc io sample."""
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    max_rss_kb = rusage.ru_maxrss // 1024 if sys.platform == "darwin" else rusage.ru_maxrss
+    block_read = rusage.ru_inblock * 512
+    block_written = rusage.ru_oublock * 512
+    proc_io = proc_io or {}
+    return {
+        "wall": round(wall, 4),
+        "user_cpu": round(rusage.ru_utime, 4),
+        "sys_cpu": round(rusage.ru_stime, 4),
+        "max_rss_kb": max_rss_kb,
+        "read_bytes": max(block_read, proc_io.get("read_bytes", 0)),
+        "write_bytes": max(block_written, proc_io.get("write_bytes", 0)),
+        "rchar": proc_io.get("rchar"),
+        "wchar": proc_io.get("wchar"),
+    }
+
+
+def record_usage(workspace: str | Path, tool: str, args: list[str], returncode: int, usage: dict) -> None:
+    """Append one tool invocation to the workspace usage log."""
+    record = {
+        "tool": tool,
+        "command": args[0] if args else "",
+        "returncode": returncode,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        **usage,
+    }
+    with open(Path(workspace) / USAGE_FILE, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def load_usage(workspaces: list[Path]) -> list[dict]:
+    """Load usage records from several workspaces, archived or not."""
+    from archive import read_member
+
+    records = []
+    for ws in workspaces:
+        data = read_member(ws, USAGE_FILE)
+        if data is None:
+            continue
+        for line in data.decode(errors="replace").splitlines():
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _total_memory_kb() -> int | None:
+    try:
+        return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def classify(cpu_util: float, io_rate: float) -> str:
+    """Label what a tool spends its wall time on.
+
+    cpu_util is CPU seconds per wall second; io_rate is storage bytes per wall
+    second. Tools that neither compute nor touch disk are waiting on the
+    network or an LLM.
+    """
+    if cpu_util >= 0.7:
+        return "cpu-bound"
+    if io_rate >= 20 * 1024 * 1024:
+        return "io-bound"
+    return "wait-bound"
+
+
+def aggregate(records: list[dict]) -> dict:
+    """Aggregate usage records per tool and suggest a concurrency limit.
+
+    The suggestion is the number of simultaneous invocations that fit in the
+    host's CPUs (by mean CPU utilization) and memory (by p95 peak RSS).
+    """
+    cpus = os.cpu_count() or 1
+    memory_kb = _total_memory_kb()
+    by_tool: dict[str, list[dict]] = {}
+    for r in records:
+        by_tool.setdefault(r["tool"], []).append(r)
+
+    summary = {}
+    for tool, runs in sorted(by_tool.items()):
+        walls = [r["wall"] for r in runs]
+        cpu = [r["user_cpu"] + r["sys_cpu"] for r in runs]
+        rss = [r["max_rss_kb"] for r in runs]
+        io_bytes = [r["read_bytes"] + r["write_bytes"] for r in runs]
+        total_wall = sum(walls) or 1e-9
+        cpu_util = sum(cpu) / total_wall
+        io_rate = sum(io_bytes) / total_wall
+        rss_p95 = _percentile(rss, 95)
+
+        limits = [max(1, int(cpus / max(cpu_util, 0.05)))]
+        if memory_kb and rss_p95:
+            limits.append(max(1, int(memory_kb * 0.8 / rss_p95)))
+
+        summary[tool] = {
+            "runs": len(runs),
+            "failures": sum(1 for r in runs if r.get("returncode", 0) != 0),
+            "wall_p50": _percentile(walls, 50),
+            "wall_p95": _percentile(walls, 95),
+            "wall_max": max(walls),
+            "cpu_mean": statistics.fmean(cpu),
+            "cpu_util": cpu_util,
+            "max_rss_kb_p95": rss_p95,
+            "max_rss_kb_max": max(rss),
+            "read_bytes_mean": statistics.fmean(r["read_bytes"] for r in runs),
+            "write_bytes_mean": statistics.fmean(r["write_bytes"] for r in runs),
+            "bound": classify(cpu_util, io_rate),
+            "suggested_concurrency": min(limits),
+        }
+    return summary
@@ -3,16 +3,25 @@
 Each /bounty invocation creates a workspace at:
   ~/.bounty-pipeline/runs/<target>-<timestamp>/
 
-Contains all intermediate JSON files, enables resumability.
+Contains all intermediate JSON files, enables resumability. Finished runs
+can be packed into <target>-<timestamp>.zip (see archive.py); the loaders
+below read archived runs through the same workspace path.
 """
 
+import fcntl
 import json
+import os
 import re
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 
+from archive import ARCHIVE_SUFFIX, read_member_json, run_path
 from config import get_workspace_root
 
+# Serializes save_scan_handle between threads (the flock only excludes other processes)
+_scans_lock = threading.Lock()
+
 
 def _sanitize_target(target: str) -> str:
     """Sanitize target string for use as directory name."""
@@ -20,9 +29,10 @@ def _sanitize_target(target: str) -> str:
     return sanitized[:80]
 
 
-def create_workspace(config: dict, target: str, target_type: str) -> Path:
+def create_workspace(config: dict, target: str, target_type: str, abort_on: list[str] | None = None) -> Path:
     """Create a new run workspace directory.
 
+    abort_on overrides which agents' failures cancel the run (see cancel.py).
     Returns the workspace path.
     """
     root = get_workspace_root(config)
@@ -39,6 +49,8 @@ def create_workspace(config: dict, target: str, target_type: str) -> Path:
         "phases_completed": [],
         "workspace": str(workspace),
     }
+    if abort_on is not None:
+        meta["abort_on"] = abort_on
     (workspace / "run-meta.json").write_text(json.dumps(meta, indent=2))
 
     return workspace
@@ -47,10 +59,10 @@ def create_workspace(config: dict, target: str, target_type: str) -> Path:
 def load_workspace(workspace_path: str | Path) -> dict:
     """Load run metadata from an existing workspace."""
     path = Path(workspace_path)
-    meta_file = path / "run-meta.json"
-    if not meta_file.exists():
+    meta = read_member_json(path, "run-meta.json")
+    if meta is None:
         raise FileNotFoundError(f"No run-meta.json found in {path}")
-    return json.loads(meta_file.read_text())
+    return meta
 
 
 def update_workspace_status(workspace: Path, status: str, phase: str | None = None) -> None:
@@ -80,43 +92,76 @@ def save_checkpoint(workspace: Path, phase: str, data: dict) -> Path:
 
 def load_checkpoint(workspace: Path, phase: str) -> dict | None:
     """Load a phase checkpoint if it exists."""
+    return read_member_json(workspace, f"checkpoints/{phase}.json")
+
+
+def clear_checkpoint(workspace: Path, phase: str) -> bool:
+    """Remove a phase checkpoint. Returns whether there was one."""
     checkpoint_file = workspace / "checkpoints" / f"{phase}.json"
-    if checkpoint_file.exists():
-        return json.loads(checkpoint_file.read_text())
-    return None
+    if not checkpoint_file.exists():
+        return False
+    checkpoint_file.unlink()
+    return True
+
+
+def save_scan_handle(workspace: Path, service: str, handle: dict) -> Path:
+    """Persist a server-side scan handle (scan_id, target, state) for resumability.
+
+    Written atomically, immediately after the scan is created, so a crash at
+    any later point leaves a handle that --resume can reattach to. In `full`
+    runs several run-scan processes update the file at once, so the
+    read-merge-write holds an flock on scans.json.lock.
+    """
+    scans_file = workspace / "scans.json"
+    with _scans_lock, open(workspace / "scans.json.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            scans = json.loads(scans_file.read_text()) if scans_file.exists() else {}
+            scans[service] = {**scans.get(service, {}), **handle, "updated_at": datetime.now(timezone.utc).isoformat()}
+            tmp = scans_file.with_name(f"scans.json.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps(scans, indent=2))
+            os.replace(tmp, scans_file)
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+    return scans_file
+
+
+def load_scan_handle(workspace: Path, service: str) -> dict | None:
+    """Load the persisted scan handle for a service, if any."""
+    return read_member_json(workspace, "scans.json", {}).get(service)
+
+
+def iter_runs(root: Path):
+    """Workspace paths of the runs under root, newest name first, archived or not."""
+    if not root.exists():
+        return
+    for entry in sorted(root.iterdir(), key=lambda p: p.name.removesuffix(ARCHIVE_SUFFIX), reverse=True):
+        ws = run_path(entry)
+        if ws is not None:
+            yield ws
 
 
 def find_latest_workspace(config: dict, target: str | None = None) -> Path | None:
     """Find the most recent workspace, optionally filtered by target."""
-    root = get_workspace_root(config)
-    if not root.exists():
-        return None
-    workspaces = sorted(root.iterdir(), reverse=True)
-    for ws in workspaces:
-        if not ws.is_dir():
-            continue
+    for ws in iter_runs(get_workspace_root(config)):
         if target:
             safe = _sanitize_target(target)
             if not ws.name.startswith(safe):
                 continue
-        meta_file = ws / "run-meta.json"
-        if meta_file.exists():
+        if ws.is_dir():
+            if (ws / "run-meta.json").exists():
+                return ws
+        elif read_member_json(ws, "run-meta.json") is not None:
             return ws
     return None
 
 
 def list_workspaces(config: dict, limit: int = 10) -> list[dict]:
     """List recent workspaces with metadata."""
-    root = get_workspace_root(config)
-    if not root.exists():
-        return []
     results = []
-    for ws in sorted(root.iterdir(), reverse=True):
-        if not ws.is_dir():
-            continue
-        meta_file = ws / "run-meta.json"
-        if meta_file.exists():
-            meta = json.loads(meta_file.read_text())
+    for ws in iter_runs(get_workspace_root(config)):
+        meta = read_member_json(ws, "run-meta.json")
+        if meta is not None:
             meta["path"] = str(ws)
             results.append(meta)
             if len(results) >= limit:
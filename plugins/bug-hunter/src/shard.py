@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""Scope and shard engine for /bug-hunter:bughunt.
+
+Phase 0 of the bug hunt used to hand every hunter agent the same flat file
+list, so on a large repo each agent re-read thousands of files and the whole
+hunt waited on the slowest one. This builds the scope once, weighs each file
+and splits the scope into balanced shards, one hunter instance per shard:
+
+  1. Scope: changed files (`git diff --name-only` against HEAD~5, staged and
+     unstaged; the default) or every tracked source file (--full), either
+     one optionally limited to a path. Only source files are kept; vendored, generated,
+     minified and binary files are dropped.
+  2. Weight: per file, non-blank lines and branch points (if/for/while/case/
+     catch/&&/||, ...), a language-agnostic cyclomatic estimate. A file's
+     cost is lines + BRANCH_WEIGHT * branches, roughly the reading effort.
+  3. Agents: the core 3 plus the 2 conditional agents whose trigger words
+     match the most paths (all 8 with --thorough, only security-scanner with
+     --security), as in the bughunt command.
+  4. Shards: enough shards that none exceeds --max-files or --max-cost,
+     capped at --max-shards per agent. Files are assigned largest-first to
+     the least loaded shard (LPT), which keeps the slowest shard within 4/3
+     of the best possible split.
+
+The manifest (<out>/manifest.json) lists, per agent, its shards with their
+files, cost and line counts; each shard's file list is also written as
+<out>/<agent>-<n>.txt to paste into that instance's Task prompt.
+
+Usage:
+    python3 shard.py [--full] [--thorough | --security] [path] [--max-shards 4] [--out <dir>]
+"""
+
+import argparse
+import hashlib
+import heapq
+import json
+import math
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+CORE_AGENTS = ["logic-hunter", "error-handler", "edge-case-finder"]
+
+# Conditional agents and the path words that trigger them (see commands/bughunt.md)
+AGENT_TRIGGERS = {
+    "security-scanner": [
+        "auth", "login", "session", "token", "crypto", "password", "secret", "api", "route", "middleware",
+        "permission", "sanitize", "cors", "csrf", "cookie",
+    ],
+    "race-condition-detector": [
+        "async", "thread", "worker", "mutex", "lock", "channel", "concurrent", "parallel", "queue", "pool",
+        "transaction", "atomic",
+    ],
+    "resource-leak-hunter": [
+        "connection", "pool", "client", "stream", "socket", "file", "handle", "cursor", "session", "cache", "db",
+        "database", "http",
+    ],
+    "api-contract-checker": [
+        "api", "route", "endpoint", "handler", "controller", "schema", "type", "interface", "proto", "graphql",
+        "grpc", "openapi", "swagger",
+    ],
+    "state-bug-finder": [
+        "state", "store", "redux", "context", "cache", "component", "view", "model", "controller", "hook",
+        "reducer", "atom", "signal", "reactive",
+    ],
+}
+
+MAX_CONDITIONAL = 2
+
+SOURCE_EXTENSIONS = {
+    ".py", ".js", ".jsx", ".mjs", ".cjs", ".ts", ".tsx", ".vue", ".svelte", ".go", ".rs", ".java", ".kt", ".kts",
+    ".scala", ".groovy", ".rb", ".php", ".cs", ".fs", ".c", ".h", ".cc", ".cpp", ".cxx", ".hpp", ".m", ".mm",
+    ".swift", ".dart", ".lua", ".ex", ".exs", ".erl", ".clj", ".hs", ".ml", ".sh", ".bash", ".ps1", ".sql", ".pl",
+}
+
+EXCLUDE_DIRS = {
+    "node_modules", "vendor", "build", "dist", "out", "target", ".git", ".hg", ".svn", "__pycache__", ".venv",
+    "venv", ".tox", ".next", ".nuxt", "coverage", "bower_components", "third_party", "Pods",
+}
+
+# Generated or minified files nobody hunts bugs in
+EXCLUDE_PATTERNS = re.compile(r"(\.min\.\w+|\.pb\.go|_pb2(_grpc)?\.py|\.generated\.\w+|\.g\.dart|\.d\.ts)$")
+
+# Files above this size are almost always generated
+MAX_FILE_BYTES = 1024 * 1024
+
+BRANCH_PATTERN = re.compile(
+    r"\b(?:if|elif|elsif|for|foreach|while|until|unless|case|when|catch|except|rescue|guard)\b|&&|\|\||\band\b|\bor\b"
+)
+BRANCH_WEIGHT = 5
+
+DEFAULT_MAX_FILES = 40
+DEFAULT_MAX_COST = 8000
+DEFAULT_MAX_SHARDS = 4
+
+# git's empty tree, the diff base when a repo has fewer commits than the lookback
+EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+
+
+def _git(root: Path, *args: str) -> list[str] | None:
+    result = subprocess.run(["git", "-C", str(root), *args], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return [line for line in result.stdout.splitlines() if line]
+
+
+def repo_root(path: Path) -> Path:
+    """Top level of the git repository containing path, or path itself outside git."""
+    top = _git(path, "rev-parse", "--show-toplevel")
+    return Path(top[0]) if top else path
+
+
+def is_source(rel: str) -> bool:
+    parts = rel.split("/")
+    if any(part in EXCLUDE_DIRS for part in parts[:-1]):
+        return False
+    return Path(rel).suffix.lower() in SOURCE_EXTENSIONS and not EXCLUDE_PATTERNS.search(rel)
+
+
+def changed_files(root: Path, lookback: int = 5) -> list[str]:
+    """Files changed in the last `lookback` commits, staged or unstaged (repo-relative)."""
+    base = f"HEAD~{lookback}" if _git(root, "rev-parse", "--verify", "--quiet", f"HEAD~{lookback}") else EMPTY_TREE
+    files = set()
+    for args in (("diff", "--name-only", base), ("diff", "--name-only", "--cached"), ("diff", "--name-only")):
+        files.update(_git(root, *args) or [])
+    return sorted(files)
+
+
+def all_files(root: Path) -> list[str]:
+    """Every tracked and untracked-but-not-ignored file, or a directory walk outside git (repo-relative)."""
+    files = _git(root, "ls-files", "--cached", "--others", "--exclude-standard")
+    if files is not None:
+        return sorted(set(files))
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in EXCLUDE_DIRS]
+        rel_dir = Path(dirpath).relative_to(root)
+        found.extend((rel_dir / name).as_posix() for name in filenames)
+    return sorted(found)
+
+
+def build_scope(root: Path, full: bool = False, path: str | None = None) -> list[str]:
+    """Source files in scope, relative to root."""
+    files = all_files(root) if full else changed_files(root)
+    if path:
+        prefix = Path(path).resolve().relative_to(root.resolve()).as_posix()
+        if prefix != ".":
+            files = [f for f in files if f == prefix or f.startswith(prefix + "/")]
+    return [f for f in files if is_source(f) and (root / f).is_file()]
+
+
+def measure(root: Path, rel: str) -> dict | None:
+    """{path, bytes, lines, branches, cost} of a file, or None if it is binary or too large to be hand-written."""
+    path = root / rel
+    try:
+        size = path.stat().st_size
+        if size > MAX_FILE_BYTES:
+            return None
+        data = path.read_bytes()
+    except OSError:
+        return None
+    if b"\0" in data[:8192]:
+        return None
+    text = data.decode("utf-8", errors="replace")
+    lines = sum(1 for line in text.splitlines() if line.strip())
+    branches = len(BRANCH_PATTERN.findall(text))
+    return {"path": rel, "bytes": size, "lines": lines, "branches": branches, "cost": lines + BRANCH_WEIGHT * branches}
+
+
+def select_agents(files: list[str], thorough: bool = False, security: bool = False) -> tuple[list[str], dict]:
+    """Hunter agents for a scope, and each conditional agent's path match count."""
+    matches = {
+        agent: sum(1 for f in files if any(word in f.lower() for word in words))
+        for agent, words in AGENT_TRIGGERS.items()
+    }
+    if security:
+        return ["security-scanner"], matches
+    if thorough:
+        return CORE_AGENTS + list(AGENT_TRIGGERS), matches
+    ranked = sorted((a for a in AGENT_TRIGGERS if matches[a]), key=lambda a: -matches[a])
+    return CORE_AGENTS + ranked[:MAX_CONDITIONAL], matches
+
+
+def shard_count(files: list[dict], max_files: int, max_cost: int, max_shards: int) -> int:
+    """Shards needed so none exceeds max_files or max_cost, capped at max_shards."""
+    if not files:
+        return 0
+    total = sum(f["cost"] for f in files)
+    needed = max(math.ceil(len(files) / max_files), math.ceil(total / max_cost), 1)
+    return min(needed, max_shards, len(files))
+
+
+def balance(files: list[dict], shards: int) -> list[dict]:
+    """Split files into `shards` shards of near-equal cost (longest processing time first)."""
+    heap = [(0, index) for index in range(shards)]
+    buckets: list[list[dict]] = [[] for _ in range(shards)]
+    for f in sorted(files, key=lambda f: (-f["cost"], f["path"])):
+        load, index = heapq.heappop(heap)
+        buckets[index].append(f)
+        heapq.heappush(heap, (load + f["cost"], index))
+    result = []
+    for index, bucket in enumerate(buckets, 1):
+        bucket.sort(key=lambda f: f["path"])
+        result.append({
+            "shard": index,
+            "files": [f["path"] for f in bucket],
+            "cost": sum(f["cost"] for f in bucket),
+            "lines": sum(f["lines"] for f in bucket),
+        })
+    return result
+
+
+def default_out(root: Path) -> Path:
+    digest = hashlib.sha1(str(root).encode()).hexdigest()[:8]
+    return Path(tempfile.gettempdir()) / "bughunt" / f"{root.name}-{digest}"
+
+
+def write_manifest(out: Path, manifest: dict) -> Path:
+    """Write manifest.json and one <agent>-<n>.txt file list per shard, replacing earlier ones."""
+    out.mkdir(parents=True, exist_ok=True)
+    for stale in out.glob("*.txt"):
+        stale.unlink()
+    for agent in manifest["agents"]:
+        for shard in agent["shards"]:
+            path = out / f"{agent['agent']}-{shard['shard']}.txt"
+            path.write_text("".join(f"{f}\n" for f in shard["files"]))
+            shard["file_list"] = str(path)
+    path = out / "manifest.json"
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(manifest, indent=2))
+    os.replace(tmp, path)
+    return path
+
+
+def plan(
+    root: Path,
+    full: bool = False,
+    path: str | None = None,
+    thorough: bool = False,
+    security: bool = False,
+    max_files: int = DEFAULT_MAX_FILES,
+    max_cost: int = DEFAULT_MAX_COST,
+    max_shards: int = DEFAULT_MAX_SHARDS,
+) -> dict:
+    """Scope, weigh, select agents and shard. Returns the manifest."""
+    scope = build_scope(root, full, path)
+    files = [m for rel in scope if (m := measure(root, rel))]
+    skipped = sorted(set(scope) - {f["path"] for f in files})
+    agents, matches = select_agents([f["path"] for f in files], thorough, security)
+    shards = balance(files, shard_count(files, max_files, max_cost, max_shards))
+    total = sum(f["cost"] for f in files)
+    largest = max((s["cost"] for s in shards), default=0)
+    return {
+        "root": str(root),
+        "mode": "full" if full else "diff",
+        "path": path,
+        "files": len(files),
+        "lines": sum(f["lines"] for f in files),
+        "cost": total,
+        "skipped": skipped,
+        "agent_matches": matches,
+        "shards_per_agent": len(shards),
+        # 1.0 means every shard carries the same cost
+        "balance": round(largest / (total / len(shards)), 3) if shards and total else None,
+        "agents": [{"agent": agent, "shards": [dict(s) for s in shards]} for agent in agents],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the bug hunt scope and shard it across hunter agents")
+    parser.add_argument("path", nargs="?", help="Limit the scope to this directory")
+    parser.add_argument("--full", action="store_true", help="All source files, not just recently changed ones")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--thorough", action="store_true", help="All 8 hunter agents")
+    mode.add_argument("--security", action="store_true", help="Only security-scanner")
+    parser.add_argument("--max-files", type=int, default=DEFAULT_MAX_FILES, help="Target max files per shard")
+    parser.add_argument("--max-cost", type=int, default=DEFAULT_MAX_COST, help="Target max cost per shard")
+    parser.add_argument("--max-shards", type=int, default=DEFAULT_MAX_SHARDS, help="Max instances per agent")
+    parser.add_argument("--out", help="Manifest directory (default: <tmp>/bughunt/<repo>-<hash>)")
+    args = parser.parse_args()
+
+    root = repo_root(Path.cwd())
+    if args.path and not Path(args.path).exists():
+        print(f"Path not found: {args.path}")
+        sys.exit(1)
+    try:
+        manifest = plan(
+            root, args.full, args.path, args.thorough, args.security,
+            max_files=args.max_files, max_cost=args.max_cost, max_shards=args.max_shards,
+        )
+    except ValueError:
+        print(f"Path is outside the repository at {root}: {args.path}")
+        sys.exit(1)
+    if not manifest["files"]:
+        print(f"No source files in scope ({manifest['mode']} mode{', ' + args.path if args.path else ''}).")
+        print(f"\n__SHARDS_JSON__:{json.dumps({'files': 0, 'agents': []})}")
+        return
+
+    out = write_manifest(Path(args.out).expanduser() if args.out else default_out(root), manifest)
+    print(f"Scope: {manifest['mode']} mode, {manifest['files']} files, {manifest['lines']:,} lines "
+          f"(cost {manifest['cost']:,})" + (f", {len(manifest['skipped'])} skipped" if manifest["skipped"] else ""))
+    print("Trigger matches: " + ", ".join(f"{a} {n}" for a, n in manifest["agent_matches"].items()))
+    print(f"Agents: {', '.join(a['agent'] for a in manifest['agents'])}")
+    print(f"Shards per agent: {manifest['shards_per_agent']} (slowest shard {manifest['balance']}x the mean)")
+    for shard in manifest["agents"][0]["shards"]:
+        print(f"  shard {shard['shard']}: {len(shard['files'])} files, {shard['lines']:,} lines, "
+              f"cost {shard['cost']:,}")
+    print(f"Manifest: {out}")
+    summary = {k: manifest[k] for k in ("files", "shards_per_agent", "balance")}
+    summary["agents"] = [a["agent"] for a in manifest["agents"]]
+    summary["manifest"] = str(out)
+    print(f"\n__SHARDS_JSON__:{json.dumps(summary)}")
+
+
+if __name__ == "__main__":
+    main()